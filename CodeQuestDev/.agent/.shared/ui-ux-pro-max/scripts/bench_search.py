@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search Benchmark - BM25 query latency on a synthetic CSV
+
+Writes a synthetic CSV (100k rows by default, Zipf-distributed vocabulary)
+and times queries against it with the previous full-scan BM25.score, the
+postings-based BM25.score, the prebuilt memory-mapped index and, with NumPy
+and SciPy installed, a batch of all of them through sparse_bm25. Queries are
+grouped by how many postings their tokens have, to show that latency follows
+the matching postings rather than the corpus size. Every query's top
+results are checked against the full scan.
+
+Usage: python bench_search.py [--rows 100000] [--queries 20] [--repeat 3]
+"""
+
+import argparse
+import csv
+import itertools
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import bm25_index
+import sparse_bm25
+from core import _fit, build_index
+
+SEARCH_COLS = ["Style Category", "Keywords", "Best For", "Type"]
+TOP_K = 3
+
+
+def legacy_score(bm25, corpus, query):
+    """BM25.score as it was before postings: every document, every query, then a full sort."""
+    query_tokens = bm25.tokenize(query)
+    scores = []
+    for idx, doc in enumerate(corpus):
+        score = 0
+        doc_len = bm25.doc_lengths[idx]
+        term_freqs = defaultdict(int)
+        for word in doc:
+            term_freqs[word] += 1
+        for token in query_tokens:
+            if token in bm25.idf:
+                tf = term_freqs[token]
+                idf = bm25.idf[token]
+                numerator = tf * (bm25.k1 + 1)
+                denominator = tf + bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)
+                score += idf * numerator / denominator
+        scores.append((idx, score))
+    return sorted(scores, key=lambda x: x[1], reverse=True)
+
+
+def make_csv(path, rows, vocabulary=20000, seed=7):
+    """Rows of Zipf-distributed words: a few very common tokens and a long tail of rare ones."""
+    rng = random.Random(seed)
+    words = [f"w{n:05d}x" for n in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["No", *SEARCH_COLS])
+        writer.writeheader()
+        for n in range(rows):
+            sample = rng.choices(words, cum_weights=cum_weights, k=16)
+            writer.writerow({
+                "No": n + 1,
+                "Style Category": " ".join(sample[:2]),
+                "Keywords": ", ".join(sample[2:10]),
+                "Best For": " ".join(sample[10:14]),
+                "Type": " ".join(sample[14:]),
+            })
+    return words
+
+
+def best(fn, repeat):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BM25 query latency")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=20, help="Queries per group")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs (best is reported); the full scan runs once")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        data_dir.mkdir()
+        csv_path = data_dir / "synthetic.csv"
+        words = make_csv(csv_path, args.rows)
+        bm25_index.INDEX_DIR = Path(tmp) / "index"
+
+        start = time.perf_counter()
+        _, bm25 = _fit(csv_path, SEARCH_COLS)
+        fit_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        build_index(csv_path, SEARCH_COLS)
+        build_seconds = time.perf_counter() - start
+        index = bm25_index.open_index(csv_path, SEARCH_COLS)
+        matrix = sparse_bm25.SparseBM25.from_index(index) if sparse_bm25.AVAILABLE else None
+
+        with open(csv_path, encoding="utf-8") as f:
+            corpus = [bm25.tokenize(" ".join(row[col] for col in SEARCH_COLS)) for row in csv.DictReader(f)]
+
+        rng = random.Random(1)
+        groups = {
+            "common": words[:50],
+            "mid": words[500:2000],
+            "rare": words[-5000:],
+        }
+        print(f"Corpus: {args.rows} rows, {len(bm25.idf)} terms | fit {fit_seconds:.2f}s, index build {build_seconds:.2f}s"
+              f" ({bm25_index.index_path(csv_path).stat().st_size / 1e6:.1f} MB)")
+        print(f"  {'queries':<8} {'postings':>9} {'full scan':>11} {'postings':>10} {'prebuilt':>10} {'batch':>10}"
+              f"  same top {TOP_K}")
+        for name, pool in groups.items():
+            queries = [" ".join(rng.sample(pool, 3)) for _ in range(args.queries)]
+            matched = sum(len(bm25.postings.get(token, ())) for q in queries for token in bm25.tokenize(q)) / len(queries)
+
+            legacy, legacy_seconds = best(lambda: [legacy_score(bm25, corpus, q)[:TOP_K] for q in queries[:3]], 1)
+            # The full scan ranks every document; the others only return those scoring above 0
+            legacy = [[(doc, score) for doc, score in ranked if score > 0] for ranked in legacy]
+            ranked, postings_seconds = best(lambda: [bm25.score(q, TOP_K) for q in queries], args.repeat)
+            prebuilt, prebuilt_seconds = best(lambda: [index.score(bm25.tokenize(q), TOP_K) for q in queries], args.repeat)
+            same = legacy == ranked[:3] and ranked == prebuilt
+            batch = "-"
+            if matrix is not None:
+                batched, batch_seconds = best(lambda: matrix.score_many([bm25.tokenize(q) for q in queries], TOP_K),
+                                              args.repeat)
+                same = same and batched == ranked
+                batch = f"{batch_seconds / len(queries) * 1e3:.2f}ms"
+            print(f"  {name:<8} {matched:9.0f} {legacy_seconds / 3 * 1e3:9.1f}ms {postings_seconds / len(queries) * 1e3:8.2f}ms"
+                  f" {prebuilt_seconds / len(queries) * 1e3:8.2f}ms {batch:>10}  {'yes' if same else 'NO'}")
+        del matrix
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
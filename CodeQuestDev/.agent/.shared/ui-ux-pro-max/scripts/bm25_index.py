@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Index - Prebuilt BM25 indexes for the search CSVs
+
+Each CSV's index (postings, IDF, document lengths and the rows themselves)
+is written once to index/<name>.bm25, next to data/, and memory-mapped at
+query time, so a search only scores the postings of its query tokens
+instead of re-reading, re-tokenizing and re-fitting the whole CSV.
+
+An index records the size, mtime and hash of the CSV it was built from.
+If the CSV has been edited since, the index is rebuilt on the next search;
+searches fall back to fitting in-process when no index was ever built.
+
+Usage: python bm25_index.py           # build (or refresh) every domain and stack index
+       python bm25_index.py --check   # report which indexes are missing or stale
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from core import top_scores
+
+INDEX_DIR = Path(__file__).parent.parent / "index"
+INDEX_VERSION = 1
+MAGIC = b"BM25IDX\n"
+# Magic, then the header length; the JSON header follows and the arrays after it
+_PREAMBLE = struct.Struct("<8sI")
+
+# Arrays in file order: name -> array typecode (all 8-byte aligned in the file)
+_ARRAYS = {
+    "doc_lengths": "I",     # tokens per document
+    "idf": "d",             # per term, terms sorted by UTF-8 bytes
+    "term_offsets": "I",    # term i is terms[term_offsets[i]:term_offsets[i + 1]]
+    "postings": "I",        # term i's postings are entries postings[i]..postings[i + 1] - 1
+    "posting_docs": "I",    # document of each posting entry, ascending within a term
+    "posting_tfs": "I",     # how often the term occurs in that document
+    "row_offsets": "I",     # row i is rows[row_offsets[i]:row_offsets[i + 1]], JSON
+}
+_BLOBS = ("terms", "rows")
+
+
+def index_path(csv_path: Path) -> Path:
+    """Where the index of a CSV under data/ lives (stacks/react.csv -> index/stacks-react.bm25)."""
+    relative = Path(csv_path).resolve().relative_to(INDEX_DIR.parent.resolve() / "data")
+    return INDEX_DIR / ("-".join(relative.with_suffix("").parts) + ".bm25")
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def _source(csv_path: Path) -> dict:
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": file_hash(csv_path)}
+
+
+# ============ WRITING ============
+def write_index(path: Path, csv_path: Path, search_cols: list, bm25, rows: list):
+    """Serialize a fitted core.BM25 over ``rows`` (the CSV's rows, in order)."""
+    terms = sorted(bm25.idf, key=lambda term: term.encode("utf-8"))
+    postings = [bm25.postings[term] for term in terms]
+
+    term_blob = [term.encode("utf-8") for term in terms]
+    row_blob = [json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for row in rows]
+    arrays = {
+        "doc_lengths": array("I", bm25.doc_lengths),
+        "idf": array("d", (bm25.idf[term] for term in terms)),
+        "term_offsets": _offsets(term_blob),
+        "postings": array("I", [0]),
+        "posting_docs": array("I"),
+        "posting_tfs": array("I"),
+        "row_offsets": _offsets(row_blob),
+    }
+    for entries in postings:
+        arrays["posting_docs"].extend(doc for doc, _ in entries)
+        arrays["posting_tfs"].extend(tf for _, tf in entries)
+        arrays["postings"].append(len(arrays["posting_docs"]))
+    blobs = {"terms": b"".join(term_blob), "rows": b"".join(row_blob)}
+
+    # Lay the sections out after the header; offsets are relative to the end of the header
+    sections = {}
+    offset = 0
+    for name in [*_ARRAYS, *_BLOBS]:
+        data = arrays[name].tobytes() if name in arrays else blobs[name]
+        sections[name] = [offset, len(data)]
+        offset += len(data) + (-len(data) % 8)
+    header = {
+        "version": INDEX_VERSION,
+        "byteorder": sys.byteorder,
+        "source": _source(csv_path),
+        "search_cols": search_cols,
+        "k1": bm25.k1,
+        "b": bm25.b,
+        "N": bm25.N,
+        "avgdl": bm25.avgdl,
+        "sections": sections,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-(_PREAMBLE.size + len(header_bytes)) % 8)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name in [*_ARRAYS, *_BLOBS]:
+            data = arrays[name].tobytes() if name in arrays else blobs[name]
+            f.write(data + b"\0" * (-len(data) % 8))
+    os.replace(tmp_path, path)
+
+
+def _offsets(blobs: list) -> array:
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return offsets
+
+
+# ============ READING ============
+class PrebuiltIndex:
+    """A memory-mapped index file. Scores the same as core.BM25 fitted on the same CSV."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = _PREAMBLE.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a BM25 index: {path}")
+        start = _PREAMBLE.size + header_len
+        self.header = json.loads(self.map[_PREAMBLE.size:start])
+        if self.header.get("version") != INDEX_VERSION or self.header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Index from another version or platform: {path}")
+
+        # Arrays are zero-copy views of the map; terms and rows are read as slices of it
+        view = memoryview(self.map)
+        self.views = [view]
+        for name, (offset, length) in self.header["sections"].items():
+            if name in _ARRAYS:
+                section = view[start + offset:start + offset + length].cast(_ARRAYS[name])
+                self.views.append(section)
+                setattr(self, name, section)
+        self.terms_start = start + self.header["sections"]["terms"][0]
+        self.rows_start = start + self.header["sections"]["rows"][0]
+        self.k1 = self.header["k1"]
+        self.b = self.header["b"]
+        self.N = self.header["N"]
+        self.avgdl = self.header["avgdl"]
+
+    def fresh(self, csv_path: Path, search_cols: list) -> bool:
+        """Whether the index still matches the CSV (an unchanged mtime and size skip hashing it)."""
+        source = self.header["source"]
+        if self.header["search_cols"] != search_cols:
+            return False
+        stat = os.stat(csv_path)
+        if stat.st_size != source["size"]:
+            return False
+        return stat.st_mtime_ns == source["mtime_ns"] or file_hash(csv_path) == source["hash"]
+
+    def term_id(self, token: str):
+        """Position of a token in the sorted term table, or None."""
+        key = token.encode("utf-8")
+        lo, hi = 0, len(self.idf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self.idf) and self._term(lo) == key else None
+
+    def _term(self, term: int) -> bytes:
+        return self.map[self.terms_start + self.term_offsets[term]:self.terms_start + self.term_offsets[term + 1]]
+
+    def score(self, query_tokens: list, top_k: int = None) -> list:
+        """(document, score) for documents containing a query token, best first.
+
+        Scores accumulate in query token order, so they are bit-identical to
+        core.BM25.score, and rank the same (top_k and ties included).
+        """
+        scores = {}
+        for token in query_tokens:
+            term = self.term_id(token)
+            if term is None:
+                continue
+            idf = self.idf[term]
+            for i in range(self.postings[term], self.postings[term + 1]):
+                doc = self.posting_docs[i]
+                tf = self.posting_tfs[i]
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[doc] / self.avgdl)
+                scores[doc] = scores.get(doc, 0) + idf * numerator / denominator
+        return top_scores(scores, top_k)
+
+    def row(self, doc: int) -> dict:
+        return json.loads(self.map[self.rows_start + self.row_offsets[doc]:self.rows_start + self.row_offsets[doc + 1]])
+
+    def close(self):
+        for view in reversed(self.views):
+            view.release()
+        self.map.close()
+
+
+def open_index(csv_path: Path, search_cols: list, build=None):
+    """The CSV's index if one was built, rebuilt with ``build()`` first if the CSV changed.
+
+    Returns None when there is no index (searches then fit in-process) or it
+    cannot be read or rewritten.
+    """
+    path = index_path(csv_path)
+    if not path.exists():
+        return None
+    try:
+        index = PrebuiltIndex(path)
+        if index.fresh(csv_path, search_cols):
+            return index
+        index.close()
+    except (OSError, ValueError):
+        pass
+    if build is None:
+        return None
+    try:
+        build()
+        return PrebuiltIndex(path)
+    except (OSError, ValueError):
+        return None
+
+
+# ============ CLI ============
+def main():
+    import argparse
+    from core import CSV_CONFIG, DATA_DIR, STACK_CONFIG, _STACK_COLS, build_index
+
+    parser = argparse.ArgumentParser(description="Build the prebuilt BM25 search indexes")
+    parser.add_argument("--check", action="store_true", help="Only report missing or stale indexes")
+    args = parser.parse_args()
+
+    targets = [(config["file"], config["search_cols"]) for config in CSV_CONFIG.values()]
+    targets += [(config["file"], _STACK_COLS["search_cols"]) for config in STACK_CONFIG.values()]
+    stale = 0
+    for file, search_cols in targets:
+        csv_path = DATA_DIR / file
+        if not csv_path.exists():
+            continue
+        path = index_path(csv_path)
+        try:
+            index = PrebuiltIndex(path)
+            fresh = index.fresh(csv_path, search_cols)
+            index.close()
+        except (OSError, ValueError):
+            fresh = False
+        if args.check:
+            stale += not fresh
+            print(f"{'ok   ' if fresh else 'STALE'} {path.name}")
+        elif not fresh:
+            build_index(csv_path, search_cols)
+            print(f"built {path.name} ({path.stat().st_size / 1024:.0f} KiB)")
+    if args.check and stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
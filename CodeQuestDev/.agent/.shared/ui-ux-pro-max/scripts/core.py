@@ -5,10 +5,14 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import itertools
+import os
 import re
+import threading
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -98,13 +102,18 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search
+
+    fit() builds an inverted index (term -> postings of (document, term
+    frequency)), so score() only visits documents containing a query token.
+    """
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.postings = {}
         self.doc_lengths = []
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
@@ -117,78 +126,212 @@ class BM25:
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        postings = defaultdict(list)
+        for idx, doc in enumerate(documents):
+            tokens = self.tokenize(doc)
+            self.doc_lengths.append(len(tokens))
+            term_freqs = defaultdict(int)
+            for word in tokens:
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self.postings = dict(postings)
+        self.N = len(self.doc_lengths)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
+        # The length-normalization part of each document's denominator
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+
+        for word, entries in self.postings.items():
+            self.doc_freqs[word] = len(entries)
+            self.idf[word] = log((self.N - len(entries) + 0.5) / (len(entries) + 0.5) + 1)
+
+    def score(self, query, top_k=None):
+        """(document index, score) of documents matching the query, best first
+
+        Only documents containing a query token are scored (the rest score 0).
+        With top_k, only the best top_k are returned. Ties go to the earlier
+        document.
+        """
+        scores = {}
+        numerator_weight = self.k1 + 1
+        for token in self.tokenize(query):
+            entries = self.postings.get(token)
+            if entries is None:
+                continue
+            idf = self.idf[token]
+            for idx, tf in entries:
+                scores[idx] = scores.get(idx, 0) + idf * (tf * numerator_weight) / (tf + self.doc_norms[idx])
+        return top_scores(scores, top_k)
+
+
+def top_scores(scores, top_k=None):
+    """Sort {document: score} best first (earlier documents win ties), keeping top_k if given"""
+    if top_k is not None and top_k < len(scores):
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
 
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+# ============ SEARCH FUNCTIONS ============
+# Loaded CSVs: (file path, CSV mtime_ns, search columns) -> _Loaded, least recently used first.
+# Bigger than the domain and stack CSVs together, so warm() keeps all of them.
+CACHE_SIZE = 32
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
 
 
-# ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
-
+def _fit(filepath, search_cols):
+    """Load a CSV and fit a BM25 index over its search columns"""
     data = _load_csv(filepath)
 
     # Build documents from search columns
     documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
     bm25 = BM25()
     bm25.fit(documents)
-    ranked = bm25.score(query)
+    return data, bm25
+
+
+def build_index(filepath, search_cols):
+    """Write the prebuilt index of a CSV (see bm25_index.py)"""
+    from bm25_index import index_path, write_index
+    data, bm25 = _fit(filepath, search_cols)
+    write_index(index_path(filepath), filepath, search_cols, bm25, data)
+
+
+# Batches go through sparse_bm25 only when their queries match at least this many postings
+# each on average: below it, per-query postings scoring is faster than the matrix product
+# (e.g. on every bundled CSV, which have a few hundred rows at most)
+SPARSE_MIN_POSTINGS = 200
+
+
+class _Loaded:
+    """A loaded CSV: its prebuilt index or fitted BM25 (exactly one is set) and a row lookup.
+
+    ``matrix`` is its sparse_bm25.SparseBM25, built by the first batch that needs it.
+    """
+
+    def __init__(self, index, bm25, row_at):
+        self.index = index
+        self.bm25 = bm25
+        self.row_at = row_at
+        self.matrix = None
+
+    def matched_postings(self, tokens):
+        """How many postings scoring these query tokens visits"""
+        if self.index is None:
+            return sum(len(self.bm25.postings.get(token, ())) for token in tokens)
+        total = 0
+        for token in tokens:
+            term = self.index.term_id(token)
+            if term is not None:
+                total += self.index.postings[term + 1] - self.index.postings[term]
+        return total
+
+    def sparse(self):
+        from sparse_bm25 import SparseBM25
+        if self.matrix is None:
+            self.matrix = SparseBM25.from_bm25(self.bm25) if self.index is None else SparseBM25.from_index(self.index)
+        return self.matrix
+
+
+def _load(filepath, search_cols):
+    """The _Loaded prebuilt index or fitted BM25 of a CSV
+
+    Results are cached (see _CACHE), so repeated searches of a CSV only score.
+    An edited CSV has a new mtime, so it is loaded again.
+    """
+    path = str(filepath)
+    key = (path, os.stat(filepath).st_mtime_ns, tuple(search_cols))
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+
+    # A prebuilt index only scores; otherwise load and fit the CSV now
+    from bm25_index import open_index
+    index = open_index(filepath, search_cols, build=lambda: build_index(filepath, search_cols))
+    if index is not None:
+        loaded = _Loaded(index, None, index.row)
+    else:
+        data, bm25 = _fit(filepath, search_cols)
+        loaded = _Loaded(None, bm25, data.__getitem__)
+    with _CACHE_LOCK:
+        # Drop what was loaded from an older version of the file
+        for stale in [k for k in _CACHE if k[0] == path and k[2] == key[2]]:
+            del _CACHE[stale]
+        _CACHE[key] = loaded
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return loaded
+
+
+def clear_cache(filepath=None):
+    """Forget loaded CSVs: all of them, or only those of one file. Returns how many were dropped.
+
+    Edits that leave a file's mtime unchanged are only picked up after this.
+    """
+    with _CACHE_LOCK:
+        keys = [key for key in _CACHE if filepath is None or key[0] == str(filepath)]
+        for key in keys:
+            del _CACHE[key]
+    return len(keys)
+
+
+def warm():
+    """Load every domain and stack CSV into the cache up front, for long-lived
+    processes (search.py --serve). A CSV edited later is reloaded on its next search."""
+    targets = [(config["file"], config["search_cols"]) for config in CSV_CONFIG.values()]
+    targets += [(config["file"], _STACK_COLS["search_cols"]) for config in STACK_CONFIG.values()]
+    for file, search_cols in targets:
+        filepath = DATA_DIR / file
+        if filepath.exists():
+            _load(filepath, search_cols)
+    return len(_CACHE)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
 
-    return results
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25"""
+    return _search_csv_many(filepath, search_cols, output_cols, [query], max_results)[0]
+
+
+def _search_csv_many(filepath, search_cols, output_cols, queries, max_results):
+    """_search_csv for several queries against one CSV, fitting (or opening) its index once"""
+    if not filepath.exists():
+        return [[] for _ in queries]
+
+    loaded = _load(filepath, search_cols)
+    token_lists = [BM25().tokenize(query) for query in queries]
+
+    batch = None
+    if len(queries) > 1 and loaded.matched_postings(itertools.chain(*token_lists)) >= SPARSE_MIN_POSTINGS * len(queries):
+        # Big enough for one sparse matrix product over the whole batch (NumPy and SciPy load only here)
+        import sparse_bm25
+        if sparse_bm25.AVAILABLE:
+            batch = loaded.sparse().score_many(token_lists, max_results)
+    if batch is None:
+        if loaded.index is None:
+            batch = [loaded.bm25.score(query, max_results) for query in queries]
+        else:
+            batch = [loaded.index.score(tokens, max_results) for tokens in token_lists]
+
+    # Get top results with score > 0
+    all_results = []
+    for ranked in batch:
+        results = []
+        for idx, score in ranked:
+            if score > 0:
+                row = loaded.row_at(idx)
+                results.append({col: row.get(col, "") for col in output_cols if col in row})
+        all_results.append(results)
+    return all_results
 
 
 def detect_domain(query):
@@ -236,6 +379,40 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
+def search_many(queries, domain=None, max_results=MAX_RESULTS):
+    """search() for a batch of queries, in order
+
+    Queries for the same domain are scored together: in one sparse matrix
+    product when NumPy and SciPy are installed and the batch matches enough
+    postings (see SPARSE_MIN_POSTINGS and sparse_bm25.py), otherwise one at
+    a time. Either way the results are the same as search()'s.
+    """
+    by_domain = defaultdict(list)
+    for i, query in enumerate(queries):
+        by_domain[domain or detect_domain(query)].append(i)
+
+    results = [None] * len(queries)
+    for name, positions in by_domain.items():
+        config = CSV_CONFIG.get(name, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            for i in positions:
+                results[i] = {"error": f"File not found: {filepath}", "domain": name}
+            continue
+
+        batch = _search_csv_many(filepath, config["search_cols"], config["output_cols"],
+                                 [queries[i] for i in positions], max_results)
+        for i, rows in zip(positions, batch):
+            results[i] = {
+                "domain": name,
+                "query": queries[i],
+                "file": config["file"],
+                "count": len(rows),
+                "results": rows
+            }
+    return results
+
+
 def search_stack(query, stack, max_results=MAX_RESULTS):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
@@ -5,6 +5,7 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py --serve [--port 8766]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +13,15 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Daemon (see search_daemon.py):
+  --serve      Keep every index warm in a background process on localhost;
+               later searches are forwarded to it when it is running
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import search_daemon
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS
 
 
 def format_output(result):
@@ -47,7 +52,7 @@ def format_output(result):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
@@ -60,19 +65,38 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Daemon
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (keeps all indexes warm)")
+    parser.add_argument("--port", type=int, default=search_daemon.PORT, help=f"Daemon port (default: {search_daemon.PORT})")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if a daemon is running")
 
     args = parser.parse_args()
 
+    def run(request):
+        """Ask the daemon first; run the command in this process if it is not running."""
+        result = None if args.no_daemon else search_daemon.forward(request, args.port)
+        return search_daemon.handle(request) if result is None else result
+
+    if args.serve:
+        search_daemon.serve(args.port)
+    elif args.query is None:
+        parser.error("the following arguments are required: query")
     # Design system takes priority
-    if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
+    elif args.design_system:
+        if args.persist:
+            # Writes files relative to this process, so never forwarded
+            from design_system import generate_design_system
+            result = generate_design_system(
+                args.query, 
+                args.project_name, 
+                args.format,
+                persist=args.persist,
+                page=args.page,
+                output_dir=args.output_dir
+            )
+        else:
+            result = run({"command": "design_system", "query": args.query, "project_name": args.project_name,
+                          "format": args.format})
         print(result)
         
         # Print persistence confirmation
@@ -90,7 +114,7 @@ if __name__ == "__main__":
             print("=" * 60)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = run({"command": "stack", "query": args.query, "stack": args.stack, "max_results": args.max_results})
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -98,7 +122,7 @@ if __name__ == "__main__":
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = run({"command": "search", "query": args.query, "domain": args.domain, "max_results": args.max_results})
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
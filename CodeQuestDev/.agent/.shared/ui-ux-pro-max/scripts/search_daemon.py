@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - Keeps every search index warm in one process
+
+`python search.py --serve` starts it on localhost. search.py then forwards
+each query to it over HTTP, so a search no longer pays for importing the
+search modules, parsing CSVs or building indexes. When no daemon is
+listening, search.py searches in-process as before.
+
+Each request carries the client's identity(): its data directory and the
+size and mtime of the scripts the daemon runs. A daemon started from
+another checkout, or before the scripts were changed, refuses the request
+and search.py searches in-process instead.
+
+Forwarding needs only json, socket and core's standard-library imports
+(search.py uses core's configuration for its arguments): the HTTP server,
+design_system and the index backends are imported by the daemon (or on
+fallback), and the client speaks just enough HTTP/1.1 itself to skip
+importing http.client.
+"""
+
+import json
+import os
+import socket
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("UIPRO_SEARCH_PORT", 8766))
+# Requests go to this path, so an unrelated server on the port is never mistaken for the daemon
+PATH = "/ui-ux-pro-max/v1"
+# Forwarding gives up at once when nothing listens; a real search answers well within the second
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 30
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# The modules whose code answers a forwarded request
+SERVED_SCRIPTS = ("core.py", "bm25_index.py", "sparse_bm25.py", "design_system.py", "search_daemon.py")
+
+
+def identity() -> dict:
+    """Which checkout (core.DATA_DIR, resolved) and version of the scripts this process runs"""
+    scripts = []
+    for name in SERVED_SCRIPTS:
+        stat = os.stat(os.path.join(SCRIPTS_DIR, name))
+        scripts.append([name, stat.st_size, stat.st_mtime_ns])
+    return {"data_dir": os.path.realpath(os.path.join(SCRIPTS_DIR, os.pardir, "data")), "scripts": scripts}
+
+
+# ============ DAEMON ============
+def handle(request: dict, served: dict = None):
+    """Run one forwarded command in this process.
+
+    A daemon passes its identity() as ``served``; requests from a client with
+    another identity are refused (the client then searches in-process).
+    """
+    if served is not None and request.get("identity") != served:
+        raise ValueError("Daemon serves another checkout or version of the scripts; restart it")
+    from core import search, search_stack
+    command = request["command"]
+    if command == "search":
+        return search(request["query"], request.get("domain"), request["max_results"])
+    if command == "stack":
+        return search_stack(request["query"], request["stack"], request["max_results"])
+    if command == "design_system":
+        from design_system import generate_design_system
+        return generate_design_system(request["query"], request.get("project_name"), request.get("format", "ascii"))
+    raise ValueError(f"Unknown command: {command}")
+
+
+def _handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            if self.path != PATH:
+                self.send_error(404)
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, reply = 200, {"result": handle(request, self.server.identity)}
+            except Exception as e:  # report to the client, which then searches in-process
+                status, reply = 500, {"error": f"{type(e).__name__}: {e}"}
+            body = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SearchHandler
+
+
+def serve(port: int = PORT):
+    from http.server import ThreadingHTTPServer
+    from core import warm
+    import design_system  # noqa: F401 - imported up front, not on the first request
+
+    loaded = warm()
+    server = ThreadingHTTPServer((HOST, port), _handler())
+    server.daemon_threads = True
+    server.identity = identity()
+    print(f"🔎 Serving {loaded} warm indexes on http://{HOST}:{port}{PATH} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ============ CLIENT ============
+def forward(request: dict, port: int = PORT):
+    """The daemon's result for a command, or None if no daemon answered (search in-process then)."""
+    body = json.dumps({**request, "identity": identity()}, ensure_ascii=False).encode("utf-8")
+    head = (f"POST {PATH} HTTP/1.1\r\nHost: {HOST}:{port}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("ascii")
+    try:
+        with socket.create_connection((HOST, port), timeout=CONNECT_TIMEOUT) as sock:
+            sock.settimeout(REQUEST_TIMEOUT)
+            sock.sendall(head + body)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = b"".join(chunks)
+        status_line, _, rest = response.partition(b"\r\n")
+        if status_line.split()[1:2] != [b"200"]:
+            return None
+        return json.loads(rest.partition(b"\r\n\r\n")[2])["result"]
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
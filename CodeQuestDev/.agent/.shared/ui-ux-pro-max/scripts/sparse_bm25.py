@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Sparse Backend - Batch BM25 scoring with NumPy/SciPy (optional)
+
+Stores a domain as a sparse term-document matrix of precomputed BM25
+weights, so a whole batch of queries is scored with one sparse matrix
+product (see core.search_many). It only pays off when the queries match
+many postings; smaller batches, and every batch without NumPy and SciPy
+(AVAILABLE is False), are scored one query at a time. core caches the
+matrix with the loaded CSV, so it is built once per file.
+
+Rankings are exactly those of core.BM25.score: the matrix product only
+picks each query's candidates, which are then re-added in query token
+order, as the pure-Python scorer does.
+"""
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional dependency
+    np = sparse = None
+
+from core import top_scores
+
+AVAILABLE = np is not None
+
+# Relative slack when picking candidates from the matrix product, far above
+# the rounding differences of summing the same weights in another order
+_CANDIDATE_SLACK = 1e-9
+
+
+class SparseBM25:
+    """BM25 weights as a terms x documents CSR matrix (one row per term: its postings)."""
+
+    def __init__(self, term_id, indptr, doc_ids, tfs, idf, doc_lengths, avgdl, k1, b):
+        """``term_id(token)`` maps a token to its row (or None); ``indptr``, ``doc_ids``
+        and ``tfs`` are the postings in CSR layout, ``idf`` is per row."""
+        if not AVAILABLE:
+            raise ImportError("sparse_bm25 needs numpy and scipy (pip install numpy scipy)")
+        self.term_id = term_id
+        indptr = np.asarray(indptr, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        tfs = np.asarray(tfs, dtype=np.float64)
+        doc_lengths = np.asarray(doc_lengths, dtype=np.float64)
+        idf = np.asarray(idf, dtype=np.float64)
+        n_docs = len(doc_lengths)
+
+        # Same operations, in the same order, as BM25.score, so each weight is bit-identical
+        norms = k1 * (1 - b + b * doc_lengths / avgdl)
+        rows = np.repeat(np.arange(len(idf)), np.diff(indptr))
+        weights = idf[rows] * (tfs * (k1 + 1)) / (tfs + norms[doc_ids])
+        self.matrix = sparse.csr_matrix((weights, doc_ids, indptr), shape=(len(idf), n_docs))
+
+    @classmethod
+    def from_bm25(cls, bm25):
+        """From a fitted core.BM25."""
+        terms = list(bm25.postings)
+        rows = {term: i for i, term in enumerate(terms)}
+        indptr = [0]
+        doc_ids = []
+        tfs = []
+        for term in terms:
+            for doc, tf in bm25.postings[term]:
+                doc_ids.append(doc)
+                tfs.append(tf)
+            indptr.append(len(doc_ids))
+        return cls(rows.get, indptr, doc_ids, tfs, [bm25.idf[term] for term in terms],
+                   bm25.doc_lengths, bm25.avgdl, bm25.k1, bm25.b)
+
+    @classmethod
+    def from_index(cls, index):
+        """From a bm25_index.PrebuiltIndex, whose postings already are this layout (no copies)."""
+        return cls(index.term_id, np.frombuffer(index.postings, dtype=np.uint32),
+                   np.frombuffer(index.posting_docs, dtype=np.uint32), np.frombuffer(index.posting_tfs, dtype=np.uint32),
+                   np.frombuffer(index.idf, dtype=np.float64), np.frombuffer(index.doc_lengths, dtype=np.uint32),
+                   index.avgdl, index.k1, index.b)
+
+    def score_many(self, token_lists, top_k):
+        """core.BM25.score(query, top_k) for each query's tokens, from one matrix product."""
+        term_rows = [[self.term_id(token) for token in tokens] for tokens in token_lists]
+        cols, rows = [], []
+        for q, terms in enumerate(term_rows):
+            for term in terms:
+                if term is not None:
+                    rows.append(q)
+                    cols.append(term)
+        queries = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                    shape=(len(token_lists), self.matrix.shape[0]))
+        scores = (queries @ self.matrix).tocsr()
+
+        results = []
+        for q, terms in enumerate(term_rows):
+            start, end = scores.indptr[q], scores.indptr[q + 1]
+            docs, values = scores.indices[start:end], scores.data[start:end]
+            if top_k is not None and len(values) > top_k:
+                threshold = np.partition(values, -top_k)[-top_k]
+                docs = docs[values >= threshold * (1 - _CANDIDATE_SLACK)]
+            results.append(top_scores(self._exact(terms, docs), top_k))
+        return results
+
+    def _exact(self, terms, docs):
+        """Candidate scores added up in query token order, exactly as BM25.score does."""
+        exact = {}
+        for term in terms:
+            if term is None:
+                continue
+            start, end = self.matrix.indptr[term], self.matrix.indptr[term + 1]
+            posting_docs = self.matrix.indices[start:end]
+            found = np.searchsorted(posting_docs, docs)
+            hit = found < len(posting_docs)
+            hit[hit] = posting_docs[found[hit]] == docs[hit]
+            for doc, weight in zip(docs[hit].tolist(), self.matrix.data[start + found[hit]].tolist()):
+                exact[doc] = exact.get(doc, 0) + weight
+        return exact
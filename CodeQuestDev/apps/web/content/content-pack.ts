@@ -0,0 +1,104 @@
+// CodeQuest - Content Pack Loader
+// Lazy-loads lessons from the .pack files written by
+// scripts/convert_to_lessons.py --format pack (layout in scripts/content_pack.py)
+
+import { LearningModule, Lesson } from './lessons';
+
+export type LessonSummary = Pick<Lesson, 'id' | 'title' | 'description' | 'xpReward' | 'estimatedTime'>;
+
+export interface PackModule extends Omit<LearningModule, 'lessons'> {
+    lessons: LessonSummary[];
+}
+
+const MAGIC = 'CQPK';
+const VERSION = 1;
+const HEADER_SIZE = 16;
+const ENTRY_SIZE = 8;
+// The first request asks for this much, which usually covers the offset table and index
+const PREFIX_SIZE = 64 * 1024;
+
+const decoder = new TextDecoder();
+
+// Fetch bytes [start, end) of a file. Servers that ignore Range send the whole file.
+async function fetchRange(url: string, start: number, end: number): Promise<{ bytes: ArrayBuffer; whole: boolean }> {
+    const res = await fetch(url, { headers: { Range: `bytes=${start}-${end - 1}` } });
+    if (!res.ok) {
+        throw new Error(`Failed to load ${url}: ${res.status}`);
+    }
+    return { bytes: await res.arrayBuffer(), whole: res.status !== 206 };
+}
+
+export class ContentPack {
+    private lessons = new Map<string, Promise<Lesson>>();
+
+    private constructor(
+        private url: string,
+        readonly modules: PackModule[],
+        private table: DataView,
+        private dataStart: number,
+        private positions: Map<string, number>,
+        private file: ArrayBuffer | null,
+    ) {}
+
+    // Read the header, offset table and module index; no lesson bodies are loaded
+    static async open(url: string): Promise<ContentPack> {
+        let { bytes, whole } = await fetchRange(url, 0, PREFIX_SIZE);
+        const header = new DataView(bytes, 0, HEADER_SIZE);
+        if (decoder.decode(new Uint8Array(bytes, 0, 4)) !== MAGIC || header.getUint16(4, true) !== VERSION) {
+            throw new Error(`${url} is not a version ${VERSION} content pack`);
+        }
+        const count = header.getUint32(8, true);
+        const indexLength = header.getUint32(12, true);
+        const indexStart = HEADER_SIZE + count * ENTRY_SIZE;
+        const dataStart = indexStart + indexLength;
+        if (bytes.byteLength < dataStart) {
+            ({ bytes, whole } = await fetchRange(url, 0, dataStart));
+        }
+
+        const modules: PackModule[] = JSON.parse(decoder.decode(new Uint8Array(bytes, indexStart, indexLength))).modules;
+        const positions = new Map<string, number>();
+        modules.forEach(m => m.lessons.forEach(l => positions.set(l.id, positions.size)));
+        return new ContentPack(url, modules, new DataView(bytes, HEADER_SIZE, count * ENTRY_SIZE), dataStart, positions, whole ? bytes : null);
+    }
+
+    // Load one lesson, fetching only its bytes
+    lesson(lessonId: string): Promise<Lesson | undefined> {
+        const position = this.positions.get(lessonId);
+        if (position === undefined) {
+            return Promise.resolve(undefined);
+        }
+        let lesson = this.lessons.get(lessonId);
+        if (!lesson) {
+            const start = this.dataStart + this.table.getUint32(position * ENTRY_SIZE, true);
+            const end = start + this.table.getUint32(position * ENTRY_SIZE + 4, true);
+            lesson = this.read(start, end).then(bytes => JSON.parse(decoder.decode(bytes)) as Lesson);
+            lesson.catch(() => this.lessons.delete(lessonId));
+            this.lessons.set(lessonId, lesson);
+        }
+        return lesson;
+    }
+
+    private async read(start: number, end: number): Promise<Uint8Array> {
+        if (!this.file) {
+            const { bytes, whole } = await fetchRange(this.url, start, end);
+            if (!whole) {
+                return new Uint8Array(bytes);
+            }
+            this.file = bytes;
+        }
+        return new Uint8Array(this.file, start, end - start);
+    }
+}
+
+const packs = new Map<string, Promise<ContentPack>>();
+
+// Open a pack from public/content, e.g. openPack('css-lessons')
+export function openPack(name: string): Promise<ContentPack> {
+    let pack = packs.get(name);
+    if (!pack) {
+        pack = ContentPack.open(`/content/${name}.pack`);
+        pack.catch(() => packs.delete(name));
+        packs.set(name, pack);
+    }
+    return pack;
+}
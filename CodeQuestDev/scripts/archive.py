@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Response Archive
+Records raw HTTP responses into a compressed WARC-style archive and serves
+them back from a local HTTP server, so the scraper can run without touching
+w3schools.com (see scraper.py --record / --replay).
+
+Each record is a WARC/1.0 "response" record in its own gzip member, the
+same layout as a .warc.gz file, so any record can be read on its own. A
+sidecar index (<archive>.idx, one "offset length url" line per record)
+maps URLs to records; it is rebuilt by scanning the archive if missing.
+
+Usage:
+    python archive.py list responses.warc.gz
+    python archive.py serve responses.warc.gz [--port 8765]
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def _archive_key(url: str) -> str:
+    """Records are looked up by path and query, so an archive replays on any host."""
+    parsed = urlparse(url)
+    return parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+
+# ============ WRITING ============
+class ArchiveWriter:
+    """Append responses to an archive. Thread-safe; a URL recorded twice keeps its last response."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index = _read_index(path) if os.path.exists(path) else {}
+        self.file = open(path, "ab")
+        self.lock = threading.Lock()
+
+    def record(self, url: str, body: bytes, status: int = 200, content_type: str = "text/html; charset=utf-8"):
+        http = (f"HTTP/1.1 {status} OK\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+        header = (f"WARC/1.0\r\n"
+                  f"WARC-Type: response\r\n"
+                  f"WARC-Target-URI: {url}\r\n"
+                  f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}\r\n"
+                  f"WARC-Payload-Digest: sha256:{hashlib.sha256(body).hexdigest()}\r\n"
+                  f"Content-Type: application/http; msgtype=response\r\n"
+                  f"Content-Length: {len(http)}\r\n\r\n").encode("utf-8")
+        member = gzip.compress(header + http + b"\r\n\r\n", mtime=0)
+        with self.lock:
+            offset = self.file.tell()
+            self.file.write(member)
+            self.index[_archive_key(url)] = (offset, len(member), url)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+            _write_index(self.path, self.index)
+
+
+def _write_index(path: str, index: Dict[str, Tuple[int, int, str]]):
+    tmp_path = f"{path}.idx.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for offset, length, url in sorted(index.values()):
+            f.write(f"{offset} {length} {url}\n")
+    os.replace(tmp_path, f"{path}.idx")
+
+
+# ============ READING ============
+def _parse_record(data: bytes) -> Tuple[str, int, Dict[str, str], bytes]:
+    """(target URL, HTTP status, HTTP headers, body) of one decompressed record."""
+    warc_head, _, rest = data.partition(b"\r\n\r\n")
+    warc = dict(line.split(": ", 1) for line in warc_head.decode("utf-8").split("\r\n")[1:])
+    http = rest[:int(warc["Content-Length"])]
+    http_head, _, body = http.partition(b"\r\n\r\n")
+    status_line, *header_lines = http_head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return warc["WARC-Target-URI"], int(status_line.split()[1]), headers, body
+
+
+def _scan(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, int, bytes]]:
+    """(offset, compressed length, record) for every gzip member in the archive.
+
+    Stops at a truncated last member, e.g. after a crash while recording.
+    """
+    with open(path, "rb") as f:
+        offset = 0
+        pending = b""
+        while True:
+            decompressor = zlib.decompressobj(wbits=31)
+            start = offset
+            parts = []
+            while not decompressor.eof:
+                if not pending:
+                    pending = f.read(chunk_size)
+                    if not pending:
+                        return
+                parts.append(decompressor.decompress(pending))
+                offset += len(pending) - len(decompressor.unused_data)
+                pending = decompressor.unused_data
+            yield start, offset - start, b"".join(parts)
+
+
+def _read_index(path: str) -> Dict[str, Tuple[int, int, str]]:
+    index = {}
+    if os.path.exists(f"{path}.idx") and os.path.getmtime(f"{path}.idx") >= os.path.getmtime(path):
+        with open(f"{path}.idx", "r", encoding="utf-8") as f:
+            for line in f:
+                offset, length, url = line.rstrip("\n").split(" ", 2)
+                index[_archive_key(url)] = (int(offset), int(length), url)
+        return index
+    for offset, length, record in _scan(path):
+        url = _parse_record(record)[0]
+        index[_archive_key(url)] = (offset, length, url)
+    return index
+
+
+class ArchiveReader:
+    """Random access to the responses in an archive."""
+
+    def __init__(self, path: str):
+        self.index = _read_index(path)
+        self.file = open(path, "rb")
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def urls(self) -> Iterator[str]:
+        for _, _, url in sorted(self.index.values()):
+            yield url
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """(status, headers, body) recorded for a URL (or a path), or None."""
+        entry = self.index.get(_archive_key(url))
+        if entry is None:
+            return None
+        offset, length, _ = entry
+        with self.lock:
+            self.file.seek(offset)
+            member = self.file.read(length)
+        _, status, headers, body = _parse_record(gzip.decompress(member))
+        return status, headers, body
+
+    def close(self):
+        self.file.close()
+
+
+# ============ REPLAY SERVER ============
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serves archived responses by path; anything not recorded is a 404."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+    archive: ArchiveReader = None
+
+    def do_GET(self):
+        found = self.archive.get(self.path)
+        if found is None:
+            self.send_error(404, "Not in archive")
+            return
+        status, headers, body = found
+        self.send_response(status)
+        self.send_header("Content-Type", headers.get("Content-Type", "text/html; charset=utf-8"))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_replay_server(path: str, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve an archive from a background thread; the base URL is http://host:server.server_address[1]."""
+    handler = type("Handler", (ReplayHandler,), {"archive": ArchiveReader(path)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or serve a recorded response archive")
+    parser.add_argument("command", choices=["list", "serve"])
+    parser.add_argument("archive")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        reader = ArchiveReader(args.archive)
+        for url in reader.urls():
+            print(url)
+        print(f"📦 {len(reader)} responses, {os.path.getsize(args.archive) / 1024:.0f} KiB")
+        return
+
+    server = start_replay_server(args.archive, port=args.port)
+    print(f"🔁 Replaying {args.archive} on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Crawl Benchmark
+Times the sequential, concurrent and pipelined (process-pool parsing)
+scraper modes, and the concurrent mode planned from a sitemap, against a
+local HTTP stand-in for W3Schools and checks that they all produce the
+same courses.
+
+Usage: python bench_crawl.py [--pages-dir saved_pages/] [--courses html css] [--lessons 15]
+
+--pages-dir should mirror the site layout (e.g. saved_pages/html/default.asp),
+with a sitemap.xml at its root for the sitemap mode.
+Without it, a synthetic site is generated in a temporary directory.
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import scraper
+
+
+def make_synthetic_site(dest: str, course_ids: list, lessons: int, sections: int = 5):
+    """Write a course index plus ``lessons`` lesson pages for each course, and a sitemap of the lessons."""
+    urls = []
+    for course_id in course_ids:
+        info = scraper.COURSES[course_id]
+        base_path = info["base_path"]
+        links = "\n".join(
+            f'<a href="lesson{n}.asp">{info["name"]} Lesson {n}</a>' for n in range(1, lessons + 1)
+        )
+        write_page(dest, info["url"], f'<div id="leftmenuinnerinner">{links}</div>')
+
+        for n in range(1, lessons + 1):
+            sections_html = "\n".join(
+                f"<h2>Section {s}</h2>"
+                f"<p>This paragraph explains part {s} of lesson {n} in some detail.</p>"
+                f"<ul><li>First point of {s}</li><li>Second point of {s}</li></ul>"
+                f'<div class="w3-code">&lt;div class="box{s}"&gt;Hello&lt;/div&gt;</div>'
+                f'<div class="w3-panel w3-note"><p>Note: remember section {s} for later.</p></div>'
+                for s in range(1, sections + 1)
+            )
+            nav = '<div class="nextprev"><a class="w3-btn" href="#">❮ Previous</a><p>Navigation paragraph text here</p></div>'
+            body = f'<div id="main"><h1>{info["name"]} Lesson {n}</h1>{nav}{sections_html}{nav}</div>'
+            write_page(dest, f"{base_path}lesson{n}.asp", body)
+            urls.append(f"{base_path}lesson{n}.asp")
+
+    entries = "".join(f"<url><loc>{scraper.BASE_URL}{url}</loc></url>" for url in urls)
+    with open(os.path.join(dest, "sitemap.xml"), "w", encoding="utf-8") as f:
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+
+def write_page(dest: str, url: str, body: str):
+    path = os.path.join(dest, url.lstrip("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><body>{body}</body></html>")
+
+
+class SavedPageHandler(SimpleHTTPRequestHandler):
+    """Serves saved pages as HTML, after an artificial network latency."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+    extensions_map = {".asp": "text/html; charset=utf-8", ".php": "text/html; charset=utf-8", "": "text/html; charset=utf-8"}
+
+    def __init__(self, *args, latency: float = 0.0, **kwargs):
+        self.latency = latency
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve(pages_dir: str, latency: float):
+    """Serve ``pages_dir`` on a free localhost port and point the scraper at it."""
+    handler = functools.partial(SavedPageHandler, directory=pages_dir, latency=latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    original_base = scraper.BASE_URL
+    scraper.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield
+    finally:
+        scraper.BASE_URL = original_base
+        server.shutdown()
+
+
+def run_sequential(course_ids: list) -> list:
+    return [scraper.extract_course(course_id, scraper.COURSES[course_id]) for course_id in course_ids]
+
+
+def run_concurrent(course_ids: list, workers: int, parse_workers: int = 0, sitemap: bool = False) -> list:
+    frontier = scraper.plan_crawl("/sitemap.xml", course_ids) if sitemap else None
+    crawler = scraper.ConcurrentCrawler(course_ids, workers, parse_workers=parse_workers, frontier=frontier)
+    crawler.start()
+    try:
+        return [crawler.course(course_id) for course_id in course_ids]
+    finally:
+        crawler.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    requests_before = scraper.get_fetcher().summary()["requests"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    elapsed = time.perf_counter() - start
+    return result, elapsed, scraper.get_fetcher().summary()["requests"] - requests_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs concurrent crawling")
+    parser.add_argument("--pages-dir", help="Directory of saved W3Schools pages (default: synthetic site)")
+    parser.add_argument("--courses", nargs="+", default=["html", "css", "javascript", "python"], choices=list(scraper.COURSES))
+    parser.add_argument("--lessons", type=int, default=15, help="Lessons per course in the synthetic site")
+    parser.add_argument("--latency", type=float, default=0.15, help="Simulated server latency in seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1, help="Processes for the pipelined mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_dir = args.pages_dir
+        if not pages_dir:
+            pages_dir = tmp
+            make_synthetic_site(pages_dir, args.courses, args.lessons)
+
+        with serve(pages_dir, args.latency):
+            sequential, sequential_time, sequential_requests = timed(run_sequential, args.courses)
+            concurrent, concurrent_time, concurrent_requests = timed(run_concurrent, args.courses, args.workers)
+            pipelined, pipelined_time, pipelined_requests = timed(run_concurrent, args.courses, args.workers, args.parse_workers)
+            from_sitemap, sitemap_time, sitemap_requests = timed(run_concurrent, args.courses, args.workers, 0, True)
+
+    lessons = sum(len(c["lessons"]) for c in sequential)
+    expected = json.dumps(sequential, sort_keys=True)
+    identical = all(json.dumps(result, sort_keys=True) == expected for result in (concurrent, pipelined, from_sitemap))
+
+    print(f"Courses: {len(args.courses)} | Lessons: {lessons} | Latency: {args.latency}s | Delay: {scraper.REQUEST_DELAY}s")
+    print(f"  sequential  {sequential_time:8.2f}s  {sequential_requests:4d} requests")
+    print(f"  concurrent  {concurrent_time:8.2f}s  {concurrent_requests:4d} requests  ({sequential_time / concurrent_time:.1f}x, {args.workers} workers)")
+    print(f"  pipelined   {pipelined_time:8.2f}s  {pipelined_requests:4d} requests  ({sequential_time / pipelined_time:.1f}x, {args.workers} workers + {args.parse_workers} parse processes)")
+    print(f"  sitemap     {sitemap_time:8.2f}s  {sitemap_requests:4d} requests  ({sequential_time / sitemap_time:.1f}x, {args.workers} workers)")
+    print(f"  identical output: {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Dedup Benchmark
+Plants known near-duplicate sections and code examples in a synthetic
+corpus and measures how many dedup.py finds (recall), how many unique
+blocks it drops by mistake, and how scan time grows with corpus size.
+
+Usage: python bench_dedup.py [--sections 10000 20000 40000] [--dup-rate 0.2]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bench_distractors import make_course
+from course_writer import CourseWriter
+from dedup import Deduplicator, deduplicate
+
+
+def plant_duplicates(course: dict, rng: random.Random, pool: list, dup_rate: float) -> set:
+    """Replace some sections with slightly edited copies of earlier ones; return their positions."""
+    planted = set()
+    for l, lesson in enumerate(course["lessons"]):
+        for s, section in enumerate(lesson["sections"]):
+            section["examples"] = [{"code": f"const v{l}_{s} = compute({l}, {s});\nconsole.log(v{l}_{s} * {rng.random():.6f});",
+                                    "language": "javascript"}]
+            if pool and rng.random() < dup_rate:
+                original = rng.choice(pool)
+                words = original["content"][0].split()
+                # A one-word edit, as when a page repeats a paragraph with a different name in it
+                words[rng.randrange(len(words))] = "edited"
+                lesson["sections"][s] = {**original, "content": [" ".join(words)] + original["content"][1:]}
+                planted.add((course["id"], l, s))
+            else:
+                pool.append(section)
+    return planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection")
+    parser.add_argument("--sections", type=int, nargs="+", default=[10000, 20000, 40000])
+    parser.add_argument("--dup-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"  {'sections':>9} {'scan':>8} {'per 1k':>8} {'recall':>7} {'false +':>8} {'saved MB':>9}")
+    for total in args.sections:
+        rng = random.Random(total)
+        pool = []
+        courses = []
+        planted = set()
+        for c in range(max(1, total // 640)):
+            course = make_course(f"course{c}", 80)
+            planted |= plant_duplicates(course, rng, pool, args.dup_rate)
+            courses.append(course)
+
+        dedup = Deduplicator()
+        start = time.perf_counter()
+        for course in courses:
+            dedup.scan(course)
+        elapsed = time.perf_counter() - start
+
+        found = {key for key in dedup.dropped if len(key) == 3}
+        recall = len(found & planted) / (len(planted) or 1)
+        sections = dedup.stats["sections"]
+        print(f"  {sections:9d} {elapsed:7.2f}s {elapsed / sections * 1000:7.2f}s {recall:7.1%} "
+              f"{len(found - planted):8d} {dedup.stats['bytes_saved'] / 1e6:9.2f}")
+
+    # End to end on the last corpus, through the streaming reader and writer
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "courses.json")
+        writer = CourseWriter(path, {"source": "synthetic"})
+        for course in courses:
+            writer.write_course(course, course["lessons"])
+        writer.close()
+        before = os.path.getsize(path)
+        start = time.perf_counter()
+        stats = deduplicate(path, path)
+        print(f"\nEnd to end: {before / 1e6:.1f} MB -> {os.path.getsize(path) / 1e6:.1f} MB "
+              f"in {time.perf_counter() - start:.1f}s ({stats['dropped_sections']} sections dropped)")
+
+
+if __name__ == "__main__":
+    main()
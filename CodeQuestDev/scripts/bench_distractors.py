@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Distractor Benchmark
+Times quiz generation with the TF-IDF distractor index against the fixed
+placeholder answers, per course over a whole corpus, and checks that the
+cost per lesson stays flat as a course grows.
+
+Usage: python bench_distractors.py [--data w3schools_courses.json] [--courses 22] [--lessons 80]
+
+Without --data, a synthetic corpus with Zipf-distributed vocabulary is used.
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, Iterable
+
+from convert_to_lessons import generate_quiz
+from course_reader import iter_courses
+from distractors import FIXED_DISTRACTORS, DistractorIndex
+
+
+def make_course(course_id: str, lessons: int, sections: int = 8, vocabulary: int = 5000, seed: int = 0) -> Dict:
+    """A course whose section texts are drawn from a Zipf-like vocabulary."""
+    rng = random.Random(f"{seed}-{course_id}")
+    words = [f"term{n}" for n in range(vocabulary)]
+    weights = [1 / (n + 1) for n in range(vocabulary)]
+
+    def sentence(length: int) -> str:
+        return " ".join(rng.choices(words, weights, k=length)).capitalize() + "."
+
+    return {
+        "id": course_id,
+        "lessons": [
+            {
+                "id": f"{course_id}-{n}",
+                "title": sentence(3),
+                "sections": [
+                    {
+                        "heading": sentence(3),
+                        "content": [sentence(rng.randint(10, 30)) for _ in range(3)]
+                                   + [{"list": [sentence(5) for _ in range(4)]}],
+                        "examples": [],
+                    }
+                    for _ in range(sections)
+                ],
+            }
+            for n in range(lessons)
+        ],
+    }
+
+
+def quiz_course(course: Dict, indexed: bool) -> float:
+    """Seconds to generate every quiz in a course, including building its index."""
+    start = time.perf_counter()
+    distractors = DistractorIndex(course) if indexed else None
+    for lesson in course["lessons"]:
+        generate_quiz(lesson, course["id"], distractors)
+    return time.perf_counter() - start
+
+
+def report(courses: Iterable[Dict]):
+    print(f"  {'course':<14} {'lessons':>8} {'fixed':>9} {'tf-idf':>9} {'replaced':>9}")
+    worst = 0.0
+    for course in courses:
+        fixed = quiz_course(course, indexed=False)
+        indexed = quiz_course(course, indexed=True)
+        worst = max(worst, indexed)
+        # Share of wrong answers that came from the corpus instead of the placeholders
+        distractors = DistractorIndex(course)
+        options = [o for lesson in course["lessons"]
+                   for q in generate_quiz(lesson, course["id"], distractors) for o in q["options"][1:]]
+        replaced = sum(o not in FIXED_DISTRACTORS for o in options) / (len(options) or 1)
+        print(f"  {course['id']:<14} {len(course['lessons']):8d} {fixed * 1000:7.1f}ms {indexed * 1000:7.1f}ms {replaced:8.0%}")
+    print(f"  slowest course: {worst * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quiz distractor generation")
+    parser.add_argument("--data", help="Scraped corpus to use instead of synthetic courses")
+    parser.add_argument("--courses", type=int, default=22)
+    parser.add_argument("--lessons", type=int, default=80)
+    args = parser.parse_args()
+
+    print("Per course:")
+    if args.data:
+        report(iter_courses(args.data))
+    else:
+        report(make_course(f"course{c}", args.lessons) for c in range(args.courses))
+
+    print("\nScaling (one course):")
+    print(f"  {'lessons':>8} {'total':>9} {'per lesson':>11}")
+    for factor in (1, 4, 16, 64):
+        course = make_course("scale", args.lessons * factor)
+        elapsed = quiz_course(course, indexed=True)
+        print(f"  {len(course['lessons']):8d} {elapsed * 1000:7.1f}ms {elapsed / len(course['lessons']) * 1e6:9.0f}us")
+
+
+if __name__ == "__main__":
+    main()
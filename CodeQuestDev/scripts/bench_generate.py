@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Module Generation Benchmark
+Compares the TsEmitter-based write_module with the previous nested f-string
+generate_module on a synthetic course, reporting lessons/sec and peak
+Python memory, and checks both produce the same TypeScript. "-> file" is
+the emitter streaming to a file, as convert_to_lessons.py uses it, and
+"normalized" also normalizes the course's sections up front (SectionTexts).
+
+Usage: python bench_generate.py [--lessons 1200] [--sections 8] [--repeat 5]
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+from convert_to_lessons import convert_lesson, write_module
+from section_text import SectionTexts
+from ts_emitter import TsEmitter
+
+
+def legacy_generate_module(course: Dict, module_name: str, lessons: List[Dict],
+                           difficulty: str, required_xp: int = None) -> str:
+    """generate_module as it was before the emitter, for comparison."""
+    lesson_strs = []
+    for i, lesson in enumerate(lessons):
+        converted = convert_lesson(lesson, course['id'], i + 1)
+
+        sections_str = ",\n                    ".join([
+            f'''{{
+                        title: {json.dumps(s.get('title', ''), ensure_ascii=False)},
+                        text: {json.dumps(s.get('text', '')[:400], ensure_ascii=False)},
+                        {f"code: {json.dumps(s.get('code', '')[:300], ensure_ascii=False)}," if s.get('code') else ""}
+                    }}''' for s in converted['content']['sections'][:5]
+        ])
+
+        quiz_str = ",\n                ".join([
+            f'''{{
+                    id: {json.dumps(q['id'])},
+                    type: 'multiple-choice',
+                    question: {json.dumps(q['question'], ensure_ascii=False)},
+                    options: {json.dumps(q['options'], ensure_ascii=False)},
+                    correctAnswer: {q['correctAnswer']},
+                    explanation: {json.dumps(q['explanation'][:200], ensure_ascii=False)},
+                    points: {q['points']},
+                }}''' for q in converted['quiz']
+        ])
+
+        lesson_str = f'''        {{
+            id: {json.dumps(converted['id'])},
+            title: {json.dumps(converted['title'], ensure_ascii=False)},
+            description: {json.dumps(converted['description'], ensure_ascii=False)},
+            xpReward: {converted['xpReward']},
+            estimatedTime: {converted['estimatedTime']},
+            content: {{
+                introduction: {json.dumps(converted['content']['introduction'][:300], ensure_ascii=False)},
+                sections: [
+                    {sections_str}
+                ],
+            }},
+            quiz: [
+                {quiz_str}
+            ],
+        }}'''
+        lesson_strs.append(lesson_str)
+
+    lessons_joined = ",\n".join(lesson_strs)
+
+    required_xp_str = f"\n    requiredXP: {required_xp}," if required_xp else ""
+
+    return f'''export const {module_name}: LearningModule = {{
+    id: {json.dumps(course['id'])},
+    name: {json.dumps(course['name'], ensure_ascii=False)},
+    description: {json.dumps(course['description'], ensure_ascii=False)},
+    icon: {json.dumps(course['icon'])},
+    difficulty: {json.dumps(difficulty)},{required_xp_str}
+    lessons: [
+{lessons_joined}
+    ],
+}};'''
+
+
+def make_course(lessons: int, sections: int) -> Dict:
+    """A course shaped like the scraper output, with some sparse lessons mixed in."""
+    return {
+        "id": "css",
+        "name": "CSS Tutorial",
+        "description": "Learn CSS, the language for styling web pages.",
+        "icon": "🎨",
+        "lessons": [
+            {
+                "id": f"css-{n}",
+                "title": f"CSS lição {n}",
+                "sections": [
+                    {
+                        "heading": f"Seção {s} — \"{n}\"",
+                        "content": [f"Parágrafo {p} da seção {s} na lição {n}, com algum texto explicativo." for p in range(3)]
+                                   + [{"list": [f"Item {i} da lista" for i in range(4)]}],
+                        "examples": [{"code": f".s{s} {{ color: red; }} /* {n} */", "language": "css"}] if s % 2 else [],
+                    }
+                    # Every tenth lesson has no sections, to exercise the empty-list paths
+                    for s in range(0 if n % 10 == 0 else sections)
+                ],
+            }
+            for n in range(1, lessons + 1)
+        ],
+    }
+
+
+def legacy(course: Dict) -> str:
+    return legacy_generate_module(course, "CSS_BASICS", course["lessons"], "beginner", 300)
+
+
+def emitter(course: Dict) -> str:
+    out = io.StringIO()
+    write_module(TsEmitter(out), course, "CSS_BASICS", course["lessons"], "beginner", 300)
+    # write_module ends with a newline; generate_module's string did not
+    return out.getvalue()[:-1]
+
+
+def normalized(course: Dict) -> str:
+    out = io.StringIO()
+    write_module(TsEmitter(out), course, "CSS_BASICS", course["lessons"], "beginner", 300,
+                 texts=SectionTexts(course))
+    return out.getvalue()[:-1]
+
+
+def emitter_file(course: Dict) -> None:
+    # How convert_to_lessons runs it: straight to a file, nothing held in memory
+    with open(os.devnull, "w", encoding="utf-8") as out:
+        write_module(TsEmitter(out), course, "CSS_BASICS", course["lessons"], "beginner", 300)
+
+
+def run(fn, course: Dict, repeat: int) -> tuple:
+    """Return (output, best seconds, peak bytes), timing and tracing in separate passes."""
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(course)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(course)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TypeScript module generation")
+    parser.add_argument("--lessons", type=int, default=1200)
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per generator (best is reported)")
+    args = parser.parse_args()
+
+    course = make_course(args.lessons, args.sections)
+    print(f"Module: {args.lessons} lessons x {args.sections} sections")
+    print(f"  {'generator':<12} {'lessons/sec':>12} {'peak MB':>9}  same output")
+
+    reference = None
+    for name, fn in [("f-strings", legacy), ("TsEmitter", emitter), ("normalized", normalized),
+                     ("-> file", emitter_file)]:
+        output, elapsed, peak = run(fn, course, args.repeat)
+        reference = reference or output
+        same = "-" if output is None else "yes" if output == reference else "NO"
+        print(f"  {name:<12} {args.lessons / elapsed:12.0f} {peak / 1e6:9.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Language Detection Benchmark
+Compares the scored classifier with the previous if-chain detect_language:
+accuracy on a hand-labelled sample set, accuracy on every code example in
+the scraped corpus (labelled by the course it came from, where the course
+implies one language), and throughput.
+
+Usage: python bench_language.py [--data ../apps/web/data/w3schools_courses.json] [--repeat 20]
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+
+from course_reader import iter_courses
+from language_classifier import classify
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(SCRIPT_DIR, "..", "apps", "web", "data", "w3schools_courses.json")
+
+# Courses whose examples are (nearly) all in one language
+COURSE_LANGUAGE = {
+    "python": "python", "numpy": "python", "pandas": "python", "django": "python",
+    "sql": "sql", "mysql": "sql",
+    "java": "java", "c": "c", "cpp": "cpp", "php": "php",
+    "javascript": "javascript", "nodejs": "javascript", "jquery": "javascript",
+    "typescript": "typescript", "html": "html",
+}
+
+SAMPLES = [
+    ("html", '<!DOCTYPE html>\n<html>\n<body>\n<h1>My First Heading</h1>\n<p>My first paragraph.</p>\n</body>\n</html>'),
+    ("html", '<a href="https://www.w3schools.com">This is a link</a>\n<img src="w3schools.jpg" alt="W3Schools.com">'),
+    ("html", '<form action="/action_page.php">\n  <label for="fname">First name:</label>\n  <input type="text" id="fname" name="fname">\n</form>'),
+    ("css", 'body {\n  background-color: lightblue;\n}\nh1 {\n  color: white;\n  text-align: center;\n}'),
+    ("css", '.center {\n  margin: auto;\n  width: 50%;\n  border: 3px solid green;\n  padding: 10px;\n}'),
+    ("css", '@media screen and (min-width: 480px) {\n  body {\n    background-color: lightgreen;\n  }\n}'),
+    ("javascript", 'const x = 5;\nlet y = x + 2;\ndocument.getElementById("demo").innerHTML = y;'),
+    ("javascript", 'function myFunction(p1, p2) {\n  return p1 * p2;\n}'),
+    ("javascript", 'const fruits = ["Banana", "Orange"];\nfruits.forEach(f => console.log(f));'),
+    ("typescript", 'interface Person {\n  name: string;\n  age: number;\n}'),
+    ("typescript", 'function add(a: number, b: number): number {\n  return a + b;\n}'),
+    ("python", 'def my_function(fname):\n  print(fname + " Refsnes")\n\nmy_function("Emil")'),
+    ("python", 'import numpy as np\n\narr = np.array([1, 2, 3, 4, 5])\nprint(arr)'),
+    ("python", 'for x in range(6):\n  if x == 3:\n    break\n  print(x)'),
+    ("python", 'class Person:\n  def __init__(self, name, age):\n    self.name = name\n    self.age = age'),
+    ("sql", "SELECT CustomerName, City FROM Customers WHERE Country = 'Mexico';"),
+    ("sql", "INSERT INTO Customers (CustomerName, City)\nVALUES ('Cardinal', 'Stavanger');"),
+    ("sql", "CREATE TABLE Persons (\n    PersonID int,\n    LastName varchar(255)\n);"),
+    ("c", '#include <stdio.h>\n\nint main() {\n  printf("Hello World!");\n  return 0;\n}'),
+    ("c", 'int myNum = 15;\nprintf("%d", myNum);'),
+    ("cpp", '#include <iostream>\nusing namespace std;\n\nint main() {\n  cout << "Hello World!";\n  return 0;\n}'),
+    ("cpp", 'std::string greeting = "Hello";\nstd::cout << greeting;'),
+    ("java", 'public class Main {\n  public static void main(String[] args) {\n    System.out.println("Hello World");\n  }\n}'),
+    ("java", 'String txt = "Hello World";\nSystem.out.println(txt.toUpperCase());'),
+    ("php", '<?php\n$txt = "W3Schools.com";\necho "I love $txt!";\n?>'),
+    ("php", '$cars = array("Volvo", "BMW", "Toyota");\necho count($cars);'),
+    ("text", 'Hello World!'),
+]
+
+
+def legacy_detect_language(code: str) -> str:
+    """detect_language as it was before the classifier, for comparison."""
+    code_lower = code.lower()
+
+    if "<!doctype" in code_lower or "<html" in code_lower or "<div" in code_lower:
+        return "html"
+    elif ":" in code and ";" in code and not "function" in code_lower and ("color" in code_lower or "background" in code_lower or "margin" in code_lower):
+        return "css"
+    elif "def " in code or "import " in code and "from " in code:
+        return "python"
+    elif "function " in code or "const " in code or "let " in code or "=>" in code:
+        return "javascript"
+    elif "SELECT " in code.upper() or "FROM " in code.upper() or "WHERE " in code.upper():
+        return "sql"
+    elif "#include" in code or "int main(" in code:
+        return "c"
+    elif "public class" in code or "public static void" in code:
+        return "java"
+    elif "<?php" in code_lower:
+        return "php"
+
+    return "text"
+
+
+DETECTORS = {
+    "if-chain": legacy_detect_language,
+    "classifier": lambda code: classify(code)[0],
+}
+
+
+def corpus_examples(path: str) -> list:
+    """(course id, code) for every example in the corpus."""
+    examples = []
+    for course in iter_courses(path):
+        for lesson in course.get("lessons", []):
+            for block in [lesson, *lesson.get("sections", [])]:
+                for example in block.get("examples", []):
+                    examples.append((course["id"], example.get("code", "")))
+    return examples
+
+
+def accuracy(detect, labelled: list) -> float:
+    return sum(detect(code) == label for label, code in labelled) / (len(labelled) or 1)
+
+
+def throughput(detect, snippets: list, repeat: int) -> float:
+    """Best snippets/sec over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code in snippets:
+            detect(code)
+        best = min(best, time.perf_counter() - start)
+    return len(snippets) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark code language detection")
+    parser.add_argument("--data", default=DATA_PATH, help="Scraped corpus (skipped if missing)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    examples = corpus_examples(args.data) if os.path.exists(args.data) else []
+    labelled = [(COURSE_LANGUAGE[course], code) for course, code in examples if course in COURSE_LANGUAGE]
+    snippets = [code for _, code in examples] or [code for _, code in SAMPLES]
+    size_mb = sum(len(code) for code in snippets) / 1e6
+
+    print(f"Samples: {len(SAMPLES)} hand-labelled, {len(examples)} corpus examples "
+          f"({len(labelled)} with a course label)")
+    print(f"  {'detector':<12} {'samples':>8} {'corpus':>8} {'snippets/sec':>13} {'MB/s':>7}")
+    for name, detect in DETECTORS.items():
+        rate = throughput(detect, snippets, args.repeat)
+        corpus = f"{accuracy(detect, labelled):8.1%}" if labelled else f"{'-':>8}"
+        print(f"  {name:<12} {accuracy(detect, SAMPLES):8.1%} {corpus} {rate:13.0f} "
+              f"{rate * size_mb / len(snippets):7.2f}")
+
+    if examples:
+        confidences = [classify(code)[1] for code in snippets]
+        low = sum(c < 0.6 for c in confidences)
+        print(f"\nClassifier: {Counter(classify(code)[0] for code in snippets).most_common()}")
+        print(f"  {low} of {len(snippets)} examples below 0.6 confidence")
+
+
+if __name__ == "__main__":
+    main()
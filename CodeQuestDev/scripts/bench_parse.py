@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Parse Benchmark
+Measures extract_lesson_content throughput (pages/sec) and peak Python
+memory for each HTML parser backend, comparing the linear extraction walk
+with the previous find_all + find_parent walk.
+
+Usage: python bench_parse.py [--pages-dir saved_pages/] [--pages 200] [--sections 40]
+
+--pages-dir is searched recursively for saved lesson pages (*.asp, *.php, *.html).
+Without it, a synthetic corpus of long lesson pages is generated.
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+import scraper
+from bench_crawl import make_synthetic_site
+
+
+def legacy_extract_lesson_content(soup: BeautifulSoup, url: str) -> dict:
+    """extract_lesson_content as it was before the linear walk, for comparison."""
+    content = {"sections": [], "examples": [], "source": urljoin(scraper.BASE_URL, url)}
+    main = soup.find("div", {"id": "main"}) or soup.find("div", class_="w3-main")
+    if not main:
+        return content
+    title_elem = main.find("h1")
+    if title_elem:
+        content["title"] = title_elem.get_text(strip=True)
+
+    current_section = {"heading": "", "content": [], "examples": []}
+    for elem in main.find_all(["h1", "h2", "h3", "p", "ul", "ol", "pre", "div"], recursive=True):
+        elem_classes = str(elem.get("class", []))
+        if any(c in elem_classes for c in ["w3-btn", "nextprev", "w3-panel", "w3-note"]):
+            continue
+        if elem.find_parent(class_=["nextprev", "w3-btn"]):
+            continue
+        if elem.name in ["h1", "h2", "h3"]:
+            if current_section["content"] or current_section["examples"]:
+                content["sections"].append(current_section.copy())
+            current_section = {"heading": elem.get_text(strip=True), "content": [], "examples": []}
+        elif elem.name == "p":
+            text = elem.get_text(strip=True)
+            if text and len(text) > 15 and not text.startswith("❮") and not text.startswith("❯"):
+                current_section["content"].append(text)
+        elif elem.name in ["ul", "ol"]:
+            items = [li.get_text(strip=True) for li in elem.find_all("li", recursive=False)]
+            items = [item for item in items if len(item) > 5]
+            if items:
+                current_section["content"].append({"list": items})
+        elif elem.name == "pre" or (elem.name == "div" and "w3-code" in elem_classes):
+            code = elem.get_text()
+            if code and len(code.strip()) > 10:
+                current_section["examples"].append({"code": code.strip(), "language": scraper.detect_language(code)})
+    if current_section["content"] or current_section["examples"]:
+        content["sections"].append(current_section)
+    return content
+
+
+WALKS = {
+    "linear": scraper.extract_lesson_content,
+    "find_parent": legacy_extract_lesson_content,
+}
+
+
+def load_corpus(pages_dir: str) -> list:
+    pages = []
+    for pattern in ("*.asp", "*.php", "*.html"):
+        for path in glob.glob(os.path.join(pages_dir, "**", pattern), recursive=True):
+            if os.path.basename(path) in ("default.asp", "index.php"):
+                continue  # course index pages, not lessons
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append(("/" + os.path.relpath(path, pages_dir), f.read()))
+    return sorted(pages)
+
+
+def run(corpus: list, parser: str, extract) -> tuple:
+    """Parse and extract every page; return (results, seconds, peak bytes).
+
+    Timing and memory are measured in separate passes, since tracemalloc
+    slows allocation-heavy code down considerably.
+    """
+    start = time.perf_counter()
+    results = [extract(BeautifulSoup(html, parser), url) for url, html in corpus]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for url, html in corpus:
+        extract(BeautifulSoup(html, parser), url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return results, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends for lesson extraction")
+    parser.add_argument("--pages-dir", help="Directory of saved lesson pages (default: synthetic corpus)")
+    parser.add_argument("--pages", type=int, default=200, help="Pages in the synthetic corpus")
+    parser.add_argument("--sections", type=int, default=40, help="Sections per synthetic page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_dir = args.pages_dir
+        if not pages_dir:
+            pages_dir = tmp
+            make_synthetic_site(pages_dir, ["html"], args.pages, args.sections)
+        corpus = load_corpus(pages_dir)
+
+    size_mb = sum(len(html) for _, html in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} pages, {size_mb:.1f} MB")
+    print(f"  {'parser':<12} {'walk':<12} {'pages/sec':>10} {'peak MB':>9}  same output")
+
+    reference = None
+    for backend in scraper.PARSERS:
+        try:
+            BeautifulSoup("", backend)
+        except FeatureNotFound:
+            print(f"  {backend:<12} (not installed)")
+            continue
+        for walk, extract in WALKS.items():
+            results, elapsed, peak = run(corpus, backend, extract)
+            reference = reference or results
+            same = "yes" if results == reference else "NO"
+            print(f"  {backend:<12} {walk:<12} {len(corpus) / elapsed:10.1f} {peak / 1e6:9.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
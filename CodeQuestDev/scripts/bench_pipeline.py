@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Runs the whole scrape-and-convert pipeline against a recorded response
+archive, with no network access, and reports pages/sec and peak memory per
+stage. With --baseline it exits non-zero when a stage got slower or bigger
+than --tolerance allows, so runs can be compared across changes.
+
+Usage: python bench_pipeline.py [--archive responses.warc.gz] [--baseline bench.json] [--save bench.json]
+
+Record a real archive with: python scraper.py --record responses.warc.gz
+Without --archive, one is recorded from bench_crawl's synthetic site.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from archive import ArchiveWriter
+from bench_crawl import make_synthetic_site
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs a command and prints the peak RSS (KiB) of the largest process it started,
+# workers included, without counting the benchmark's other stages
+_MEASURE = ("import resource, subprocess, sys; "
+            "subprocess.run(sys.argv[1:], check=True, stdout=subprocess.DEVNULL); "
+            "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)")
+
+
+def synthetic_archive(path: str, course_ids: list, lessons: int):
+    """Record the synthetic site's pages as if they had been fetched from the real one."""
+    import scraper
+    with tempfile.TemporaryDirectory() as site:
+        make_synthetic_site(site, course_ids, lessons)
+        writer = ArchiveWriter(path)
+        for root, _, files in os.walk(site):
+            for name in files:
+                file_path = os.path.join(root, name)
+                url = "/" + os.path.relpath(file_path, site).replace(os.sep, "/")
+                with open(file_path, "rb") as f:
+                    writer.record(scraper.SITE_URL + url, f.read())
+        writer.close()
+
+
+def measure(command: list) -> tuple:
+    """(seconds, peak RSS in MB) of a command."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", _MEASURE, *command], check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, int(result.stdout.split()[-1]) / 1024
+
+
+def run_pipeline(archive: str, work: str, parse_workers: int, jobs: int) -> dict:
+    corpus = os.path.join(work, "courses.json")
+    metrics_path = os.path.join(work, "metrics.json")
+    scrape_seconds, scrape_rss = measure([
+        sys.executable, os.path.join(SCRIPT_DIR, "scraper.py"), "--replay", archive, "--no-cache", "--concurrent",
+        "--parse-workers", str(parse_workers), "--journal", os.path.join(work, "journal.jsonl"),
+        "--output", corpus, "--format", "compact", "--metrics-json", metrics_path,
+    ])
+    with open(metrics_path, "r", encoding="utf-8") as f:
+        summary = json.load(f)
+    pages = summary["metrics"]["scraper_parse_seconds"]["count"]
+
+    convert_seconds, convert_rss = measure([
+        sys.executable, os.path.join(SCRIPT_DIR, "convert_to_lessons.py"), "--data", corpus, "--format", "both",
+        "--full", "--jobs", str(jobs), "--output-dir", os.path.join(work, "ts"),
+        "--pack-dir", os.path.join(work, "pack"), "--manifest", os.path.join(work, "manifest.json"),
+    ])
+    return {
+        "scrape": {"seconds": scrape_seconds, "pages_per_sec": pages / scrape_seconds, "peak_rss_mb": scrape_rss,
+                   "pages": pages},
+        "convert": {"seconds": convert_seconds, "pages_per_sec": summary["lessons"] / convert_seconds,
+                    "peak_rss_mb": convert_rss, "pages": summary["lessons"]},
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for stage, now in results.items():
+        before = baseline.get(stage)
+        if not before:
+            continue
+        if now["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            problems.append(f"{stage}: {now['pages_per_sec']:.1f} pages/s, baseline {before['pages_per_sec']:.1f}")
+        if now["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            problems.append(f"{stage}: {now['peak_rss_mb']:.1f} MB peak, baseline {before['peak_rss_mb']:.1f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrape-and-convert pipeline offline")
+    parser.add_argument("--archive", help="Recorded responses (default: a synthetic archive)")
+    parser.add_argument("--courses", nargs="+", default=["html", "css", "javascript", "python", "php"],
+                        help="Courses in the synthetic archive")
+    parser.add_argument("--lessons", type=int, default=40, help="Lessons per course in the synthetic archive")
+    parser.add_argument("--parse-workers", type=int, default=0, help="scraper.py --parse-workers (default: parse in threads)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="convert_to_lessons.py --jobs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best is kept")
+    parser.add_argument("--baseline", help="Results JSON from an earlier --save to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown / growth before failing (default: 20%%)")
+    parser.add_argument("--save", help="Write the results JSON here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = args.archive
+        if not archive:
+            archive = os.path.join(tmp, "synthetic.warc.gz")
+            synthetic_archive(archive, args.courses, args.lessons)
+
+        runs = []
+        for n in range(args.repeat):
+            work = os.path.join(tmp, f"run{n}")
+            os.makedirs(work)
+            runs.append(run_pipeline(archive, work, args.parse_workers, args.jobs))
+
+    results = {}
+    for stage in runs[0]:
+        best = max((run[stage] for run in runs), key=lambda r: r["pages_per_sec"])
+        results[stage] = {**best, "peak_rss_mb": min(run[stage]["peak_rss_mb"] for run in runs)}
+
+    print(f"Archive: {args.archive or 'synthetic'} | best of {args.repeat}")
+    print(f"  {'stage':<8} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'peak MB':>8}")
+    for stage, r in results.items():
+        print(f"  {stage:<8} {r['pages']:6d} {r['seconds']:8.2f} {r['pages_per_sec']:8.1f} {r['peak_rss_mb']:8.1f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = regressions(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"  ✅ Within {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Corpus Loading Benchmark
+Compares json.load of the whole w3schools_courses.json with the streaming
+course_reader, on a synthetic corpus of 100 courses.
+
+Usage: python bench_reader.py [--courses 100] [--lessons 60] [--format pretty]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from course_reader import iter_courses
+from course_writer import CourseWriter, FORMATS
+
+# Courses convert_to_lessons.py generates files for, at their usual positions
+CONVERTED = {1: "css", 2: "javascript", 12: "php"}
+
+
+def make_synthetic_corpus(path: str, courses: int, lessons: int, sections: int = 8, fmt: str = "pretty"):
+    """Write a corpus shaped like the scraper output."""
+    writer = CourseWriter(path, {"source": "synthetic", "license": "Educational use only"}, fmt)
+    for c in range(courses):
+        course_id = CONVERTED.get(c, f"course{c}")
+        course = {
+            "id": course_id,
+            "name": f"{course_id.title()} Tutorial",
+            "description": f"Learn {course_id}.",
+            "category": "frontend",
+            "difficulty": "beginner",
+            "icon": "📄",
+            "source": f"https://www.w3schools.com/{course_id}/default.asp",
+        }
+        writer.write_course(course, (
+            {
+                "id": f"{course_id}-{n}",
+                "title": f"{course_id} lesson {n}",
+                "order": n,
+                "sections": [
+                    {
+                        "heading": f"Section {s}",
+                        "content": [f"Paragraph {p} of section {s} in lesson {n} of {course_id}, with some text." for p in range(4)]
+                                   + [{"list": [f"Item {i} of the list" for i in range(5)]}],
+                        "examples": [{"code": f"<div class=\"s{s}\">{{ example {n} }}</div>", "language": "html"}],
+                    }
+                    for s in range(sections)
+                ],
+                "examples": [],
+                "source": f"https://www.w3schools.com/{course_id}/lesson{n}.asp",
+            }
+            for n in range(1, lessons + 1)
+        ))
+    writer.close()
+
+
+def measure(fn) -> tuple:
+    """Run ``fn`` twice: once for wall-clock time, once under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark corpus loading for convert_to_lessons.py")
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--lessons", type=int, default=60)
+    parser.add_argument("--format", choices=FORMATS, default="pretty")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"courses.{'ndjson' if args.format == 'ndjson' else 'json'}")
+        make_synthetic_corpus(path, args.courses, args.lessons, fmt=args.format)
+        wanted = set(CONVERTED.values())
+
+        def json_load():
+            # What load_data() + the linear scan in main() used to do
+            with open(path, "r", encoding="utf-8") as f:
+                if args.format == "ndjson":
+                    records = [json.loads(line) for line in f]
+                    return sum(1 for r in records if r["type"] == "lesson" and r["course"] in wanted)
+                data = json.load(f)
+            return sum(len(c["lessons"]) for c in data["courses"] if c["id"] in wanted)
+
+        def stream_all():
+            return sum(len(c["lessons"]) for c in iter_courses(path) if c["id"] in wanted)
+
+        def stream_wanted():
+            return sum(len(c["lessons"]) for c in iter_courses(path, wanted))
+
+        print(f"Corpus: {args.courses} courses x {args.lessons} lessons, {os.path.getsize(path) / 1e6:.1f} MB ({args.format})")
+        print(f"  {'reader':<26} {'time':>8} {'peak MB':>9}")
+        for name, fn in [("json.load", json_load), ("iter_courses (all)", stream_all), ("iter_courses (css/js/php)", stream_wanted)]:
+            lessons, elapsed, peak = measure(fn)
+            print(f"  {name:<26} {elapsed:7.2f}s {peak / 1e6:9.1f}   ({lessons} lessons)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Content pack format for generated lessons.
+An indexed binary alternative to the .ts lesson files, so the web app can
+fetch the module index once and then load single lessons with HTTP range
+requests (see apps/web/content/content-pack.ts).
+
+Layout, all integers little-endian:
+
+    magic      4 bytes   b"CQPK"
+    version    u16       PACK_VERSION
+    flags      u16       0
+    count      u32       number of lessons
+    index_len  u32       byte length of the index
+    table      count x (u32 offset, u32 length), offsets from the start of data
+    index      UTF-8 JSON: {"modules": [module without "lessons", plus
+               "lessons": [lesson summaries, in table order]]}
+    data       UTF-8 JSON of each lesson, back to back
+"""
+
+import json
+import struct
+from typing import BinaryIO, Dict, Iterable, List, Tuple
+
+MAGIC = b"CQPK"
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<II")
+
+# Lesson fields repeated in the index, enough to list a module without loading its lessons
+SUMMARY_FIELDS = ("id", "title", "description", "xpReward", "estimatedTime")
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_pack(out: BinaryIO, modules: Iterable[Tuple[Dict, List[Dict]]]):
+    """Write a pack from (module metadata, lessons) pairs."""
+    index = []
+    table = []
+    bodies = []
+    offset = 0
+    for module, lessons in modules:
+        summaries = []
+        for lesson in lessons:
+            body = _encode(lesson)
+            table.append(ENTRY.pack(offset, len(body)))
+            bodies.append(body)
+            offset += len(body)
+            summaries.append({k: lesson[k] for k in SUMMARY_FIELDS})
+        index.append({**module, "lessons": summaries})
+
+    index_bytes = _encode({"modules": index})
+    out.write(HEADER.pack(MAGIC, PACK_VERSION, 0, len(table), len(index_bytes)))
+    out.write(b"".join(table))
+    out.write(index_bytes)
+    for body in bodies:
+        out.write(body)
+
+
+class ContentPack:
+    """Read a pack from a file, loading lessons on demand."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        magic, version, _, count, index_len = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path}: not a version {PACK_VERSION} content pack")
+        self.table = [ENTRY.unpack(self.file.read(ENTRY.size)) for _ in range(count)]
+        self.modules = json.loads(self.file.read(index_len))["modules"]
+        self.data_start = HEADER.size + ENTRY.size * count + index_len
+        self.positions = {}
+        position = 0
+        for module in self.modules:
+            for summary in module["lessons"]:
+                self.positions[summary["id"]] = position
+                position += 1
+
+    def lesson(self, lesson_id: str) -> Dict:
+        """Load one lesson by id."""
+        offset, length = self.table[self.positions[lesson_id]]
+        self.file.seek(self.data_start + offset)
+        return json.loads(self.file.read(length))
+
+    def close(self):
+        self.file.close()
@@ -4,28 +4,47 @@ W3Schools to CodeQuest Converter
 Converts extracted W3Schools data to CodeQuest lesson format with quizzes
 """
 
+import argparse
 import json
 import os
 import re
-from typing import List, Dict, Any
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Dict, Any, BinaryIO, Callable, IO, Iterable, Optional, TextIO, Tuple
+
+from content_pack import ContentPack, write_pack
+from course_reader import iter_courses
+from distractors import FIXED_DISTRACTORS, DistractorIndex
+from lesson_splitter import SPLIT_BUDGET, split_lessons
+from manifest import MANIFEST_PATH, MANIFEST_VERSION, changed_lessons, content_hash, course_entry, load_manifest, save_manifest
+from section_text import DESCRIPTION_LIMIT, EXPLANATION_LIMIT, SectionTexts, normalize_section
+from ts_emitter import TsEmitter, with_last
 
 # Load W3Schools data
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_PATH = os.path.join(SCRIPT_DIR, "..", "apps", "web", "data", "w3schools_courses.json")
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "..", "apps", "web", "content")
+# Served as static files, so the app can fetch single lessons with range requests
+PACK_DIR = os.path.join(SCRIPT_DIR, "..", "apps", "web", "public", "content")
 
 def load_data():
+    """Load the whole corpus at once (see course_reader.iter_courses for streaming)"""
     with open(DATA_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def generate_quiz(lesson: Dict, course_id: str) -> List[Dict]:
-    """Generate quiz questions based on lesson content"""
+def generate_quiz(lesson: Dict, course_id: str, distractors: Optional[DistractorIndex] = None,
+                  texts: Optional[SectionTexts] = None) -> List[Dict]:
+    """Generate quiz questions based on lesson content
+
+    Wrong answers come from similar sections elsewhere in the course when a
+    DistractorIndex for it is given, and are fixed placeholders otherwise.
+    """
     quizzes = []
     sections = lesson.get('sections', [])
+    normalized = texts.lesson(lesson) if texts else [normalize_section(s) for s in sections[:6]]
     
     # Generate questions from content
-    for i, section in enumerate(sections[:6]):  # Max 6 questions per lesson
-        heading = section.get('heading', '')
-        content = section.get('content', [])
+    for i, (section, text) in enumerate(zip(sections[:6], normalized)):  # Max 6 questions per lesson
+        heading = text.title
         
         if not heading or heading in ['Example', 'Exemplo']:
             continue
@@ -42,62 +61,45 @@ def generate_quiz(lesson: Dict, course_id: str) -> List[Dict]:
         }
         
         # Get correct content
-        correct_text = ""
-        for c in content:
-            if isinstance(c, str) and len(c) > 20:
-                correct_text = c[:100] + "..." if len(c) > 100 else c
-                break
-        
-        if correct_text:
-            quiz['options'] = [
-                correct_text[:80],
-                "Nenhuma das anteriores está correta",
-                "Isso não é um conceito válido",
-                "Essa informação está incorreta"
-            ]
-            quiz['explanation'] = correct_text
+        if text.answer:
+            wrong = distractors.distractors(section) if distractors else FIXED_DISTRACTORS
+            quiz['options'] = [text.option, *wrong]
+            quiz['explanation'] = text.answer
             quizzes.append(quiz)
     
     return quizzes[:5]  # Max 5 questions per lesson
 
 
-def convert_lesson(lesson: Dict, course_id: str, order: int) -> Dict:
+def lesson_xp(sections: int) -> int:
+    """XP based on content length"""
+    return min(150, 50 + sections * 15)
+
+
+def convert_lesson(lesson: Dict, course_id: str, order: int,
+                   distractors: Optional[DistractorIndex] = None,
+                   texts: Optional[SectionTexts] = None) -> Dict:
     """Convert W3Schools lesson to CodeQuest format"""
+    normalized = texts.lesson(lesson) if texts else [normalize_section(s) for s in lesson.get('sections', [])]
     sections = []
     
-    for section in lesson.get('sections', []):
-        if section.get('heading'):
-            content_parts = section.get('content', [])
-            text_parts = []
-            
-            for part in content_parts:
-                if isinstance(part, str):
-                    text_parts.append(part)
-                elif isinstance(part, dict) and 'list' in part:
-                    text_parts.append(". ".join(part['list']))
-            
+    for text in normalized:
+        if text.title:
             section_data = {
-                'title': section['heading'],
-                'text': " ".join(text_parts)[:500]
+                'title': text.title,
+                'text': text.text
             }
             
             # Add code examples
-            examples = section.get('examples', [])
-            if examples:
-                section_data['code'] = examples[0].get('code', '')[:300]
+            if text.code is not None:
+                section_data['code'] = text.code
             
             sections.append(section_data)
     
-    # Calculate XP based on content length
-    xp = 50 + (len(sections) * 15)
-    if xp > 150:
-        xp = 150
-    
     return {
         'id': lesson.get('id', f'{course_id}-{order}'),
         'title': lesson.get('title', 'Lição'),
-        'description': sections[0]['text'][:100] if sections else 'Aprenda este conceito',
-        'xpReward': xp,
+        'description': sections[0]['text'][:DESCRIPTION_LIMIT] if sections else 'Aprenda este conceito',
+        'xpReward': lesson_xp(len(sections)),
         'estimatedTime': max(5, len(sections) * 3),
         'content': {
             'introduction': sections[0]['text'] if sections else '',
@@ -105,241 +107,484 @@ def convert_lesson(lesson: Dict, course_id: str, order: int) -> Dict:
             'tips': [],
             'commonMistakes': []
         },
-        'quiz': generate_quiz(lesson, course_id)
+        'quiz': generate_quiz(lesson, course_id, distractors, texts)
     }
 
 
-def generate_module(course: Dict, module_name: str, lessons: List[Dict], 
-                   difficulty: str, required_xp: int = None) -> str:
-    """Generate TypeScript module definition"""
-    
-    lesson_strs = []
-    for i, lesson in enumerate(lessons):
-        converted = convert_lesson(lesson, course['id'], i + 1)
-        
-        sections_str = ",\n                    ".join([
-            f'''{{
-                        title: {json.dumps(s.get('title', ''), ensure_ascii=False)},
-                        text: {json.dumps(s.get('text', '')[:400], ensure_ascii=False)},
-                        {f"code: {json.dumps(s.get('code', '')[:300], ensure_ascii=False)}," if s.get('code') else ""}
-                    }}''' for s in converted['content']['sections'][:5]
-        ])
-        
-        quiz_str = ",\n                ".join([
-            f'''{{
-                    id: {json.dumps(q['id'])},
-                    type: 'multiple-choice',
-                    question: {json.dumps(q['question'], ensure_ascii=False)},
-                    options: {json.dumps(q['options'], ensure_ascii=False)},
-                    correctAnswer: {q['correctAnswer']},
-                    explanation: {json.dumps(q['explanation'][:200], ensure_ascii=False)},
-                    points: {q['points']},
-                }}''' for q in converted['quiz']
-        ])
-        
-        lesson_str = f'''        {{
-            id: {json.dumps(converted['id'])},
-            title: {json.dumps(converted['title'], ensure_ascii=False)},
-            description: {json.dumps(converted['description'], ensure_ascii=False)},
-            xpReward: {converted['xpReward']},
-            estimatedTime: {converted['estimatedTime']},
-            content: {{
-                introduction: {json.dumps(converted['content']['introduction'][:300], ensure_ascii=False)},
-                sections: [
-                    {sections_str}
-                ],
-            }},
-            quiz: [
-                {quiz_str}
-            ],
-        }}'''
-        lesson_strs.append(lesson_str)
-    
-    lessons_joined = ",\n".join(lesson_strs)
-    
-    required_xp_str = f"\n    requiredXP: {required_xp}," if required_xp else ""
-    
-    return f'''export const {module_name}: LearningModule = {{
-    id: {json.dumps(course['id'])},
-    name: {json.dumps(course['name'], ensure_ascii=False)},
-    description: {json.dumps(course['description'], ensure_ascii=False)},
-    icon: {json.dumps(course['icon'])},
-    difficulty: {json.dumps(difficulty)},{required_xp_str}
-    lessons: [
-{lessons_joined}
-    ],
-}};'''
-
-
-def main():
-    data = load_data()
-    
-    # Find CSS course
-    css_course = None
-    js_course = None
-    php_course = None
-    
-    for course in data['courses']:
-        if course['id'] == 'css':
-            css_course = course
-        elif course['id'] == 'javascript':
-            js_course = course
-        elif course['id'] == 'php':
-            php_course = course
-    
-    # Generate CSS lessons file
-    if css_course:
-        print(f"Converting CSS: {len(css_course['lessons'])} lessons")
-        
-        # Split into modules
-        lessons = css_course['lessons']
-        basics = lessons[:20]
-        layout = lessons[20:40]
-        advanced = lessons[40:60]
-        
-        output = f'''// CodeQuest - CSS Learning Content
-// Based on W3Schools curriculum
-
-import {{ LearningModule, Lesson, QuizQuestion }} from './lessons';
-
-// ============================================
-// MODULE CSS 1: CSS BASICS (Beginner)
-// ============================================
-
-{generate_module(css_course, 'CSS_BASICS', basics, 'beginner')}
-
-// ============================================
-// MODULE CSS 2: CSS LAYOUT (Intermediate)
-// ============================================
-
-{generate_module({**css_course, 'id': 'css-layout', 'name': 'CSS Layout', 'description': 'Box Model, Flexbox e posicionamento'}, 'CSS_LAYOUT', layout, 'intermediate', 300)}
-
-// ============================================
-// MODULE CSS 3: CSS ADVANCED (Advanced)
-// ============================================
-
-{generate_module({**css_course, 'id': 'css-advanced', 'name': 'CSS Avançado', 'description': 'Grid, animações e transformações'}, 'CSS_ADVANCED', advanced, 'advanced', 600)}
-
-// All CSS modules
-export const CSS_MODULES: LearningModule[] = [
-    CSS_BASICS,
-    CSS_LAYOUT,
-    CSS_ADVANCED,
-];
-'''
-        
-        output_path = os.path.join(SCRIPT_DIR, "..", "apps", "web", "content", "css-lessons.ts")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"✓ Created css-lessons.ts")
-    
-    # Generate JS lessons file
-    if js_course:
-        print(f"Converting JavaScript: {len(js_course['lessons'])} lessons")
-        
-        lessons = js_course['lessons']
-        basics = lessons[:20]
-        functions = lessons[20:40]
-        dom = lessons[40:60]
-        advanced = lessons[60:80]
-        
-        output = f'''// CodeQuest - JavaScript Learning Content
-// Based on W3Schools curriculum
-
-import {{ LearningModule, Lesson, QuizQuestion }} from './lessons';
-
-// ============================================
-// MODULE JS 1: JS BASICS (Beginner)
-// ============================================
-
-{generate_module(js_course, 'JS_BASICS', basics, 'beginner')}
-
-// ============================================
-// MODULE JS 2: JS FUNCTIONS (Intermediate)
-// ============================================
-
-{generate_module({**js_course, 'id': 'js-functions', 'name': 'Funções JavaScript', 'description': 'Funções, arrow functions e escopo'}, 'JS_FUNCTIONS', functions, 'intermediate', 400)}
-
-// ============================================
-// MODULE JS 3: JS DOM (Intermediate)
-// ============================================
-
-{generate_module({**js_course, 'id': 'js-dom', 'name': 'JavaScript DOM', 'description': 'Manipulação do DOM e eventos'}, 'JS_DOM', dom, 'intermediate', 600)}
-
-// ============================================
-// MODULE JS 4: JS ADVANCED (Advanced)
-// ============================================
-
-{generate_module({**js_course, 'id': 'js-advanced', 'name': 'JavaScript Avançado', 'description': 'Arrays, objetos, classes e async'}, 'JS_ADVANCED', advanced, 'advanced', 800)}
-
-// All JS modules
-export const JS_MODULES: LearningModule[] = [
-    JS_BASICS,
-    JS_FUNCTIONS,
-    JS_DOM,
-    JS_ADVANCED,
-];
-'''
-        
-        output_path = os.path.join(SCRIPT_DIR, "..", "apps", "web", "content", "js-lessons.ts")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"✓ Created js-lessons.ts")
-    
-    # Generate PHP lessons file
-    if php_course:
-        print(f"Converting PHP: {len(php_course['lessons'])} lessons")
-        
-        lessons = php_course['lessons']
-        basics = lessons[:20]
-        control = lessons[20:40]
-        forms = lessons[40:60]
-        advanced = lessons[60:80]
-        
-        output = f'''// CodeQuest - PHP Learning Content
-// Based on W3Schools curriculum
-
-import {{ LearningModule, Lesson, QuizQuestion }} from './lessons';
-
-// ============================================
-// MODULE PHP 1: PHP BASICS (Beginner)
-// ============================================
-
-{generate_module(php_course, 'PHP_BASICS', basics, 'beginner')}
-
-// ============================================
-// MODULE PHP 2: PHP CONTROL (Intermediate)
-// ============================================
+def lesson_record(lesson: Dict, course_id: str, order: int,
+                  distractors: Optional[DistractorIndex] = None,
+                  texts: Optional[SectionTexts] = None) -> Dict:
+    """The lesson as the generated files carry it (a Lesson in content/lessons.ts)
 
-{generate_module({**php_course, 'id': 'php-control', 'name': 'Controle PHP', 'description': 'Condicionais, loops e funções'}, 'PHP_CONTROL', control, 'intermediate', 400)}
-
-// ============================================
-// MODULE PHP 3: PHP FORMS (Intermediate)
-// ============================================
+    Same as truncating convert_lesson's result, but built from the section
+    texts' precomputed views; pass the course's SectionTexts so each section
+    is normalized once however many modules and formats the lesson goes into.
+    """
+    headed = [text for text in (texts.lesson(lesson) if texts else
+                                [normalize_section(s) for s in lesson.get('sections', [])]) if text.title]
+    first = headed[0] if headed else None
+    shown = headed[1:6] if len(headed) > 1 else headed
+    return {
+        'id': lesson.get('id', f'{course_id}-{order}'),
+        'title': lesson.get('title', 'Lição'),
+        'description': first.description if first else 'Aprenda este conceito',
+        'xpReward': lesson_xp(len(headed)),
+        'estimatedTime': max(5, len(headed) * 3),
+        'content': {
+            'introduction': first.introduction if first else '',
+            'sections': [
+                {
+                    'title': text.title,
+                    'text': text.section_text,
+                    **({'code': text.code} if text.code else {}),
+                }
+                for text in shown
+            ],
+        },
+        'quiz': [{**q, 'explanation': q['explanation'][:EXPLANATION_LIMIT]}
+                 for q in generate_quiz(lesson, course_id, distractors, texts)],
+    }
 
-{generate_module({**php_course, 'id': 'php-forms', 'name': 'Formulários PHP', 'description': 'GET, POST e validação'}, 'PHP_FORMS', forms, 'intermediate', 600)}
 
-// ============================================
-// MODULE PHP 4: PHP ADVANCED (Advanced)
-// ============================================
+def write_lesson(ts: TsEmitter, record: Dict):
+    """Write one lesson_record as an object literal (without the trailing comma or newline)"""
+    content = record['content']
+
+    ts.open("{")
+    ts.field("id", record['id'], ascii=True)
+    ts.field("title", record['title'])
+    ts.field("description", record['description'])
+    ts.field("xpReward", record['xpReward'])
+    ts.field("estimatedTime", record['estimatedTime'])
+    ts.open("content: {")
+    ts.field("introduction", content['introduction'])
+    ts.open("sections: [")
+    if not content['sections']:
+        ts.line()
+    for s, last in with_last(content['sections']):
+        ts.open("{")
+        ts.field("title", s['title'])
+        ts.field("text", s['text'])
+        if 'code' in s:
+            ts.field("code", s['code'])
+        else:
+            ts.line()
+        ts.close("}" if last else "},")
+    ts.close("],")
+    ts.close("},")
+    ts.open("quiz: [")
+    if not record['quiz']:
+        ts.line()
+    for q, last in with_last(record['quiz']):
+        ts.open("{")
+        ts.field("id", q['id'], ascii=True)
+        ts.line("type: 'multiple-choice',")
+        ts.field("question", q['question'])
+        ts.field("options", q['options'])
+        ts.field("correctAnswer", q['correctAnswer'])
+        ts.field("explanation", q['explanation'])
+        ts.field("points", q['points'])
+        ts.close("}" if last else "},")
+    ts.close("],")
+    ts.dedent()
+    ts.raw(ts.prefix + "}")
+
+
+def write_module(ts: TsEmitter, course: Dict, module_name: str, lessons: Iterable[Dict],
+                 difficulty: str, required_xp: int = None,
+                 distractors: Optional[DistractorIndex] = None,
+                 texts: Optional[SectionTexts] = None):
+    """Write a TypeScript module definition"""
+    ts.open(f"export const {module_name}: LearningModule = {{")
+    ts.field("id", course['id'], ascii=True)
+    ts.field("name", course['name'])
+    ts.field("description", course['description'])
+    ts.field("icon", course['icon'], ascii=True)
+    ts.field("difficulty", difficulty, ascii=True)
+    if required_xp:
+        ts.field("requiredXP", required_xp)
+    ts.open("lessons: [")
+    empty = True
+    for i, (lesson, last) in enumerate(with_last(lessons)):
+        write_lesson(ts, lesson_record(lesson, course['id'], i + 1, distractors, texts))
+        ts.raw("\n" if last else ",\n")
+        empty = False
+    if empty:
+        ts.raw("\n")
+    ts.close("],")
+    ts.close("};")
+
+
+# ============ COURSE TABLE ============
+# How each course is split into modules. "lessons" is the (start, end) slice of
+# the course's lessons; "id", "name" and "description" override the course's own.
+# A course's optional "split_budget" overrides lesson_splitter.SPLIT_BUDGET.
+
+def standard_modules(prefix: str, label: str) -> List[Dict]:
+    """Basics / intermediate / advanced split for courses without a hand-written one"""
+    return [
+        {'const': f'{prefix}_BASICS', 'title': f'{prefix} BASICS', 'difficulty': 'beginner',
+         'lessons': (0, 20)},
+        {'const': f'{prefix}_INTERMEDIATE', 'title': f'{prefix} INTERMEDIATE', 'difficulty': 'intermediate',
+         'id': f'{prefix.lower()}-intermediate', 'name': f'{label} Intermediário',
+         'description': f'Conceitos intermediários de {label}', 'required_xp': 300,
+         'lessons': (20, 50)},
+        {'const': f'{prefix}_ADVANCED', 'title': f'{prefix} ADVANCED', 'difficulty': 'advanced',
+         'id': f'{prefix.lower()}-advanced', 'name': f'{label} Avançado',
+         'description': f'Tópicos avançados de {label}', 'required_xp': 600,
+         'lessons': (50, 80)},
+    ]
+
+
+def standard_course(file: str, prefix: str, label: str) -> Dict:
+    return {'file': file, 'prefix': prefix, 'label': label, 'modules': standard_modules(prefix, label)}
+
+
+# Course id (as in scraper.COURSES) -> output file and module split
+COURSE_MODULES = {
+    'html': standard_course('html-lessons.ts', 'HTML', 'HTML'),
+    'css': {
+        'file': 'css-lessons.ts', 'prefix': 'CSS', 'label': 'CSS',
+        'modules': [
+            {'const': 'CSS_BASICS', 'title': 'CSS BASICS', 'difficulty': 'beginner',
+             'lessons': (0, 20)},
+            {'const': 'CSS_LAYOUT', 'title': 'CSS LAYOUT', 'difficulty': 'intermediate',
+             'id': 'css-layout', 'name': 'CSS Layout', 'description': 'Box Model, Flexbox e posicionamento',
+             'required_xp': 300, 'lessons': (20, 40)},
+            {'const': 'CSS_ADVANCED', 'title': 'CSS ADVANCED', 'difficulty': 'advanced',
+             'id': 'css-advanced', 'name': 'CSS Avançado', 'description': 'Grid, animações e transformações',
+             'required_xp': 600, 'lessons': (40, 60)},
+        ],
+    },
+    'javascript': {
+        'file': 'js-lessons.ts', 'prefix': 'JS', 'label': 'JavaScript',
+        'modules': [
+            {'const': 'JS_BASICS', 'title': 'JS BASICS', 'difficulty': 'beginner',
+             'lessons': (0, 20)},
+            {'const': 'JS_FUNCTIONS', 'title': 'JS FUNCTIONS', 'difficulty': 'intermediate',
+             'id': 'js-functions', 'name': 'Funções JavaScript', 'description': 'Funções, arrow functions e escopo',
+             'required_xp': 400, 'lessons': (20, 40)},
+            {'const': 'JS_DOM', 'title': 'JS DOM', 'difficulty': 'intermediate',
+             'id': 'js-dom', 'name': 'JavaScript DOM', 'description': 'Manipulação do DOM e eventos',
+             'required_xp': 600, 'lessons': (40, 60)},
+            {'const': 'JS_ADVANCED', 'title': 'JS ADVANCED', 'difficulty': 'advanced',
+             'id': 'js-advanced', 'name': 'JavaScript Avançado', 'description': 'Arrays, objetos, classes e async',
+             'required_xp': 800, 'lessons': (60, 80)},
+        ],
+    },
+    'python': standard_course('python-lessons.ts', 'PYTHON', 'Python'),
+    'sql': standard_course('sql-lessons.ts', 'SQL', 'SQL'),
+    'react': standard_course('react-lessons.ts', 'REACT', 'React'),
+    'typescript': standard_course('ts-lessons.ts', 'TS', 'TypeScript'),
+    'git': standard_course('git-lessons.ts', 'GIT', 'Git'),
+    'nodejs': standard_course('node-lessons.ts', 'NODE', 'Node.js'),
+    'java': standard_course('java-lessons.ts', 'JAVA', 'Java'),
+    'cpp': standard_course('cpp-lessons.ts', 'CPP', 'C++'),
+    'c': standard_course('c-lessons.ts', 'C', 'C'),
+    'php': {
+        'file': 'php-lessons.ts', 'prefix': 'PHP', 'label': 'PHP',
+        'modules': [
+            {'const': 'PHP_BASICS', 'title': 'PHP BASICS', 'difficulty': 'beginner',
+             'lessons': (0, 20)},
+            {'const': 'PHP_CONTROL', 'title': 'PHP CONTROL', 'difficulty': 'intermediate',
+             'id': 'php-control', 'name': 'Controle PHP', 'description': 'Condicionais, loops e funções',
+             'required_xp': 400, 'lessons': (20, 40)},
+            {'const': 'PHP_FORMS', 'title': 'PHP FORMS', 'difficulty': 'intermediate',
+             'id': 'php-forms', 'name': 'Formulários PHP', 'description': 'GET, POST e validação',
+             'required_xp': 600, 'lessons': (40, 60)},
+            {'const': 'PHP_ADVANCED', 'title': 'PHP ADVANCED', 'difficulty': 'advanced',
+             'id': 'php-advanced', 'name': 'PHP Avançado', 'description': 'OOP, MySQL e Sessions',
+             'required_xp': 800, 'lessons': (60, 80)},
+        ],
+    },
+    'mysql': standard_course('mysql-lessons.ts', 'MYSQL', 'MySQL'),
+    'mongodb': standard_course('mongodb-lessons.ts', 'MONGODB', 'MongoDB'),
+    'bootstrap': standard_course('bootstrap-lessons.ts', 'BOOTSTRAP', 'Bootstrap'),
+    'jquery': standard_course('jquery-lessons.ts', 'JQUERY', 'jQuery'),
+    'vue': standard_course('vue-lessons.ts', 'VUE', 'Vue'),
+    'django': standard_course('django-lessons.ts', 'DJANGO', 'Django'),
+    'numpy': standard_course('numpy-lessons.ts', 'NUMPY', 'NumPy'),
+    'pandas': standard_course('pandas-lessons.ts', 'PANDAS', 'Pandas'),
+    'dsa': standard_course('dsa-lessons.ts', 'DSA', 'DSA'),
+}
+
+
+# ============ GENERATION ============
+FORMATS = ["ts", "pack", "both"]
+
+# Part of every manifest entry: bump when the generated output changes for the same input,
+# so the next run regenerates everything instead of reusing old modules
+GENERATOR_TAG = "modules-v2"
+
+
+def course_modules(course: Dict, spec: Dict) -> List[Tuple[int, Dict, Dict, List[Dict]]]:
+    """Split a course per its COURSE_MODULES entry: (number, module spec, module course, lessons)"""
+    modules = []
+    for n, module in enumerate(spec['modules'], 1):
+        start, end = module['lessons']
+        lessons = course['lessons'][start:end]
+        # Short courses: later modules with no lessons are left out
+        if n > 1 and not lessons:
+            continue
+        overrides = {k: module[k] for k in ('id', 'name', 'description') if k in module}
+        modules.append((n, module, {**course, **overrides}, lessons))
+    return modules
+
+
+def split_budget(spec: Dict) -> int:
+    """Estimated tokens per sub-lesson for a course (see lesson_splitter); 0 keeps lessons whole"""
+    return spec.get('split_budget', SPLIT_BUDGET)
+
+
+def distractor_hash(distractors: DistractorIndex, lessons: List[Dict], budget: int) -> str:
+    """Hash of the wrong answers a module's quizzes are offered (the sections generate_quiz asks about)"""
+    return content_hash([distractors.distractors(section)
+                         for lesson in split_lessons(lessons, budget) for section in lesson.get('sections', [])[:6]])
+
+
+def write_course_file(out: TextIO, course: Dict, spec: Dict,
+                      distractors: Optional[DistractorIndex] = None,
+                      reuse: Optional[Dict[int, str]] = None,
+                      texts: Optional[SectionTexts] = None):
+    """Write the TypeScript file for one course from its COURSE_MODULES entry.
+
+    Modules in ``reuse`` (number -> text from split_ts_modules) are copied instead of regenerated.
+    """
+    reuse = reuse or {}
+    modules = course_modules(course, spec)
+
+    ts = TsEmitter(out)
+    ts.line(f"// CodeQuest - {spec['label']} Learning Content")
+    ts.line("// Based on W3Schools curriculum")
+    ts.line()
+    ts.line("import { LearningModule, Lesson, QuizQuestion } from './lessons';")
+    ts.line()
+    for n, module, module_course, lessons in modules:
+        if n in reuse:
+            ts.raw(reuse[n])
+            continue
+        ts.line("// ============================================")
+        ts.line(f"// MODULE {spec['prefix']} {n}: {module['title']} ({module['difficulty'].capitalize()})")
+        ts.line("// ============================================")
+        ts.line()
+        write_module(ts, module_course, module['const'], split_lessons(lessons, split_budget(spec)),
+                     module['difficulty'], module.get('required_xp'), distractors, texts)
+        ts.line()
+    ts.line(f"// All {spec['prefix']} modules")
+    ts.open(f"export const {spec['prefix']}_MODULES: LearningModule[] = [")
+    for _, module, _, _ in modules:
+        ts.line(f"{module['const']},")
+    ts.close("];")
+
+
+def write_course_pack(out: BinaryIO, course: Dict, spec: Dict,
+                      distractors: Optional[DistractorIndex] = None,
+                      reuse: Optional[Dict[int, Tuple[Dict, List[Dict]]]] = None,
+                      texts: Optional[SectionTexts] = None):
+    """Write the content pack for one course: the same modules as the .ts file.
+
+    Modules in ``reuse`` (number -> (metadata, lessons) from pack_modules) are copied as they are.
+    """
+    reuse = reuse or {}
+
+    def packed_modules():
+        for n, module, module_course, lessons in course_modules(course, spec):
+            if n in reuse:
+                yield reuse[n]
+                continue
+            metadata = {
+                'id': module_course['id'],
+                'name': module_course['name'],
+                'description': module_course['description'],
+                'icon': module_course['icon'],
+                'difficulty': module['difficulty'],
+            }
+            if module.get('required_xp'):
+                metadata['requiredXP'] = module['required_xp']
+            yield metadata, [lesson_record(lesson, course['id'], i + 1, distractors, texts)
+                             for i, lesson in enumerate(split_lessons(lessons, split_budget(spec)))]
+
+    write_pack(out, packed_modules())
+
+
+def same_content(path: str, other: str, chunk_size: int = 1 << 20) -> bool:
+    """Whether two files hold the same bytes, compared a chunk at a time"""
+    if os.path.getsize(path) != os.path.getsize(other):
+        return False
+    with open(path, 'rb') as a, open(other, 'rb') as b:
+        while True:
+            chunk = a.read(chunk_size)
+            if chunk != b.read(chunk_size):
+                return False
+            if not chunk:
+                return True
+
+
+def write_if_changed(path: str, write: Callable[[IO], None], binary: bool = False) -> bool:
+    """Stream a file through ``write`` and keep it only if its content changed.
+
+    Unchanged files keep their mtime, so downstream build caches stay valid.
+    """
+    tmp_path = f"{path}.tmp"
+    with (open(tmp_path, 'wb') if binary else open(tmp_path, 'w', encoding='utf-8')) as f:
+        write(f)
+    if os.path.exists(path) and same_content(path, tmp_path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def split_ts_modules(text: str, prefix: str) -> Dict[int, str]:
+    """Cut a generated course file into its modules' text, by module number"""
+    footer = text.find(f"// All {prefix} modules")
+    banners = list(re.finditer(rf"^// =+\n// MODULE {re.escape(prefix)} (\d+):", text, re.M))
+    if footer < 0:
+        return {}
+    ends = [m.start() for m in banners[1:]] + [footer]
+    return {int(m.group(1)): text[m.start():end] for m, end in zip(banners, ends)}
+
+
+def pack_modules(path: str, spec: Dict, course: Dict) -> Dict[int, Tuple[Dict, List[Dict]]]:
+    """Read a course's modules back from its content pack, by module number"""
+    pack = ContentPack(path)
+    try:
+        by_id = {m['id']: m for m in pack.modules}
+        modules = {}
+        for n, _, module_course, _ in course_modules(course, spec):
+            packed = by_id.get(module_course['id'])
+            if packed is not None:
+                metadata = {k: v for k, v in packed.items() if k != 'lessons'}
+                modules[n] = metadata, [pack.lesson(summary['id']) for summary in packed['lessons']]
+        return modules
+    finally:
+        pack.close()
+
+
+def convert_course(course: Dict, fmt: str, output_dir: str, pack_dir: str,
+                   previous: Optional[Dict] = None,
+                   budget: Optional[int] = None) -> Tuple[int, List[Tuple[str, bool]], Dict]:
+    """Worker: generate one course's output files.
+
+    ``previous`` is the course's manifest entry from the last run. Modules whose
+    lessons and quiz distractors have not changed since then are copied from
+    the existing files.
+    ``budget`` overrides the course's sub-lesson size (see split_budget).
+    Returns (lesson count, [(file name, rewritten)], new manifest entry).
+    """
+    spec = COURSE_MODULES[course['id']]
+    if budget is not None:
+        spec = {**spec, 'split_budget': budget}
+    entry = {'id': course['id'], **course_entry(course),
+             'generator': content_hash([GENERATOR_TAG, spec, split_budget(spec)])}
+    if previous is not None and previous.get('generator') != entry['generator']:
+        previous = None
+    modules = course_modules(course, spec)
+    stale = {n for n, module, _, _ in modules if changed_lessons(previous, entry, *module['lessons'])}
+
+    # One index per course: distractors are drawn from sibling sections across the whole
+    # course, so a change anywhere in it can change the wrong answers of an unchanged
+    # module. Each module's picks are recorded, and a module whose picks differ is stale too.
+    distractors = None
+    if stale:
+        distractors = DistractorIndex(course)
+        picks = {str(n): distractor_hash(distractors, lessons, split_budget(spec)) for n, _, _, lessons in modules}
+        recorded = previous.get('distractors', {}) if previous is not None else {}
+        stale |= {n for n, _, _, _ in modules if recorded.get(str(n)) != picks[str(n)]}
+        entry['distractors'] = picks
+    elif 'distractors' in previous:
+        entry['distractors'] = previous['distractors']
+    # Files made from the previous entry are still current if nothing changed
+    entry['files'] = sorted(previous['files']) if previous is not None and not stale else []
+
+    outputs = []
+    if fmt in ("ts", "both"):
+        outputs.append((spec['file'], output_dir, False))
+    if fmt in ("pack", "both"):
+        outputs.append((os.path.splitext(spec['file'])[0] + ".pack", pack_dir, True))
+
+    texts = None
+    results = []
+    for file, directory, binary in outputs:
+        path = os.path.join(directory, file)
+        reuse = {}
+        if previous is not None and file in previous['files'] and os.path.exists(path):
+            if not stale:
+                results.append((file, False))
+                continue
+            if binary:
+                reuse = pack_modules(path, spec, course)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    reuse = split_ts_modules(f.read(), spec['prefix'])
+            reuse = {n: module for n, module in reuse.items() if n not in stale}
+        distractors = distractors or DistractorIndex(course)
+        # Sections are normalized once for both formats, from the hashes the manifest entry already has
+        texts = texts or SectionTexts(course, [lesson['sections'] for lesson in entry['lessons']])
+        if binary:
+            changed = write_if_changed(path, lambda out: write_course_pack(out, course, spec, distractors, reuse, texts),
+                                       binary=True)
+        else:
+            changed = write_if_changed(path, lambda out: write_course_file(out, course, spec, distractors, reuse, texts))
+        results.append((file, changed))
+    entry['files'] = sorted({*entry['files'], *(file for file, _ in results)})
+    return len(course['lessons']), results, entry
 
-{generate_module({**php_course, 'id': 'php-advanced', 'name': 'PHP Avançado', 'description': 'OOP, MySQL e Sessions'}, 'PHP_ADVANCED', advanced, 'advanced', 800)}
 
-// All PHP modules
-export const PHP_MODULES: LearningModule[] = [
-    PHP_BASICS,
-    PHP_CONTROL,
-    PHP_FORMS,
-    PHP_ADVANCED,
-];
-'''
-        
-        output_path = os.path.join(SCRIPT_DIR, "..", "apps", "web", "content", "php-lessons.ts")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"✓ Created php-lessons.ts")
-    
-    print("\n✅ All course files generated!")
+def main():
+    parser = argparse.ArgumentParser(description="Convert W3Schools data to CodeQuest lesson files")
+    parser.add_argument("courses", nargs="*", help=f"Courses to convert (default: all). Available: {', '.join(COURSE_MODULES)}")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument("--data", default=DATA_PATH, help="Scraped corpus to convert")
+    parser.add_argument("--format", choices=FORMATS, default="ts",
+                        help="ts: TypeScript modules; pack: indexed content packs for lazy loading; both")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Where to write the .ts files")
+    parser.add_argument("--pack-dir", default=PACK_DIR, help="Where to write the .pack files")
+    parser.add_argument("--manifest", default=MANIFEST_PATH,
+                        help="Content hashes of the last generated corpus; only modules whose lessons changed are regenerated")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and regenerate every module")
+    parser.add_argument("--split-budget", type=int,
+                        help=f"Split lessons into sub-lessons of about this many tokens (default: {SPLIT_BUDGET}; 0: never)")
+    args = parser.parse_args()
+
+    unknown = [c for c in args.courses if c not in COURSE_MODULES]
+    if unknown:
+        parser.error(f"Unknown course(s): {', '.join(unknown)}. Available: {', '.join(COURSE_MODULES)}")
+    if args.format != "pack":
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.format != "ts":
+        os.makedirs(args.pack_dir, exist_ok=True)
+
+    stats = {"written": 0, "unchanged": 0}
+    manifest = (None if args.full else load_manifest(args.manifest)) or {"version": MANIFEST_VERSION, "courses": {}}
+    previous = dict(manifest["courses"])
+
+    def collect(futures):
+        for future in futures:
+            lesson_count, results, entry = future.result()
+            manifest["courses"][entry["id"]] = entry
+            for file, changed in results:
+                if changed:
+                    stats["written"] += 1
+                    print(f"✓ {file}: {lesson_count} lessons")
+                else:
+                    stats["unchanged"] += 1
+                    print(f"  {file}: unchanged")
+
+    # Stream the corpus one course at a time, decoding only the courses we convert.
+    # At most two courses per worker are in flight, so memory stays bounded.
+    pending = set()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for course in iter_courses(args.data, args.courses or COURSE_MODULES):
+            if len(pending) >= args.jobs * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(convert_course, course, args.format, args.output_dir, args.pack_dir,
+                                    previous.get(course['id']), args.split_budget))
+        collect(wait(pending).done)
+    save_manifest(args.manifest, manifest)
+
+    print(f"\n✅ All course files generated! ({stats['written']} written, {stats['unchanged']} unchanged)")
 
 
 if __name__ == "__main__":
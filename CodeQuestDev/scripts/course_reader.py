@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for w3schools_courses.json.
+Yields one course at a time instead of loading the whole corpus, and skips
+courses that were not asked for without decoding them. Reads the pretty and
+compact JSON formats as well as NDJSON (see course_writer.py).
+"""
+
+import json
+import re
+from typing import Iterable, Iterator, Optional
+
+CHUNK_SIZE = 1 << 20
+
+# Inside a course we only care about strings (which may contain brackets) and brackets.
+# A lone quote means the string continues past the end of the buffer.
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]]')
+_COURSE_ID = re.compile(r'\{\s*"id"\s*:\s*("(?:[^"\\]|\\.)*")')
+_WHITESPACE = re.compile(r"\s*")
+_NDJSON_START = re.compile(r'\{"type":')
+_NDJSON_KEY = re.compile(r'\{"type":"(\w+)","(?:id|course)":("(?:[^"\\]|\\.)*")')
+
+
+class CourseReader:
+    """Incrementally read the courses document from an open text file."""
+
+    def __init__(self, file, course_ids: Optional[Iterable[str]] = None):
+        self.file = file
+        self.wanted = set(course_ids) if course_ids is not None else None
+        self.metadata = {}
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    # ============ BUFFER ============
+    def _fill(self, at_least: int = CHUNK_SIZE) -> bool:
+        """Read more input, dropping what has been consumed. False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.file.read(max(at_least, CHUNK_SIZE))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, got {self.buf[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def _decode(self):
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._peek()
+        while True:
+            try:
+                value, self.pos = self.decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                # Probably cut off: read at least as much again, so retries stay linear overall
+                if not self._fill(len(self.buf) - self.pos):
+                    raise
+
+    def _skip(self):
+        """Skip the object or array at the current position without decoding it."""
+        depth = 0
+        while True:
+            for token in _SKIP_TOKEN.finditer(self.buf, self.pos):
+                text = token.group()
+                if text == '"':
+                    self.pos = token.start()
+                    break
+                if text in "{[":
+                    depth += 1
+                elif text in "}]":
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = token.end()
+                        return
+            else:
+                self.pos = len(self.buf)
+            if not self._fill():
+                raise ValueError("Unexpected end of file inside a course")
+
+    def _course_id(self) -> Optional[str]:
+        """Peek at the id of the course starting at the current position."""
+        while True:
+            match = _COURSE_ID.match(self.buf, self.pos)
+            if match:
+                return json.loads(match.group(1))
+            # Not enough buffered to tell yet
+            if len(self.buf) - self.pos > 4096 or not self._fill():
+                return None
+
+    # ============ COURSES ============
+    def __iter__(self) -> Iterator[dict]:
+        if self._peek() == "{" and _NDJSON_START.match(self.buf, self.pos):
+            yield from self._iter_ndjson()
+        else:
+            yield from self._iter_json()
+
+    def _done(self, found: set) -> bool:
+        return self.wanted is not None and found >= self.wanted
+
+    def _iter_json(self) -> Iterator[dict]:
+        found = set()
+        self._expect("{")
+        while self._peek() not in ("}", ""):
+            key = self._decode()
+            self._expect(":")
+            if key == "metadata":
+                self.metadata = self._decode()
+            elif key != "courses":
+                self._skip_value()
+            else:
+                self._expect("[")
+                while self._peek() != "]":
+                    course_id = self._course_id()
+                    if self.wanted is None or course_id in self.wanted or course_id is None:
+                        course = self._decode()
+                        if self.wanted is None or course["id"] in self.wanted:
+                            found.add(course["id"])
+                            yield course
+                    else:
+                        self._skip()
+                    # Jump out as soon as every requested course has been read
+                    if self._done(found):
+                        return
+                    if self._peek() == ",":
+                        self.pos += 1
+                self.pos += 1
+            if self._peek() == ",":
+                self.pos += 1
+
+    def _skip_value(self):
+        if self._peek() in "{[":
+            self._skip()
+        else:
+            self._decode()
+
+    def _lines(self) -> Iterator[str]:
+        while True:
+            end = self.buf.find("\n", self.pos)
+            if end == -1:
+                if self._fill():
+                    continue
+                end = len(self.buf)
+                if self.pos >= end:
+                    return
+            line = self.buf[self.pos:end]
+            self.pos = end + 1
+            if line.strip():
+                yield line
+
+    def _iter_ndjson(self) -> Iterator[dict]:
+        found = set()
+        course = None
+        skipping = False
+        for line in self._lines():
+            # Classify the record from its prefix, so skipped lessons are never decoded
+            match = _NDJSON_KEY.match(line)
+            kind = match.group(1) if match else json.loads(line)["type"]
+            if kind == "lesson":
+                if not skipping:
+                    lesson = json.loads(line)
+                    del lesson["type"], lesson["course"]
+                    course["lessons"].append(lesson)
+                continue
+
+            if course is not None:
+                yield course
+                course = None
+                if self._done(found):
+                    return
+            if kind == "course":
+                course_id = json.loads(match.group(2))
+                skipping = self.wanted is not None and course_id not in self.wanted
+                if not skipping:
+                    found.add(course_id)
+                    course = json.loads(line)
+                    del course["type"]
+                    course["lessons"] = []
+            elif kind == "metadata":
+                self.metadata = json.loads(line)
+                del self.metadata["type"]
+        if course is not None:
+            yield course
+
+
+def iter_courses(path: str, course_ids: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    """Yield the courses in ``path`` one at a time, optionally only ``course_ids``."""
+    with open(path, "r", encoding="utf-8") as f:
+        yield from CourseReader(f, course_ids)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Streaming writer for w3schools_courses.json.
+Courses and lessons are written one at a time, so memory use does not grow
+with the size of the corpus. The "pretty" format is byte-for-byte what
+json.dump(..., indent=2) produces for the whole document.
+"""
+
+import json
+import os
+from typing import Iterable
+
+FORMATS = ["pretty", "compact", "ndjson"]
+
+
+def _indent(text: str, prefix: str) -> str:
+    """Indent every line of an indent=2 JSON dump (JSON strings never contain raw newlines)."""
+    return prefix + text.replace("\n", "\n" + prefix)
+
+
+class CourseWriter:
+    """Write the courses document incrementally.
+
+    pretty:  indented JSON, same as the previous json.dump(indent=2) output
+    compact: the same document without whitespace
+    ndjson:  one JSON record per line: metadata, then each course header
+             followed by its lessons (``{"type": "lesson", "course": id, ...}``)
+    """
+
+    def __init__(self, path: str, metadata: dict, fmt: str = "pretty"):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}. Available: {', '.join(FORMATS)}")
+        self.path = path
+        self.format = fmt
+        self.courses = 0
+        self.lessons = 0
+        # Write next to the target and rename at the end, so a crash never leaves half a file
+        self.tmp_path = f"{path}.tmp"
+        self.file = open(self.tmp_path, "w", encoding="utf-8")
+
+        if fmt == "ndjson":
+            self._line({"type": "metadata", **metadata})
+        elif fmt == "compact":
+            self.file.write('{"metadata":' + self._compact(metadata) + ',"courses":[')
+        else:
+            self.file.write('{\n  "metadata": ' + _indent(self._pretty(metadata), "  ")[2:] + ',\n  "courses": [')
+
+    @staticmethod
+    def _pretty(value) -> str:
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _compact(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def _line(self, record: dict):
+        self.file.write(self._compact(record) + "\n")
+
+    def write_course(self, course: dict, lessons: Iterable[dict]):
+        """Write one course; ``lessons`` may be a generator and is consumed lazily."""
+        header = {k: v for k, v in course.items() if k != "lessons"}
+        first_course = self.courses == 0
+        self.courses += 1
+
+        if self.format == "ndjson":
+            self._line({"type": "course", **header})
+            for lesson in lessons:
+                self._line({"type": "lesson", "course": course["id"], **lesson})
+                self.lessons += 1
+            return
+
+        if self.format == "compact":
+            self.file.write(("" if first_course else ",") + self._compact(header)[:-1] + ',"lessons":[')
+            for i, lesson in enumerate(lessons):
+                self.file.write(("," if i else "") + self._compact(lesson))
+                self.lessons += 1
+            self.file.write("]}")
+            return
+
+        # Header without its closing brace, then the lessons array at the depth json.dump would use
+        self.file.write(("\n" if first_course else ",\n") + _indent(self._pretty(header)[:-2], "    "))
+        self.file.write(',\n      "lessons": [')
+        count = 0
+        for lesson in lessons:
+            self.file.write(("\n" if count == 0 else ",\n") + _indent(self._pretty(lesson), "        "))
+            count += 1
+        self.lessons += count
+        self.file.write("\n      ]\n    }" if count else "]\n    }")
+
+    def close(self):
+        """Finish the document and move it into place."""
+        if self.format == "compact":
+            self.file.write("]}")
+        elif self.format == "pretty":
+            self.file.write("\n  ]\n}" if self.courses else "]\n}")
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
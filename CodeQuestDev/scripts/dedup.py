@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Removal
+Finds sections and code examples that repeat across the scraped corpus
+(boilerplate paragraphs, the same example on several pages) with MinHash
+signatures and LSH banding, and writes a copy of the corpus without the
+repeats. The first occurrence of each block is kept.
+
+Run it between the scraper and convert_to_lessons.py:
+
+    python dedup.py [--input ../apps/web/data/w3schools_courses.json] [--output ... | --in-place] [--threshold 0.8]
+    python convert_to_lessons.py --data ../apps/web/data/w3schools_courses.dedup.json
+
+Dropped blocks can only be recovered by scraping again, so the input is
+left alone unless --in-place is given.
+
+The corpus is streamed twice (find duplicates, then write), so memory holds
+signatures rather than content.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from course_reader import CourseReader
+from course_writer import CourseWriter, FORMATS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(SCRIPT_DIR, "..", "apps", "web", "data", "w3schools_courses.json")
+
+TOKEN = re.compile(r"\w+|[^\w\s]")
+SHINGLE = 3
+# Blocks shorter than this are too generic to call duplicates ("Try it Yourself »")
+MIN_TOKENS = 8
+
+# One-permutation MinHash: each shingle is hashed once and lands in one of
+# NUM_BINS bins, keeping the minimum per bin. BANDS x ROWS must equal NUM_BINS;
+# 8 x 8 puts the LSH candidate threshold near Jaccard 0.77.
+NUM_BINS = 64
+BANDS = 8
+ROWS = NUM_BINS // BANDS
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_EMPTY = 1 << 32
+
+
+# ============ SIGNATURES ============
+def block_tokens(block) -> List[str]:
+    """Tokens of a section (content and code) or of a code example."""
+    if "code" in block:
+        return TOKEN.findall(block["code"].lower())
+    parts = []
+    for c in block.get("content", []):
+        if isinstance(c, str):
+            parts.append(c)
+        elif isinstance(c, dict) and "list" in c:
+            parts.extend(c["list"])
+    parts.extend(example.get("code", "") for example in block.get("examples", []))
+    return TOKEN.findall(" ".join(parts).lower())
+
+
+def signature(tokens: List[str]) -> Tuple[int, ...]:
+    """One-permutation MinHash signature of a token sequence's shingles."""
+    shingles = {zlib.crc32(" ".join(tokens[i:i + SHINGLE]).encode("utf-8"))
+                for i in range(len(tokens) - SHINGLE + 1)}
+    bins = [_EMPTY] * NUM_BINS
+    for h in shingles:
+        b = h & (NUM_BINS - 1)
+        value = h >> _BIN_BITS
+        if value < bins[b]:
+            bins[b] = value
+    # Densify: an empty bin borrows from the next filled one, shifted by the
+    # distance so that borrowed values only match other borrowed values
+    for b in range(NUM_BINS):
+        if bins[b] == _EMPTY:
+            for step in range(1, NUM_BINS):
+                source = bins[(b + step) % NUM_BINS]
+                if source < _EMPTY:
+                    bins[b] = source + step * _EMPTY * 2
+                    break
+    return tuple(bins)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+class LshIndex:
+    """Banded LSH over the signatures of blocks kept so far."""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.buckets = {}
+        self.signatures = []
+
+    def find(self, sig: Tuple[int, ...]) -> Optional[int]:
+        """Return the id of a kept block similar to ``sig``, or None."""
+        checked = set()
+        for band in range(BANDS):
+            kept = self.buckets.get((band, sig[band * ROWS:(band + 1) * ROWS]))
+            if kept is not None and kept not in checked:
+                if similarity(sig, self.signatures[kept]) >= self.threshold:
+                    return kept
+                checked.add(kept)
+        return None
+
+    def add(self, sig: Tuple[int, ...]) -> int:
+        block_id = len(self.signatures)
+        self.signatures.append(sig)
+        for band in range(BANDS):
+            self.buckets.setdefault((band, sig[band * ROWS:(band + 1) * ROWS]), block_id)
+        return block_id
+
+
+# ============ DEDUPLICATION ============
+def block_size(block: Dict) -> int:
+    """Bytes a block takes in the compact corpus."""
+    return len(json.dumps(block, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+class Deduplicator:
+    """Decide which sections and examples repeat an earlier one.
+
+    Blocks are addressed by position: (course, lesson, section) for sections
+    and (course, lesson, section, example) for examples.
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        self.sections = LshIndex(threshold)
+        self.examples = LshIndex(threshold)
+        self.dropped = set()
+        self.stats = {"sections": 0, "examples": 0, "dropped_sections": 0,
+                      "dropped_examples": 0, "bytes_saved": 0}
+
+    def _check(self, index: LshIndex, block: Dict, key: tuple) -> bool:
+        """Register a block; True if it duplicates one seen before."""
+        tokens = block_tokens(block)
+        if len(tokens) < MIN_TOKENS:
+            return False
+        sig = signature(tokens)
+        if index.find(sig) is not None:
+            self.dropped.add(key)
+            self.stats["bytes_saved"] += block_size(block)
+            return True
+        index.add(sig)
+        return False
+
+    def scan(self, course: Dict):
+        for l, lesson in enumerate(course.get("lessons", [])):
+            for s, section in enumerate(lesson.get("sections", [])):
+                self.stats["sections"] += 1
+                if self._check(self.sections, section, (course["id"], l, s)):
+                    # Its examples go with it
+                    self.stats["dropped_sections"] += 1
+                    continue
+                for e, example in enumerate(section.get("examples", [])):
+                    self.stats["examples"] += 1
+                    if self._check(self.examples, example, (course["id"], l, s, e)):
+                        self.stats["dropped_examples"] += 1
+
+    def apply(self, course: Dict) -> Iterator[Dict]:
+        """Yield the course's lessons without the dropped blocks."""
+        for l, lesson in enumerate(course.get("lessons", [])):
+            sections = []
+            for s, section in enumerate(lesson.get("sections", [])):
+                if (course["id"], l, s) in self.dropped:
+                    continue
+                examples = [example for e, example in enumerate(section.get("examples", []))
+                            if (course["id"], l, s, e) not in self.dropped]
+                sections.append({**section, "examples": examples} if "examples" in section else section)
+            yield {**lesson, "sections": sections}
+
+
+def output_path_for(input_path: str) -> str:
+    """Default output: next to the input (w3schools_courses.json -> w3schools_courses.dedup.json)"""
+    root, ext = os.path.splitext(input_path)
+    return f"{root}.dedup{ext}"
+
+
+def deduplicate(input_path: str, output_path: str, threshold: float = 0.8, fmt: str = "pretty") -> Dict:
+    """Write ``input_path`` to ``output_path`` without near-duplicate blocks; return stats."""
+    dedup = Deduplicator(threshold)
+    with open(input_path, "r", encoding="utf-8") as f:
+        for course in CourseReader(f):
+            dedup.scan(course)
+
+    writer = None
+    with open(input_path, "r", encoding="utf-8") as f:
+        reader = CourseReader(f)
+        for course in reader:
+            # Metadata precedes the courses, so it has been read by now
+            writer = writer or CourseWriter(output_path, reader.metadata, fmt)
+            writer.write_course(course, dedup.apply(course))
+        writer = writer or CourseWriter(output_path, reader.metadata, fmt)
+    writer.close()
+    return dedup.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove near-duplicate sections and examples from the scraped corpus")
+    parser.add_argument("--input", default=DATA_PATH)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", help="Where to write the result (default: <input>.dedup.json)")
+    target.add_argument("--in-place", action="store_true", help="Overwrite --input (dropped blocks are lost)")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity that counts as a duplicate")
+    parser.add_argument("--format", choices=FORMATS, default="pretty")
+    args = parser.parse_args()
+
+    output = args.input if args.in_place else args.output or output_path_for(args.input)
+
+    start = time.perf_counter()
+    before = os.path.getsize(args.input)
+    stats = deduplicate(args.input, output, args.threshold, args.format)
+    after = os.path.getsize(output)
+
+    print(f"🔍 {stats['sections']} sections, {stats['examples']} examples in {time.perf_counter() - start:.1f}s")
+    print(f"   Dropped {stats['dropped_sections']} sections and {stats['dropped_examples']} examples")
+    print(f"   Saved {stats['bytes_saved'] / 1e6:.2f} MB of content ({before / 1e6:.1f} MB -> {after / 1e6:.1f} MB on disk)")
+    print(f"   Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
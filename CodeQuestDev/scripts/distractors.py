@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Quiz distractor engine.
+Picks plausible wrong answers for a section's quiz question from the other
+sections of the same course, ranked by TF-IDF cosine similarity through an
+inverted index built once per course.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+TOKEN = re.compile(r"\w{3,}")
+
+# Used when a course has too few other sections to draw from
+FIXED_DISTRACTORS = [
+    "Nenhuma das anteriores está correta",
+    "Isso não é um conceito válido",
+    "Essa informação está incorreta",
+]
+
+# Only a section's strongest terms are looked up, and each term keeps only its
+# highest-weighted postings, so a query costs the same however big the course is
+QUERY_TERMS = 12
+POSTINGS_LIMIT = 64
+
+# Candidates this similar are likely restating the correct answer
+MAX_SIMILARITY = 0.9
+
+
+def section_answer(section: Dict) -> str:
+    """The text a section's quiz question is answered with ('' if it has none)"""
+    for c in section.get('content', []):
+        if isinstance(c, str) and len(c) > 20:
+            return c[:100] + "..." if len(c) > 100 else c
+    return ""
+
+
+def section_terms(section: Dict) -> Counter:
+    parts = [section.get('heading', '')]
+    for c in section.get('content', []):
+        if isinstance(c, str):
+            parts.append(c)
+        elif isinstance(c, dict) and 'list' in c:
+            parts.extend(c['list'])
+    return Counter(TOKEN.findall(" ".join(parts).lower()))
+
+
+class DistractorIndex:
+    """TF-IDF inverted index over the answerable sections of one course.
+
+    Sections are looked up by identity, so quizzes must be generated from the
+    same course dict the index was built from.
+    """
+
+    def __init__(self, course: Dict):
+        self.answers = []
+        self.queries = []
+        self.doc_of = {}
+        # (doc, count) -> picked answers: a lesson written to several outputs asks again
+        self.picked = {}
+        counts = []
+        for lesson in course.get('lessons', []):
+            for section in lesson.get('sections', []):
+                answer = section_answer(section)
+                if answer:
+                    self.doc_of[id(section)] = len(self.answers)
+                    self.answers.append(answer)
+                    counts.append(section_terms(section))
+
+        docs = len(counts)
+        df = Counter(term for terms in counts for term in terms)
+        idf = {term: math.log((1 + docs) / (1 + n)) + 1 for term, n in df.items()}
+
+        # Each term keeps a min-heap of its POSTINGS_LIMIT best entries as documents
+        # go by, so memory is bounded by the vocabulary rather than the corpus
+        self.postings = defaultdict(list)
+        for doc, terms in enumerate(counts):
+            vector = {term: (1 + math.log(tf)) * idf[term] for term, tf in terms.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            for term, weight in vector.items():
+                entries = self.postings[term]
+                entry = (weight / norm, doc)
+                if len(entries) < POSTINGS_LIMIT:
+                    heapq.heappush(entries, entry)
+                elif entry > entries[0]:
+                    heapq.heapreplace(entries, entry)
+            self.queries.append([(term, weight / norm) for term, weight in
+                                 heapq.nlargest(QUERY_TERMS, vector.items(), key=lambda item: item[1])])
+
+    def distractors(self, section: Dict, count: int = 3) -> List[str]:
+        """Wrong answers for ``section``'s question, most similar sections first."""
+        doc = self.doc_of.get(id(section))
+        if doc is None:
+            return FIXED_DISTRACTORS[:count]
+        if (doc, count) not in self.picked:
+            self.picked[doc, count] = self._rank(doc, count)
+        return list(self.picked[doc, count])
+
+    def _rank(self, doc: int, count: int) -> List[str]:
+        scores = defaultdict(float)
+        for term, query_weight in self.queries[doc]:
+            for weight, other in self.postings[term]:
+                scores[other] += query_weight * weight
+
+        # Pop candidates best first; ties go to the earlier section, so output is stable
+        ranked = [(-score, other) for other, score in scores.items()
+                  if other != doc and score <= MAX_SIMILARITY]
+        heapq.heapify(ranked)
+        seen = {self.answers[doc][:80]}
+        picked = []
+        while ranked and len(picked) < count:
+            option = self.answers[heapq.heappop(ranked)[1]][:80]
+            if option not in seen:
+                seen.add(option)
+                picked.append(option)
+        return picked + FIXED_DISTRACTORS[:count - len(picked)]
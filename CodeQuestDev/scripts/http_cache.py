@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP cache for the scraper.
+Bodies are stored content-addressed (by SHA-256) and indexed by URL in a
+small SQLite database with their ETag / Last-Modified validators, so re-runs
+can send conditional GETs and serve 304 responses from disk.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class HttpCache:
+    """URL -> body cache with conditional-GET validators and LRU eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self.lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                sha TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+
+    # ============ PATHS ============
+    def _body_path(self, sha: str) -> str:
+        return os.path.join(self.cache_dir, "bodies", sha[:2], sha)
+
+    def _memo_path(self, sha: str, tag: str) -> str:
+        return os.path.join(self.cache_dir, "memo", sha[:2], f"{sha}.{tag}.json")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # ============ ENTRIES ============
+    def count(self, outcome: str):
+        """Count a lookup outcome: hits, revalidated (304) or misses."""
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """Return the cached entry for ``url`` (sha, etag, last_modified), or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT sha, etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._body_path(row[0])):
+            return None
+        return {"sha": row[0], "etag": row[1], "last_modified": row[2]}
+
+    def conditional_headers(self, entry: Optional[dict]) -> dict:
+        """Headers that let the server answer 304 when the page is unchanged."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, url: str, entry: dict) -> str:
+        """Read a cached body and mark it as recently used."""
+        with open(self._body_path(entry["sha"]), "rb") as f:
+            body = f.read()
+        with self.lock:
+            self.db.execute("UPDATE entries SET accessed = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        return body.decode("utf-8")
+
+    def store(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]) -> str:
+        """Store a fresh response body and return its SHA-256."""
+        body = text.encode("utf-8")
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._body_path(sha)
+        if not os.path.exists(path):
+            self._write_atomic(path, body)
+
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries (url, sha, etag, last_modified, size, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha, etag, last_modified, len(body), time.time()),
+            )
+            self.db.commit()
+            self._evict()
+        return sha
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for url, sha, size in self.db.execute(
+            "SELECT url, sha, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            # Bodies are shared by every URL with identical content
+            if not self.db.execute("SELECT 1 FROM entries WHERE sha = ? LIMIT 1", (sha,)).fetchone():
+                for path in [self._body_path(sha)] + glob.glob(self._memo_path(sha, "*")):
+                    if os.path.exists(path):
+                        os.remove(path)
+        self.db.commit()
+
+    # ============ MEMOIZATION ============
+    def get_memo(self, sha: str, tag: str) -> Optional[dict]:
+        """Return a value previously derived from the body ``sha``, if any."""
+        try:
+            with open(self._memo_path(sha, tag), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_memo(self, sha: str, tag: str, value: dict):
+        """Remember a value derived from the body ``sha`` (e.g. extracted lesson content)."""
+        self._write_atomic(self._memo_path(sha, tag), json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
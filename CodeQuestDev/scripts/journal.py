@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for the scraper.
+Every lesson is appended to a JSONL file as soon as it is extracted, so a
+crash only loses the page in flight. With --resume, completed URLs are read
+back from the journal instead of being fetched again.
+"""
+
+import json
+import os
+from typing import Iterator, Optional
+
+# Lesson statuses: "ok" has content, "empty" had nothing to extract, "failed" could not be fetched
+DONE_STATUSES = ("ok", "empty")
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of extracted lessons.
+
+    Only statuses and file offsets are kept in memory; lesson bodies are read
+    back from disk when needed.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        # course_id -> {url: {"index", "status", "offset"}}
+        self.lessons = {}
+        self.done_courses = set()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        self.file = open(path, "ab" if resume else "wb")
+        self.reader = open(path, "rb")
+
+    def _load(self):
+        """Index an existing journal, ignoring a truncated last line."""
+        with open(self.path, "rb") as f:
+            offset = 0
+            for raw in f:
+                line_offset, offset = offset, offset + len(raw)
+                if not raw.endswith(b"\n"):
+                    # Interrupted mid-write: drop it so the next append starts a fresh line
+                    os.truncate(self.path, line_offset)
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                self._index(record, line_offset)
+
+    def _index(self, record: dict, offset: int):
+        if record["type"] == "lesson":
+            self.lessons.setdefault(record["course"], {})[record["url"]] = {
+                "index": record["index"],
+                "status": record["status"],
+                "offset": offset,
+            }
+        elif record["type"] == "course_done":
+            self.done_courses.add(record["course"])
+
+    def _append(self, record: dict):
+        self.file.seek(0, os.SEEK_END)
+        offset = self.file.tell()
+        self.file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.file.flush()
+        self._index(record, offset)
+
+    def record_lesson(self, course_id: str, index: int, url: str, status: str, lesson: Optional[dict] = None):
+        """Checkpoint one lesson as soon as it has been extracted (or failed)."""
+        record = {"type": "lesson", "course": course_id, "index": index, "url": url, "status": status}
+        if lesson is not None:
+            record["lesson"] = lesson
+        self._append(record)
+
+    def finish_course(self, course_id: str):
+        """Mark a course complete if every lesson in it was extracted."""
+        entries = self.lessons.get(course_id, {})
+        if entries and all(e["status"] in DONE_STATUSES for e in entries.values()):
+            self._append({"type": "course_done", "course": course_id})
+
+    def is_course_done(self, course_id: str) -> bool:
+        return course_id in self.done_courses
+
+    def completed(self, course_id: str, url: str) -> Optional[dict]:
+        """Return the journal entry for ``url`` if it does not need fetching again."""
+        entry = self.lessons.get(course_id, {}).get(url)
+        if entry and entry["status"] in DONE_STATUSES:
+            return entry
+        return None
+
+    def read_lesson(self, entry: dict) -> Optional[dict]:
+        """Read a journaled lesson body back from disk (None for empty pages)."""
+        self.reader.seek(entry["offset"])
+        return json.loads(self.reader.readline()).get("lesson")
+
+    def lesson_count(self, course_id: str) -> int:
+        """Number of lessons with content extracted for a course."""
+        return sum(1 for e in self.lessons.get(course_id, {}).values() if e["status"] == "ok")
+
+    def iter_lessons(self, course_id: str) -> Iterator[dict]:
+        """Yield a course's extracted lessons in sidebar order."""
+        entries = sorted(self.lessons.get(course_id, {}).values(), key=lambda e: e["index"])
+        for entry in entries:
+            if entry["status"] == "ok":
+                yield self.read_lesson(entry)
+
+    def close(self):
+        self.file.close()
+        self.reader.close()
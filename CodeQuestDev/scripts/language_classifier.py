@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Code language classifier.
+Scores a code snippet against weighted signatures for every language and
+returns the best-scoring one with a confidence, instead of a chain of
+substring checks where the first hit wins.
+
+The snippet is scanned once by a single compiled tokenizer. Each token is
+looked up in a table of trigger keywords (a one-level keyword automaton),
+and only the signatures that token can start are matched, anchored at it.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+CSS_PROPERTIES = [
+    "color", "background", "background-color", "background-image", "margin", "margin-top", "margin-bottom",
+    "margin-left", "margin-right", "padding", "padding-top", "padding-bottom", "padding-left", "padding-right",
+    "font-size", "font-family", "font-weight", "font-style", "border", "border-radius", "border-collapse",
+    "display", "width", "height", "max-width", "text-align", "text-decoration", "text-transform", "position",
+    "top", "left", "float", "flex", "flex-direction", "justify-content", "align-items", "grid-template-columns",
+    "opacity", "z-index", "transition", "transform", "animation", "box-shadow", "overflow", "cursor",
+]
+
+HTML_TAGS = (
+    "div|span|p|a|ul|ol|li|table|tr|td|th|h[1-6]|img|form|input|button|label|select|option|textarea"
+    "|section|article|nav|header|footer|main|title|meta|link|br|hr|iframe|script|style|b|i|strong|em"
+)
+
+
+def _cases(*words: str) -> List[str]:
+    """Trigger variants for a case-insensitive keyword."""
+    return [v for w in words for v in (w.lower(), w.upper(), w.capitalize())]
+
+
+# (language, trigger tokens, pattern matched at the trigger, weight)
+SIGNATURES: List[Tuple[str, List[str], str, int]] = [
+    ("html", ["<!"], r"(?i:<!doctype\s+html)", 10),
+    ("html", ["<", "</"], r"(?i:</?(?:html|head|body)\b)", 6),
+    ("html", ["<", "</"], rf"(?i:</?(?:{HTML_TAGS})\b[^<>]*>)", 2),
+    ("html", ["<!"], r"<!--", 1),
+
+    ("css", CSS_PROPERTIES, r"[\w-]+\s*:\s*[^;{}()\n]+;", 3),
+    ("css", ["@"], r"@(?:media|keyframes|import|font-face)\b", 4),
+    ("css", [".", "#"], r"[.#][\w-]+(?::hover|::?[\w-]+)?\s*\{", 2),
+
+    ("javascript", ["function"], r"function\s*[\w$]*\s*\(", 3),
+    ("javascript", ["const", "let", "var"], r"(?:const|let|var)\s+[\w$]+\s*=", 3),
+    ("javascript", ["="], r"=>", 2),
+    ("javascript", ["=", "!"], r"===|!==", 2),
+    ("javascript", ["document"], r"document\.(?:getElement|querySelector|write|body)", 5),
+    ("javascript", ["console"], r"console\.log\(", 4),
+    ("javascript", ["addEventListener", "window", "JSON"],
+     r"addEventListener\(|window\.\w+|JSON\.(?:parse|stringify)\(", 3),
+
+    ("typescript", ["interface", "type"], r"(?:interface|type)\s+\w+\s*(?:=|\{)", 3),
+    ("typescript", ["string", "number", "boolean", "any", "void", "unknown"],
+     r"(?:string|number|boolean|any|void|unknown)\b(?:\[\])?\s*[;,)=]", 3),
+
+    # Python statements only count at the start of a line
+    ("python", ["def"], r"(?<![^\s])def\s+\w+\s*\([^)\n]*\)\s*(?:->[^:\n]+)?:", 6),
+    ("python", ["import", "from"], r"(?<![^\s])(?:from\s+[\w.]+\s+)?import\s+[\w.]+(?:\s+as\s+\w+)?[ \t]*(?:\n|$)", 4),
+    ("python", ["if", "elif", "for", "while", "else", "try", "except", "with", "class"],
+     r"(?<![^\s])(?:if|elif|for|while|else|try|except|with|class)\b[^\n;{]*:[ \t]*(?:\n|$)", 3),
+    ("python", ["print"], r"print\(", 2),
+    ("python", ["self", "None", "True", "False"], r"\w+", 1),
+
+    ("sql", _cases("select"), r"(?i:select\b[^;]*?\bfrom\b)", 6),
+    ("sql", _cases("insert", "update", "delete", "create"),
+     r"(?i:insert\s+into\b|update\s+\w+\s+set\b|delete\s+from\b|create\s+(?:table|database|index|view)\b)", 6),
+    ("sql", _cases("where", "order", "group", "inner"), r"(?i:where\b|order\s+by\b|group\s+by\b|inner\s+join\b)", 2),
+
+    ("c", ["#"], r"#include\s*<(?:stdio|stdlib|string|math)\.h>", 8),
+    ("c", ["printf", "scanf"], r"(?:printf|scanf)\s*\(", 3),
+    ("c", ["int"], r"int\s+main\s*\(", 2),
+
+    ("cpp", ["#"], r"#include\s*<(?:iostream|string|vector|map|algorithm|fstream|cmath)>", 8),
+    ("cpp", ["std", "cout", "cin", "using"], r"std::|cout\s*<<|cin\s*>>|using\s+namespace\s+std\b", 5),
+
+    ("java", ["public"], r"public\s+(?:static\s+)?(?:class|void|int|String)\b", 5),
+    ("java", ["System"], r"System\.out\.print", 6),
+    ("java", ["String"], r"String\[\]\s+\w+", 4),
+
+    ("php", ["<?"], r"<\?php", 10),
+    ("php", ["$"], r"\$\w+\s*(?:=|->|\[)", 3),
+    ("php", ["echo"], r"echo\s", 2),
+]
+
+# Tie-break order, same as the old if-chain
+LANGUAGES = ["html", "css", "python", "javascript", "typescript", "sql", "c", "cpp", "java", "php"]
+
+# Below this score the snippet is reported as plain text
+MIN_SCORE = 3
+
+# Words (CSS properties keep their hyphens) and the punctuation that starts a signature
+_TOKEN = re.compile(r"[A-Za-z_][\w-]*|<[!?/]?|\$(?=\w)|[#@.=!]")
+
+
+def _build_triggers() -> Dict[str, List[Tuple[re.Pattern, str, int]]]:
+    triggers = {}
+    for language, words, pattern, weight in SIGNATURES:
+        compiled = re.compile(pattern)
+        for word in words:
+            triggers.setdefault(word, []).append((compiled, language, weight))
+    return triggers
+
+
+_TRIGGERS = _build_triggers()
+
+
+def classify(code: str) -> Tuple[str, float]:
+    """Return (language, confidence) for a snippet.
+
+    Confidence is the winning language's share of all matched signature
+    weight; "text" with 0.0 means nothing scored high enough.
+    """
+    scores = dict.fromkeys(LANGUAGES, 0)
+    triggers = _TRIGGERS
+    for token in _TOKEN.finditer(code):
+        candidates = triggers.get(token.group())
+        if candidates:
+            start = token.start()
+            for pattern, language, weight in candidates:
+                if pattern.match(code, start):
+                    scores[language] += weight
+
+    # max() keeps the first of equal scores, so ties follow LANGUAGES order
+    best = max(LANGUAGES, key=scores.__getitem__)
+    if scores[best] < MIN_SCORE:
+        return "text", 0.0
+    return best, scores[best] / sum(scores.values())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lesson splitting.
+A generated lesson shows an introduction and at most five sections, so a
+long W3Schools page used to lose everything after them. This splits long
+lessons into evenly sized sub-lessons instead, weighing each section by
+its (estimated) token count with code examples counting extra, and yields
+them one at a time so the generator never holds more than one page's
+sub-lessons.
+"""
+
+import math
+from typing import Dict, Iterable, Iterator, List
+
+# Rough token estimate for English prose and code
+CHARS_PER_TOKEN = 4
+# Code takes longer to read than prose of the same length
+CODE_WEIGHT = 2
+# Target size of a sub-lesson, in estimated tokens
+SPLIT_BUDGET = 1000
+# Headed sections a lesson can show: the introduction plus five sections
+MAX_SECTIONS = 6
+
+
+def section_weight(section: Dict) -> int:
+    """Estimated tokens of a section's text and code (at least 1)."""
+    chars = len(section.get('heading', ''))
+    for part in section.get('content', []):
+        if isinstance(part, str):
+            chars += len(part)
+        elif isinstance(part, dict) and 'list' in part:
+            chars += sum(len(item) for item in part['list'])
+    for example in section.get('examples', []):
+        chars += CODE_WEIGHT * len(example.get('code', ''))
+    return max(1, chars // CHARS_PER_TOKEN)
+
+
+def _partition(weights: List[int], parts: int) -> List[List[int]]:
+    """Cut section indices into at most ``parts`` consecutive runs of about equal weight.
+
+    A section goes to the part its midpoint falls in, so parts stay in order
+    and none is more than half a section off its share.
+    """
+    share = sum(weights) / parts
+    chunks = [[] for _ in range(parts)]
+    done = 0
+    for i, weight in enumerate(weights):
+        chunks[min(parts - 1, int((done + weight / 2) / share))].append(i)
+        done += weight
+    return [chunk for chunk in chunks if chunk]
+
+
+def split_lesson(lesson: Dict, budget: int = SPLIT_BUDGET) -> List[Dict]:
+    """The lesson as one or more sub-lessons, each within ``budget`` tokens where a
+    section boundary allows and showing all of its sections. ``budget`` 0 never splits.
+
+    Sub-lessons share the lesson's section dicts. The first keeps the lesson's
+    id and the others get "<id>-<part>", so existing lesson links still work.
+    """
+    sections = lesson.get('sections', [])
+    headed = [bool(section.get('heading')) for section in sections]
+    if not budget or not sections:
+        return [lesson]
+    weights = [section_weight(section) for section in sections]
+    parts = max(math.ceil(sum(weights) / budget), math.ceil(sum(headed) / MAX_SECTIONS))
+    while True:
+        chunks = _partition(weights, parts) if parts > 1 else [list(range(len(sections)))]
+        if all(sum(headed[i] for i in chunk) <= MAX_SECTIONS for chunk in chunks):
+            break
+        parts += 1
+
+    # Sections without a heading are not shown on their own; keep them with a neighbour
+    merged = []
+    for chunk in chunks:
+        if merged and not any(headed[i] for i in merged[-1]):
+            merged[-1].extend(chunk)
+        elif merged and not any(headed[i] for i in chunk):
+            merged[-1].extend(chunk)
+        else:
+            merged.append(chunk)
+    if len(merged) == 1:
+        return [lesson]
+
+    title = lesson.get('title', 'Lição')
+    subs = []
+    for part, chunk in enumerate(merged, 1):
+        sub = {**lesson, 'title': f"{title} ({part}/{len(merged)})", 'sections': [sections[i] for i in chunk]}
+        if part > 1 and 'id' in lesson:
+            sub['id'] = f"{lesson['id']}-{part}"
+        subs.append(sub)
+    return subs
+
+
+def split_lessons(lessons: Iterable[Dict], budget: int = SPLIT_BUDGET) -> Iterator[Dict]:
+    """Every lesson's sub-lessons in order, produced as the generator asks for them."""
+    for lesson in lessons:
+        yield from split_lesson(lesson, budget)
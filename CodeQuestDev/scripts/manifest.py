@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content Manifest
+Per-lesson and per-section content hashes of the scraped corpus, and a
+report of what changed since the last manifest was saved.
+
+convert_to_lessons.py saves the manifest of the corpus it last generated
+from and uses the diff to regenerate only the modules whose lessons
+changed (or whose quiz distractors, drawn from the whole course, did). Run this script after a scrape to see what the next conversion
+will pick up:
+
+    python manifest.py [--data ../apps/web/data/w3schools_courses.json] [--manifest ...] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+from course_reader import iter_courses
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(SCRIPT_DIR, "..", "apps", "web", "data", "w3schools_courses.json")
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, "..", "apps", "web", "data", "w3schools_manifest.json")
+
+MANIFEST_VERSION = 1
+# Lessons listed per course and kind of change in the printed report
+REPORT_LIMIT = 20
+
+
+# ============ HASHING ============
+def content_hash(value) -> str:
+    """Hash of a JSON value that ignores key order and formatting."""
+    data = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def lesson_entry(lesson: Dict) -> Dict:
+    """{"id", "hash", "sections": [section hashes]} for one lesson."""
+    sections = [content_hash(section) for section in lesson.get("sections", [])]
+    rest = {k: v for k, v in lesson.items() if k != "sections"}
+    return {
+        "id": lesson.get("id") or lesson.get("title", ""),
+        "hash": content_hash([rest, sections]),
+        "sections": sections,
+    }
+
+
+def course_entry(course: Dict) -> Dict:
+    """Manifest entry for a course. Lessons stay in corpus order, since modules are slices of it."""
+    meta = {k: v for k, v in course.items() if k != "lessons"}
+    return {
+        "hash": content_hash(meta),
+        "lessons": [lesson_entry(lesson) for lesson in course.get("lessons", [])],
+    }
+
+
+def build_manifest(courses: Iterable[Dict]) -> Dict:
+    return {"version": MANIFEST_VERSION,
+            "courses": {course["id"]: course_entry(course) for course in courses}}
+
+
+def load_manifest(path: str) -> Optional[Dict]:
+    """The saved manifest, or None if there is none (or it is from another version)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def save_manifest(path: str, manifest: Dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+# ============ DIFF ============
+def diff_course(old: Optional[Dict], new: Optional[Dict]) -> Dict:
+    """Lessons added, removed and changed between two course entries (matched by lesson id)."""
+    old_lessons = {lesson["id"]: lesson for lesson in (old or {}).get("lessons", [])}
+    new_lessons = {lesson["id"]: lesson for lesson in (new or {}).get("lessons", [])}
+    changed = []
+    for lesson_id, lesson in new_lessons.items():
+        before = old_lessons.get(lesson_id)
+        if before is None or before["hash"] == lesson["hash"]:
+            continue
+        sections = [i for i, h in enumerate(lesson["sections"])
+                    if i >= len(before["sections"]) or before["sections"][i] != h]
+        changed.append({"id": lesson_id, "sections": sections,
+                        "removed_sections": max(0, len(before["sections"]) - len(lesson["sections"]))})
+    return {
+        "added": [i for i in new_lessons if i not in old_lessons],
+        "removed": [i for i in old_lessons if i not in new_lessons],
+        "changed": changed,
+        "metadata": bool(old and new and old["hash"] != new["hash"]),
+    }
+
+
+def diff_manifests(old: Optional[Dict], new: Dict) -> Dict[str, Dict]:
+    """Per-course diffs for courses that differ, including added and removed courses."""
+    old_courses = (old or {}).get("courses", {})
+    new_courses = new["courses"]
+    report = {}
+    for course_id in [*new_courses, *(c for c in old_courses if c not in new_courses)]:
+        diff = diff_course(old_courses.get(course_id), new_courses.get(course_id))
+        if diff["added"] or diff["removed"] or diff["changed"] or diff["metadata"]:
+            report[course_id] = diff
+    return report
+
+
+def changed_lessons(old: Optional[Dict], new: Dict, start: int, end: int) -> bool:
+    """Whether lessons[start:end] of a course differ between two entries (in content or order)."""
+    if old is None or old["hash"] != new["hash"]:
+        return True
+    before = [lesson["hash"] for lesson in old["lessons"][start:end]]
+    return before != [lesson["hash"] for lesson in new["lessons"][start:end]]
+
+
+def print_report(report: Dict[str, Dict]):
+    if not report:
+        print("✅ No changes since the last manifest")
+        return
+    for course_id, diff in report.items():
+        sections = sum(len(c["sections"]) + c["removed_sections"] for c in diff["changed"])
+        print(f"📚 {course_id}: +{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])} lessons"
+              f" ({sections} sections){' + course metadata' if diff['metadata'] else ''}")
+        lines = ([f"+ {lesson_id}" for lesson_id in diff["added"]],
+                 [f"- {lesson_id}" for lesson_id in diff["removed"]],
+                 [f"~ {c['id']}: sections {c['sections']}"
+                  + (f", {c['removed_sections']} removed" if c["removed_sections"] else "") for c in diff["changed"]])
+        for kind in lines:
+            for line in kind[:REPORT_LIMIT]:
+                print(f"   {line}")
+            if len(kind) > REPORT_LIMIT:
+                print(f"   ... and {len(kind) - REPORT_LIMIT} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report lessons added, removed or changed since the last manifest")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Manifest to compare against")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    old = load_manifest(args.manifest)
+    new = build_manifest(iter_courses(args.data))
+    report = diff_manifests(old, new)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        if old is None:
+            print(f"⚠️ No manifest at {args.manifest}, every lesson counts as added")
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
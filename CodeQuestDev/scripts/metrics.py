@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Scraper metrics.
+Thread-safe counters and histograms, exported as a JSON summary or in the
+Prometheus text format (e.g. for node_exporter's textfile collector).
+"""
+
+import bisect
+import json
+import os
+import threading
+from typing import Dict, List, Sequence
+
+# Seconds: from a cached page (milliseconds) to a slow download
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes: 1 KiB to 4 MiB
+SIZE_BUCKETS = tuple(float(1 << shift) for shift in range(10, 23, 2))
+
+
+def _label_key(labels: Dict[str, str]) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _number(value: float) -> str:
+    """Prometheus sample value, exact (no exponent rounding of byte counts)."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(key: tuple) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}" if key else ""
+
+
+class Counter:
+    """A monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+    def snapshot(self):
+        """The value, or {label values: value} for a labelled counter."""
+        with self.lock:
+            values = dict(self.values)
+        if list(values) in ([], [()]):
+            return values.get((), 0)
+        return {",".join(v for _, v in key): value for key, value in sorted(values.items())}
+
+    def prometheus(self) -> List[str]:
+        with self.lock:
+            values = sorted(self.values.items()) or [((), 0)]
+        return [f"{self.name}{_format_labels(key)} {_number(value)}" for key, value in values]
+
+
+class Histogram:
+    """Observations counted into fixed buckets, plus their sum, count and maximum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = list(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        with self.lock:
+            counts = list(self.counts)
+            count = self.count
+            top = self.max
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                low = self.bounds[i - 1] if i > 0 else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else top
+                return min(top, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return top
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            count, total, top = self.count, self.sum, self.max
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(top, 6),
+        }
+
+    def prometheus(self) -> List[str]:
+        with self.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.bounds, counts):
+            cumulative += n
+            lines.append(f'{self.name}_bucket{{le="{_number(bound)}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{self.name}_sum {_number(total)}")
+        lines.append(f"{self.name}_count {count}")
+        return lines
+
+
+class Metrics:
+    """A registry of named counters and histograms."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args)
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get(Counter, name, help)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets)
+
+    def summary(self) -> Dict:
+        """Every metric's current value, for the JSON summary."""
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def prometheus(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.prometheus())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write the Prometheus text format atomically, so a collector never reads half a file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+
+def write_json(path: str, summary: Dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
@@ -6,15 +6,66 @@ All extracted content includes source attribution.
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+import argparse
+import cProfile
+import heapq
+import io
+import pstats
 import time
 import re
+import threading
+import multiprocessing
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
-from typing import Optional
+from typing import Optional, Tuple
 import os
 
+from archive import ArchiveWriter, start_replay_server
+from http_cache import HttpCache, DEFAULT_MAX_BYTES
+from journal import CheckpointJournal
+from course_writer import CourseWriter, FORMATS
+from language_classifier import classify
+from metrics import SIZE_BUCKETS, Metrics, write_json
+from sitemap import CrawlFrontier, course_matcher, plan_courses, read_sitemap, robots_sitemaps
+
+# Where pages are fetched from (a local replay server with --replay), and
+# what lessons are attributed to
 BASE_URL = "https://www.w3schools.com"
+SITE_URL = BASE_URL
+
+# Politeness budget: at most one request every REQUEST_DELAY seconds per host
+REQUEST_DELAY = 0.3
+
+# Keep-alive connections kept open per host
+POOL_SIZE = 8
+
+# Bump when extract_lesson_content changes, so memoized extractions are redone
+EXTRACT_MEMO_TAG = "lesson-v2"
+
+# BeautifulSoup tree builder: "html.parser" (pure Python) or "lxml" (C, much faster)
+HTML_PARSER = "html.parser"
+PARSERS = ["html.parser", "lxml"]
+
+# Tags that make up lesson content
+CONTENT_TAGS = {"h1", "h2", "h3", "p", "ul", "ol", "pre", "div"}
+# Elements whose class contains one of these are navigation, ads or buttons
+SKIP_CLASSES = ("w3-btn", "nextprev", "w3-panel", "w3-note")
+# Everything inside an element with one of these classes is navigation
+NAV_CLASSES = {"nextprev", "w3-btn"}
+
+# Reference pages and other non-tutorial content, matched anywhere in a link
+SKIP_PATTERNS = ("_ref_", "quiz", "exercise", "exam", "bootcamp", "syllabus", "interview")
+SKIP_LINK = re.compile("|".join(map(re.escape, SKIP_PATTERNS)), re.IGNORECASE)
+
+# Lessons extracted per course
+MAX_LESSONS = 80
 
 # Course definitions with URLs and metadata
 COURSES = {
@@ -225,22 +276,346 @@ HEADERS = {
 }
 
 
-def get_page(url: str, base_path: str = "") -> Optional[BeautifulSoup]:
-    """Fetch a page and return BeautifulSoup object."""
+# ============ METRICS ============
+METRICS = Metrics()
+FETCH_SECONDS = METRICS.histogram("scraper_fetch_seconds", "HTTP request time, from sending to the last body byte")
+FETCH_BYTES = METRICS.counter("scraper_fetch_bytes_total", "Response body bytes downloaded")
+RESPONSE_BYTES = METRICS.histogram("scraper_response_bytes", "Response body size", SIZE_BUCKETS)
+REQUESTS = METRICS.counter("scraper_requests_total", "HTTP requests by status code")
+RETRIES = METRICS.counter("scraper_retries_total", "Requests retried after a connection error, 429 or 5xx")
+FETCH_ERRORS = METRICS.counter("scraper_fetch_errors_total", "Pages that could not be fetched")
+CACHE_RESULTS = METRICS.counter("scraper_cache_total", "Page lookups by HTTP cache outcome")
+MEMO_HITS = METRICS.counter("scraper_extract_memo_hits_total", "Lessons whose extraction was reused from the cache")
+PARSE_SECONDS = METRICS.histogram("scraper_parse_seconds", "Time to parse and extract one lesson page")
+LESSONS = METRICS.counter("scraper_lessons_total", "Lessons by outcome")
+
+
+# ============ FETCH LAYER ============
+_connect_timer = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """Records how long the TCP connect took, for the per-request timing report."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timer.elapsed = getattr(_connect_timer, "elapsed", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """Records how long the TCP connect and TLS handshake took."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timer.elapsed = getattr(_connect_timer, "elapsed", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools time every new connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class Fetcher:
+    """Shared HTTP session with keep-alive pooling, retries and request timing.
+
+    Each request is recorded in ``timings`` with its connect time (zero when a
+    pooled connection is reused), time to first byte and download time.
+    With a ``cache``, pages are revalidated with conditional GETs, or served
+    from disk only when the cache is offline. With a ``recorder``, every page
+    is also appended to a response archive for later replay.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE, retries: int = 3, backoff: float = 0.5, timeout: float = 30,
+                 cache: HttpCache = None, recorder: ArchiveWriter = None, replaying: bool = False):
+        self.timeout = timeout
+        self.cache = cache
+        self.recorder = recorder
+        self.replaying = replaying
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        # Advertises br as well when brotli is installed
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.timings = []
+        self.lock = threading.Lock()
+
+    @property
+    def offline(self) -> bool:
+        return bool(self.cache and self.cache.offline)
+
+    @property
+    def throttled(self) -> bool:
+        """Whether requests reach the real site, and so must respect the politeness delay."""
+        return not (self.offline or self.replaying)
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """GET ``url`` with the body fully downloaded, recording its timing."""
+        _connect_timer.elapsed = 0.0
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        first_byte = time.perf_counter()
+        body = response.content
+        done = time.perf_counter()
+
+        connect = _connect_timer.elapsed
+        FETCH_SECONDS.observe(done - start)
+        FETCH_BYTES.inc(len(body))
+        RESPONSE_BYTES.observe(len(body))
+        REQUESTS.inc(status=str(response.status_code))
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            RETRIES.inc(len(retries.history))
+        with self.lock:
+            self.timings.append({
+                "url": url,
+                "status": response.status_code,
+                "connect": connect,
+                "ttfb": first_byte - start - connect,
+                "download": done - first_byte,
+                "bytes": len(body),
+            })
+        return response
+
+    def fetch(self, url: str) -> Tuple[str, Optional[str]]:
+        """Return ``(html, sha)`` for ``url``, going through the cache if there is one.
+
+        ``sha`` is the SHA-256 of the cached body, or None without a cache.
+        """
+        html, sha = self._fetch(url)
+        if self.recorder:
+            self.recorder.record(url, html.encode("utf-8"))
+        return html, sha
+
+    def _fetch(self, url: str) -> Tuple[str, Optional[str]]:
+        cache = self.cache
+        if cache is None:
+            response = self.get(url)
+            response.raise_for_status()
+            return response.text, None
+
+        entry = cache.lookup(url)
+        if cache.offline:
+            if entry is None:
+                raise LookupError("not in cache (offline mode)")
+            self._cache_result("hits")
+            return cache.read(url, entry), entry["sha"]
+
+        response = self.get(url, headers=cache.conditional_headers(entry))
+        if response.status_code == 304 and entry:
+            self._cache_result("revalidated")
+            return cache.read(url, entry), entry["sha"]
+
+        response.raise_for_status()
+        self._cache_result("misses")
+        sha = cache.store(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.text, sha
+
+    def _cache_result(self, outcome: str):
+        self.cache.count(outcome)
+        CACHE_RESULTS.inc(result=outcome)
+
+    def summary(self) -> dict:
+        """Totals and averages of the recorded request timings."""
+        with self.lock:
+            timings = list(self.timings)
+        count = len(timings)
+        summary = {"requests": count, "bytes": sum(t["bytes"] for t in timings)}
+        for phase in ("connect", "ttfb", "download"):
+            total = sum(t[phase] for t in timings)
+            summary[phase] = {"total": total, "avg": total / count if count else 0.0}
+        summary["new_connections"] = sum(1 for t in timings if t["connect"] > 0)
+        return summary
+
+
+_fetcher = None
+
+
+def get_fetcher() -> Fetcher:
+    """Return the shared Fetcher, creating one with default settings if needed."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = Fetcher()
+    return _fetcher
+
+
+def configure_fetcher(**kwargs) -> Fetcher:
+    """Replace the shared Fetcher, e.g. with a different pool size."""
+    global _fetcher
+    _fetcher = Fetcher(**kwargs)
+    return _fetcher
+
+
+def fetch_html(url: str, base_path: str = "") -> Optional[Tuple[str, Optional[str]]]:
+    """Fetch a page and return its HTML and cached body hash."""
     try:
         # Handle relative URLs - prepend base_path if needed
         if not url.startswith("http") and not url.startswith("/"):
             url = base_path + url
         
         full_url = urljoin(BASE_URL, url)
-        response = requests.get(full_url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+        return get_fetcher().fetch(full_url)
     except Exception as e:
+        FETCH_ERRORS.inc()
         print(f"  ⚠️ Error fetching {url}: {e}")
         return None
 
 
+def get_page(url: str, base_path: str = "") -> Optional[BeautifulSoup]:
+    """Fetch a page and return BeautifulSoup object."""
+    page = fetch_html(url, base_path)
+    if page is None:
+        return None
+    return BeautifulSoup(page[0], HTML_PARSER)
+
+
+def get_lesson_content(url: str) -> Optional[dict]:
+    """Fetch and extract a lesson page.
+
+    When the page body is cached, the extraction is memoized against its hash,
+    so unchanged pages are not parsed again.
+    """
+    page = fetch_html(url)
+    if page is None:
+        return None
+
+    html, sha = page
+    content = memoized_extraction(url, sha)
+    if content is None:
+        content, elapsed = timed_parse(html, url, HTML_PARSER)
+        PARSE_SECONDS.observe(elapsed)
+        remember_extraction(sha, content)
+    return content
+
+
+def parse_lesson(html: str, url: str, parser: str) -> dict:
+    """Parse a lesson page and extract its content.
+
+    Kept at module level so it can run in a worker process.
+    """
+    if _profiler is not None:
+        return _profiler.run(url, _parse, html, url, parser)
+    return _parse(html, url, parser)
+
+
+def _parse(html: str, url: str, parser: str) -> dict:
+    return extract_lesson_content(BeautifulSoup(html, parser), url)
+
+
+def timed_parse(html: str, url: str, parser: str) -> Tuple[dict, float]:
+    """parse_lesson and how long it took, measured where it ran."""
+    start = time.perf_counter()
+    content = parse_lesson(html, url, parser)
+    return content, time.perf_counter() - start
+
+
+def _memo_tag() -> str:
+    # Parsers can disagree on malformed HTML, so memoize per parser
+    return f"{EXTRACT_MEMO_TAG}-{HTML_PARSER}"
+
+
+def memoized_extraction(url: str, sha: Optional[str]) -> Optional[dict]:
+    """Return the extraction memoized for this cached body, if there is one."""
+    if not sha:
+        return None
+    content = get_fetcher().cache.get_memo(sha, _memo_tag())
+    if content is None:
+        return None
+    MEMO_HITS.inc()
+    return {**content, "source": urljoin(SITE_URL, url)}
+
+
+def remember_extraction(sha: Optional[str], content: dict):
+    if sha:
+        get_fetcher().cache.put_memo(sha, _memo_tag(), content)
+
+
+class ExtractionProfiler:
+    """cProfile of lesson parsing and extraction, one profile per course, plus the slowest pages.
+
+    Each page is profiled on its own (a profiler only sees the thread it runs
+    in) and merged into its course's stats.
+    """
+
+    def __init__(self, course_ids: list, slowest: int = 10):
+        self.matcher, self.course_ids = course_matcher({c: COURSES[c].get("base_path", f"/{c}/") for c in course_ids})
+        self.stats = {}
+        self.slowest = slowest
+        self.pages = []
+        self.lock = threading.Lock()
+
+    def course_of(self, url: str) -> str:
+        match = self.matcher.match(urlparse(url).path)
+        return self.course_ids[int(match.lastgroup[1:])] if match else "other"
+
+    def run(self, url: str, fn, *args):
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        result = profile.runcall(fn, *args)
+        elapsed = time.perf_counter() - start
+        course_id = self.course_of(url)
+        with self.lock:
+            stats = self.stats.get(course_id)
+            if stats is None:
+                self.stats[course_id] = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                stats.add(profile)
+            heapq.heappush(self.pages, (elapsed, url))
+            if len(self.pages) > self.slowest:
+                heapq.heappop(self.pages)
+        return result
+
+    def report(self, directory: str, top: int = 15):
+        """Save each course's profile as <course>.prof and print the hot spots."""
+        if not self.stats:
+            return
+        os.makedirs(directory, exist_ok=True)
+        out = io.StringIO()
+        combined = pstats.Stats(stream=out)
+        for course_id, stats in self.stats.items():
+            stats.dump_stats(os.path.join(directory, f"{course_id}.prof"))
+            combined.add(stats)
+
+        print(f"\n🔬 Profiles saved to {directory} (python -m pstats <course>.prof)")
+        print("   Slowest pages:")
+        for elapsed, url in sorted(self.pages, reverse=True):
+            print(f"   {elapsed * 1000:8.1f}ms  {url}")
+        combined.sort_stats("cumulative").print_stats(top)
+        print(f"   Top {top} functions by cumulative time, all courses:")
+        for line in out.getvalue().splitlines():
+            if line.strip() and not line.lstrip().startswith(("Ordered by", "List reduced")):
+                print(f"   {line}")
+
+
+_profiler = None
+
+
 def extract_sidebar_links(soup: BeautifulSoup, base_path: str) -> list:
     """Extract all lesson links from the sidebar navigation."""
     links = []
@@ -265,8 +640,7 @@ def extract_sidebar_links(soup: BeautifulSoup, base_path: str) -> list:
                 continue
             
             # Skip reference pages and other non-tutorial content
-            skip_patterns = ["_ref_", "quiz", "exercise", "exam", "bootcamp", "syllabus", "interview"]
-            if any(pattern in href.lower() for pattern in skip_patterns):
+            if SKIP_LINK.search(href):
                 continue
             
             # Build full relative path
@@ -288,12 +662,72 @@ def extract_sidebar_links(soup: BeautifulSoup, base_path: str) -> list:
     return links
 
 
+def load_sitemap(source: str) -> list:
+    """Read sitemap entries from a URL, a saved file, or "robots" for the
+    sitemaps robots.txt lists. Sitemap indexes are followed."""
+    if source == "robots":
+        page = fetch_html("/robots.txt")
+        pending = robots_sitemaps(page[0]) if page else []
+    else:
+        pending = [source]
+
+    entries = []
+    seen = set()
+    while pending:
+        source = pending.pop(0)
+        if source in seen:
+            continue
+        seen.add(source)
+        if os.path.exists(source):
+            with open(source, "rb") as f:
+                data = f.read()
+        elif source.endswith(".gz"):
+            response = get_fetcher().get(urljoin(BASE_URL, source))
+            response.raise_for_status()
+            data = response.content
+        else:
+            page = fetch_html(source)
+            if page is None:
+                continue
+            data = page[0]
+        found, children = read_sitemap(data)
+        entries.extend(found)
+        pending.extend(children)
+    return entries
+
+
+def plan_crawl(source: str, course_ids: list, limit: int = MAX_LESSONS) -> CrawlFrontier:
+    """Plan every course's lessons from a sitemap, in place of their sidebars."""
+    entries = load_sitemap(source)
+    plan = plan_courses(entries, {c: COURSES[c] for c in course_ids}, SKIP_LINK, limit)
+    print(f"🗺️  Sitemap: {len(entries)} URLs, {sum(map(len, plan.values()))} lessons planned")
+    return CrawlFrontier(plan, course_ids)
+
+
+def iter_content_tags(root: Tag):
+    """Yield the descendant tags of ``root`` in document order.
+
+    Navigation blocks are yielded themselves but never descended into, so one
+    linear walk replaces a find_parent lookup per element.
+    """
+    stack = [iter(root.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag):
+                yield child
+                if NAV_CLASSES.isdisjoint(child.get("class") or ()):
+                    stack.append(iter(child.children))
+                break
+        else:
+            stack.pop()
+
+
 def extract_lesson_content(soup: BeautifulSoup, url: str) -> dict:
     """Extract content from a lesson page."""
     content = {
         "sections": [],
         "examples": [],
-        "source": urljoin(BASE_URL, url)
+        "source": urljoin(SITE_URL, url)
     }
     
     # Find main content area
@@ -309,17 +743,20 @@ def extract_lesson_content(soup: BeautifulSoup, url: str) -> dict:
     if title_elem:
         content["title"] = title_elem.get_text(strip=True)
     
+    # Skip everything if the content area itself sits inside navigation
+    if main.find_parent(class_=list(NAV_CLASSES)):
+        return content
+    
     # Extract sections
     current_section = {"heading": "", "content": [], "examples": []}
     
-    for elem in main.find_all(["h1", "h2", "h3", "p", "ul", "ol", "pre", "div"], recursive=True):
-        # Skip navigation, ads, and buttons
-        elem_classes = str(elem.get("class", []))
-        if any(c in elem_classes for c in ["w3-btn", "nextprev", "w3-panel", "w3-note"]):
+    for elem in iter_content_tags(main):
+        if elem.name not in CONTENT_TAGS:
             continue
         
-        # Skip if inside navigation
-        if elem.find_parent(class_=["nextprev", "w3-btn"]):
+        # Skip navigation, ads, and buttons
+        elem_classes = " ".join(elem.get("class") or ())
+        if any(c in elem_classes for c in SKIP_CLASSES):
             continue
             
         if elem.name in ["h1", "h2", "h3"]:
@@ -361,104 +798,393 @@ def extract_lesson_content(soup: BeautifulSoup, url: str) -> dict:
 
 
 def detect_language(code: str) -> str:
-    """Detect programming language from code snippet."""
-    code_lower = code.lower()
-    
-    if "<!doctype" in code_lower or "<html" in code_lower or "<div" in code_lower:
-        return "html"
-    elif ":" in code and ";" in code and not "function" in code_lower and ("color" in code_lower or "background" in code_lower or "margin" in code_lower):
-        return "css"
-    elif "def " in code or "import " in code and "from " in code:
-        return "python"
-    elif "function " in code or "const " in code or "let " in code or "=>" in code:
-        return "javascript"
-    elif "SELECT " in code.upper() or "FROM " in code.upper() or "WHERE " in code.upper():
-        return "sql"
-    elif "#include" in code or "int main(" in code:
-        return "c"
-    elif "public class" in code or "public static void" in code:
-        return "java"
-    elif "<?php" in code_lower:
-        return "php"
-    
-    return "text"
+    """Detect programming language from code snippet (see language_classifier.classify)."""
+    return classify(code)[0]
 
 
-def extract_course(course_id: str, course_info: dict) -> dict:
-    """Extract all lessons from a course."""
-    print(f"\n📚 Extracting: {course_info['name']}")
-    
-    base_path = course_info.get("base_path", f"/{course_id}/")
-    
-    course = {
+def new_course(course_id: str, course_info: dict) -> dict:
+    """Build an empty course record from its COURSES entry."""
+    return {
         "id": course_id,
         "name": course_info["name"],
         "description": course_info["description"],
         "category": course_info["category"],
         "difficulty": course_info["difficulty"],
         "icon": course_info["icon"],
-        "source": urljoin(BASE_URL, course_info["url"]),
+        "source": urljoin(SITE_URL, course_info["url"]),
         "lessons": []
     }
+
+
+def add_lesson(course: dict, index: int, total: int, link: dict, lesson_content: Optional[dict],
+               journal: CheckpointJournal = None):
+    """Append an extracted lesson to the course, or report why it was dropped.
+
+    ``lesson_content`` is None when the page could not be fetched. The outcome
+    is checkpointed in ``journal`` either way.
+    """
+    if lesson_content is None:
+        LESSONS.inc(outcome="failed")
+        print(f"  ✗ [{index+1}/{total}] Failed: {link['title']}")
+        if journal:
+            journal.record_lesson(course["id"], index, link["url"], "failed")
+        return
+
+    # Skip if no content extracted
+    if not lesson_content.get("sections"):
+        LESSONS.inc(outcome="empty")
+        print(f"  ⚠️ [{index+1}/{total}] No content: {link['title']}")
+        if journal:
+            journal.record_lesson(course["id"], index, link["url"], "empty")
+        return
+
+    lesson = {
+        "id": f"{course['id']}-{index+1}",
+        "title": link["title"],
+        "order": index + 1,
+        **lesson_content
+    }
+    course["lessons"].append(lesson)
+    if journal:
+        journal.record_lesson(course["id"], index, link["url"], "ok", lesson)
+    LESSONS.inc(outcome="ok")
+    print(f"  ✓ [{index+1}/{total}] {link['title']}")
+
+
+def resume_lesson(course: dict, index: int, total: int, link: dict, journal: CheckpointJournal, entry: dict):
+    """Append a lesson completed in a previous run, read back from the journal."""
+    lesson = journal.read_lesson(entry)
+    if lesson:
+        course["lessons"].append(lesson)
+    LESSONS.inc(outcome="resumed")
+    print(f"  ↺ [{index+1}/{total}] Resumed: {link['title']}")
+
+
+def extract_course(course_id: str, course_info: dict, journal: CheckpointJournal = None,
+                   links: list = None, limit: int = MAX_LESSONS) -> dict:
+    """Extract all lessons from a course.
+
+    Lessons already completed in ``journal`` are taken from it instead of
+    being fetched again. ``links`` (e.g. planned from a sitemap) replaces
+    the sidebar of the course's main page.
+    """
+    print(f"\n📚 Extracting: {course_info['name']}")
     
-    # Get main page
-    soup = get_page(course_info["url"])
-    if not soup:
-        return course
+    base_path = course_info.get("base_path", f"/{course_id}/")
+    course = new_course(course_id, course_info)
     
-    # Extract lesson links
-    links = extract_sidebar_links(soup, base_path)
+    if links is None:
+        # Get main page
+        soup = get_page(course_info["url"])
+        if not soup:
+            return course
+        
+        # Extract lesson links
+        links = extract_sidebar_links(soup, base_path)
     print(f"  Found {len(links)} lessons")
     
     # Extract each lesson
-    for i, link in enumerate(links[:80]):  # Limit to 80 lessons per course
-        time.sleep(0.3)  # Be polite to the server
+    for i, link in enumerate(links[:limit]):
+        entry = journal.completed(course_id, link["url"]) if journal else None
+        if entry:
+            resume_lesson(course, i, len(links), link, journal, entry)
+            continue
         
-        lesson_soup = get_page(link["url"])
-        if lesson_soup:
-            lesson_content = extract_lesson_content(lesson_soup, link["url"])
-            
-            # Skip if no content extracted
-            if not lesson_content.get("sections"):
-                print(f"  ⚠️ [{i+1}/{len(links)}] No content: {link['title']}")
-                continue
-                
-            lesson = {
-                "id": f"{course_id}-{i+1}",
-                "title": link["title"],
-                "order": i + 1,
-                **lesson_content
-            }
-            course["lessons"].append(lesson)
-            print(f"  ✓ [{i+1}/{len(links)}] {link['title']}")
-        else:
-            print(f"  ✗ [{i+1}/{len(links)}] Failed: {link['title']}")
+        if get_fetcher().throttled:
+            time.sleep(REQUEST_DELAY)  # Be polite to the server
+        
+        lesson_content = get_lesson_content(link["url"])
+        add_lesson(course, i, len(links), link, lesson_content, journal)
     
     return course
 
 
+class TokenBucket:
+    """Thread-safe token bucket that releases one token every ``1 / rate`` seconds."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, so the politeness budget applies per server."""
+
+    def __init__(self, delay: float = REQUEST_DELAY):
+        self.delay = delay
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url: str):
+        if not get_fetcher().throttled:
+            return
+        host = urlparse(urljoin(BASE_URL, url)).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                # Start empty so the first request also waits, like the sequential crawl
+                bucket = self.buckets[host] = TokenBucket(1 / self.delay)
+                bucket.tokens = 0
+        bucket.acquire()
+
+
+class ConcurrentCrawler:
+    """Fetch lessons from several courses at once through a shared thread pool.
+
+    Every request goes through a per-host rate limiter, so the politeness
+    budget is the same as the sequential crawl. Lessons are reassembled in
+    sidebar order, so ``course()`` returns exactly what extract_course would.
+
+    With ``parse_workers``, fetching and parsing become two stages: network
+    threads put raw HTML on a bounded queue and a process pool runs the
+    CPU-bound extraction. A full queue blocks the fetchers (backpressure).
+
+    With a ``frontier`` (see plan_crawl), no sidebars are fetched and lesson
+    fetches are queued across all courses in the frontier's priority order.
+    """
+
+    def __init__(self, course_ids: list, workers: int = 8, limiter: HostRateLimiter = None,
+                 journal: CheckpointJournal = None, parse_workers: int = 0,
+                 frontier: CrawlFrontier = None, limit: int = MAX_LESSONS):
+        self.course_ids = course_ids
+        self.journal = journal
+        self.frontier = frontier
+        self.limit = limit
+        self.limiter = limiter or HostRateLimiter()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.links = {}
+        self.lesson_futures = {}
+
+        self.parse_pool = None
+        if parse_workers:
+            # spawn, not fork: forking a process that already runs threads is unsafe
+            self.parse_pool = ProcessPoolExecutor(parse_workers, mp_context=multiprocessing.get_context("spawn"))
+            self.parse_queue = queue.Queue(maxsize=parse_workers * 2)
+            self.parse_slots = threading.Semaphore(parse_workers * 2)
+            self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+            self.dispatcher.start()
+
+    def _fetch_index(self, course_id: str) -> Optional[list]:
+        course_info = COURSES[course_id]
+        self.limiter.wait(course_info["url"])
+        soup = get_page(course_info["url"])
+        if not soup:
+            return None
+        base_path = course_info.get("base_path", f"/{course_id}/")
+        return extract_sidebar_links(soup, base_path)
+
+    def _fetch_lesson(self, link: dict):
+        """Fetch a lesson; returns its content, or a Future of it when parsing is queued."""
+        self.limiter.wait(link["url"])
+        if not self.parse_pool:
+            return get_lesson_content(link["url"])
+
+        page = fetch_html(link["url"])
+        if page is None:
+            return None
+        html, sha = page
+        content = memoized_extraction(link["url"], sha)
+        if content is not None:
+            return content
+
+        parsed = Future()
+        self.parse_queue.put((parsed, link["url"], html, sha))
+        return parsed
+
+    def _dispatch(self):
+        """Move queued pages into the process pool, keeping a bounded number in flight."""
+        while True:
+            item = self.parse_queue.get()
+            if item is None:
+                return
+            parsed, url, html, sha = item
+            self.parse_slots.acquire()
+            try:
+                task = self.parse_pool.submit(timed_parse, html, url, HTML_PARSER)
+            except Exception as e:
+                self.parse_slots.release()
+                parsed.set_exception(e)
+                continue
+            task.add_done_callback(lambda task, parsed=parsed, url=url, sha=sha: self._parsed(task, parsed, url, sha))
+
+    def _parsed(self, task: Future, parsed: Future, url: str, sha: Optional[str]):
+        self.parse_slots.release()
+        try:
+            content, elapsed = task.result()
+            PARSE_SECONDS.observe(elapsed)
+            # The worker process may not share our SITE_URL
+            content = {**content, "source": urljoin(SITE_URL, url)}
+            remember_extraction(sha, content)
+        except Exception as e:
+            parsed.set_exception(e)
+        else:
+            parsed.set_result(content)
+
+    def _completed(self, course_id: str, link: dict) -> Optional[dict]:
+        return self.journal.completed(course_id, link["url"]) if self.journal else None
+
+    def start(self):
+        """Fetch every course index and queue all lesson pages."""
+        if self.frontier is not None:
+            self._start_frontier()
+            return
+        index_futures = {self.pool.submit(self._fetch_index, course_id): course_id for course_id in self.course_ids}
+        # Queue lessons as soon as each course's sidebar is known
+        for future in as_completed(index_futures):
+            course_id = index_futures[future]
+            try:
+                self.links[course_id] = future.result()
+            except Exception as e:
+                self.links[course_id] = e
+                continue
+            if self.links[course_id]:
+                # Lessons completed in a previous run are read from the journal instead
+                self.lesson_futures[course_id] = [
+                    None if self._completed(course_id, link) else self.pool.submit(self._fetch_lesson, link)
+                    for link in self.links[course_id][:self.limit]
+                ]
+
+    def _start_frontier(self):
+        for course_id in self.course_ids:
+            self.links[course_id] = self.frontier.links.get(course_id, [])
+            self.lesson_futures[course_id] = [None] * len(self.links[course_id][:self.limit])
+        for course_id, i, link in self.frontier:
+            if course_id in self.lesson_futures and i < self.limit and not self._completed(course_id, link):
+                self.lesson_futures[course_id][i] = self.pool.submit(self._fetch_lesson, link)
+
+    def course(self, course_id: str) -> dict:
+        """Wait for a course's lessons and assemble them in order."""
+        course_info = COURSES[course_id]
+        print(f"\n📚 Extracting: {course_info['name']}")
+        course = new_course(course_id, course_info)
+
+        links = self.links[course_id]
+        if isinstance(links, Exception):
+            raise links
+        if links is None:
+            return course
+
+        print(f"  Found {len(links)} lessons")
+        # Release the finished futures as we go, so results don't accumulate
+        for i, future in enumerate(self.lesson_futures.pop(course_id, [])):
+            if future is None:
+                resume_lesson(course, i, len(links), links[i], self.journal, self._completed(course_id, links[i]))
+            else:
+                lesson_content = future.result()
+                if isinstance(lesson_content, Future):
+                    lesson_content = lesson_content.result()
+                add_lesson(course, i, len(links), links[i], lesson_content, self.journal)
+        return course
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        if self.parse_pool:
+            self.parse_queue.put(None)
+            self.dispatcher.join()
+            self.parse_pool.shutdown(cancel_futures=True)
+
+
 def main():
     """Main extraction function."""
+    global BASE_URL, HTML_PARSER, _profiler
+    parser = argparse.ArgumentParser(description="W3Schools Course Data Extractor")
+    parser.add_argument("--concurrent", action="store_true", help="Fetch lessons from all courses at once")
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool size for --concurrent (default: 8)")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes parsing pages for --concurrent, 0 to parse in the fetch threads (default: CPU count)")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help=f"Keep-alive connections per host (default: {POOL_SIZE})")
+    parser.add_argument("--retries", type=int, default=3, help="Retries with exponential backoff per request (default: 3)")
+    parser.add_argument("--cache-dir", default=None, help="HTTP cache directory (default: scripts/.cache/http)")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="Cache size cap, evicting least recently used pages")
+    parser.add_argument("--no-cache", action="store_true", help="Always download every page")
+    parser.add_argument("--offline", action="store_true", help="Only use cached pages, never touch the network")
+    parser.add_argument("--record", default=None, help="Also save every page fetched to this response archive (.warc.gz)")
+    parser.add_argument("--replay", default=None,
+                        help="Crawl a recorded response archive through a local replay server instead of the site")
+    parser.add_argument("--journal", default=None, help="Checkpoint journal path (default: scripts/.cache/scrape-journal.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the journal, skipping lessons already extracted")
+    parser.add_argument("--sitemap", default=None,
+                        help="Plan the crawl from a sitemap instead of each course's sidebar: a URL, a saved file, "
+                             "or 'robots' for the sitemaps listed in robots.txt")
+    parser.add_argument("--max-lessons", type=int, default=MAX_LESSONS, help=f"Lessons per course (default: {MAX_LESSONS})")
+    parser.add_argument("--parser", choices=PARSERS, default=HTML_PARSER, help=f"HTML parser backend (default: {HTML_PARSER})")
+    parser.add_argument("--format", choices=FORMATS, default="pretty",
+                        help="Output format: indented JSON, compact JSON or NDJSON (default: pretty)")
+    parser.add_argument("--output", default=None, help="Output path (default: apps/web/data/w3schools_courses.json, .ndjson for --format ndjson)")
+    parser.add_argument("--metrics-json", default=None, help="JSON summary of the run's metrics (default: scripts/.cache/scrape-metrics.json)")
+    parser.add_argument("--prometheus", default=None, help="Also write the metrics in Prometheus text format to this file")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile page extraction per course (saved to scripts/.cache/profiles); parses in the fetch threads")
+    args = parser.parse_args()
+
+    try:
+        BeautifulSoup("", args.parser)
+    except FeatureNotFound:
+        parser.error(f"parser '{args.parser}' is not installed (pip install {args.parser})")
+    HTML_PARSER = args.parser
+    if args.record and args.replay:
+        parser.error("--record and --replay are exclusive")
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    cache = None
+    if not args.no_cache:
+        cache = HttpCache(
+            args.cache_dir or os.path.join(script_dir, ".cache", "http"),
+            max_bytes=args.cache_size_mb * 1024 * 1024,
+            offline=args.offline,
+        )
+    replay_server = None
+    if args.replay:
+        replay_server = start_replay_server(args.replay)
+        BASE_URL = f"http://127.0.0.1:{replay_server.server_address[1]}"
+    recorder = ArchiveWriter(args.record) if args.record else None
+    fetcher = configure_fetcher(pool_size=args.pool_size, retries=args.retries, cache=cache,
+                                recorder=recorder, replaying=replay_server is not None)
+    if args.profile:
+        _profiler = ExtractionProfiler(list(COURSES))
+        # Worker processes would profile out of our sight
+        args.parse_workers = 0
+    started = time.perf_counter()
+    journal = CheckpointJournal(
+        args.journal or os.path.join(script_dir, ".cache", "scrape-journal.jsonl"),
+        resume=args.resume,
+    )
+
     print("=" * 60)
     print("🌐 W3Schools Course Data Extractor")
     print("=" * 60)
     print("\n⚠️  Educational use only. All content will include source attribution.\n")
+    if replay_server:
+        print(f"🔁 Replaying {args.replay} from {BASE_URL}\n")
     
     # Define output path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, "..", "apps", "web", "data", "w3schools_courses.json")
+    extension = "ndjson" if args.format == "ndjson" else "json"
+    output_path = args.output or os.path.join(script_dir, "..", "apps", "web", "data", f"w3schools_courses.{extension}")
     
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    all_courses = {
-        "metadata": {
-            "source": "W3Schools (https://www.w3schools.com)",
-            "extracted_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "attribution": "Content adapted from W3Schools. Visit https://www.w3schools.com for the original tutorials.",
-            "license": "Educational use only"
-        },
-        "courses": []
+    metadata = {
+        "source": "W3Schools (https://www.w3schools.com)",
+        "extracted_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "attribution": "Content adapted from W3Schools. Visit https://www.w3schools.com for the original tutorials.",
+        "license": "Educational use only"
     }
     
     # Extract courses in priority order
@@ -466,18 +1192,28 @@ def main():
                       "git", "nodejs", "java", "cpp", "c", "php", "mysql", "mongodb",
                       "bootstrap", "jquery", "vue", "django", "numpy", "pandas", "dsa"]
     
+    pending = [c for c in priority_order if c in COURSES and not journal.is_course_done(c)]
+    frontier = plan_crawl(args.sitemap, pending, args.max_lessons) if args.sitemap else None
+    crawler = None
+    if args.concurrent:
+        crawler = ConcurrentCrawler(pending, args.workers, journal=journal, parse_workers=args.parse_workers,
+                                    frontier=frontier, limit=args.max_lessons)
+        crawler.start()
+    
     for course_id in priority_order:
         if course_id in COURSES:
+            if course_id not in pending:
+                print(f"\n↺ Already extracted: {COURSES[course_id]['name']}")
+                continue
             try:
-                course = extract_course(course_id, COURSES[course_id])
+                if crawler:
+                    course = crawler.course(course_id)
+                else:
+                    links = frontier.links[course_id] if frontier else None
+                    course = extract_course(course_id, COURSES[course_id], journal, links, args.max_lessons)
+                journal.finish_course(course_id)
                 if course["lessons"]:  # Only add if we got lessons
-                    all_courses["courses"].append(course)
-                    
-                    # Save after each course (incremental save)
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        json.dump(all_courses, f, ensure_ascii=False, indent=2)
-                    
-                    print(f"  💾 Saved ({len(course['lessons'])} lessons)")
+                    print(f"  💾 Checkpointed ({len(course['lessons'])} lessons)")
                 else:
                     print(f"  ⚠️ No lessons extracted for {course_id}")
                 
@@ -486,12 +1222,51 @@ def main():
                 import traceback
                 traceback.print_exc()
     
+    if crawler:
+        crawler.close()
+    
+    # Stream the final output from the journal in one pass, one lesson at a time
+    writer = CourseWriter(output_path, metadata, args.format)
+    for course_id in priority_order:
+        if course_id in COURSES and journal.lesson_count(course_id):
+            writer.write_course(new_course(course_id, COURSES[course_id]), journal.iter_lessons(course_id))
+    writer.close()
+    journal.close()
+    
     print("\n" + "=" * 60)
     print(f"✅ Extraction complete!")
     print(f"📁 Output: {output_path}")
-    print(f"📊 Total courses: {len(all_courses['courses'])}")
-    total_lessons = sum(len(c['lessons']) for c in all_courses['courses'])
-    print(f"📝 Total lessons: {total_lessons}")
+    print(f"📊 Total courses: {writer.courses}")
+    print(f"📝 Total lessons: {writer.lessons}")
+    timing = fetcher.summary()
+    print(f"⏱️  Requests: {timing['requests']} ({timing['new_connections']} new connections, {timing['bytes'] / 1024:.0f} KiB)")
+    for phase in ("connect", "ttfb", "download"):
+        print(f"   {phase:<8} total {timing[phase]['total']:7.2f}s | avg {timing[phase]['avg'] * 1000:6.1f}ms")
+    if cache:
+        print(f"🗄️  Cache: {cache.stats['hits']} hits, {cache.stats['revalidated']} not modified, {cache.stats['misses']} downloaded")
+        cache.close()
+
+    summary = {
+        "extracted_at": metadata["extracted_at"],
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "courses": writer.courses,
+        "lessons": writer.lessons,
+        "metrics": METRICS.summary(),
+    }
+    metrics_path = args.metrics_json or os.path.join(script_dir, ".cache", "scrape-metrics.json")
+    write_json(metrics_path, summary)
+    parse = summary["metrics"]["scraper_parse_seconds"]
+    print(f"📈 Metrics: {metrics_path} (parse p50 {parse['p50'] * 1000:.1f}ms, p99 {parse['p99'] * 1000:.1f}ms)")
+    if args.prometheus:
+        METRICS.write_prometheus(args.prometheus)
+        print(f"   Prometheus: {args.prometheus}")
+    if _profiler:
+        _profiler.report(os.path.join(script_dir, ".cache", "profiles"))
+    if recorder:
+        recorder.close()
+        print(f"📦 Recorded {len(recorder.index)} responses to {args.record}")
+    if replay_server:
+        replay_server.shutdown()
     print("=" * 60)
 
 
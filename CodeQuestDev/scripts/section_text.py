@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Section text normalization.
+Turns each scraped section into the text the generated lessons carry: the
+joined paragraph text, its first code example, its quiz answer, and every
+truncated view of them that convert_to_lessons.py writes out, all computed
+in one pass. A course is normalized once, before any module is written, so
+a lesson that ends up in several modules or output formats is not
+normalized again.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from distractors import section_answer
+
+# How much of each text the generated lessons keep
+TEXT_LIMIT = 500
+SECTION_TEXT_LIMIT = 400
+INTRODUCTION_LIMIT = 300
+CODE_LIMIT = 300
+EXPLANATION_LIMIT = 200
+DESCRIPTION_LIMIT = 100
+OPTION_LIMIT = 80
+
+# Sections normalized per worker process before the memo starts over
+MEMO_LIMIT = 50_000
+
+
+class SectionText(NamedTuple):
+    title: str
+    text: str               # paragraphs and list items, up to TEXT_LIMIT
+    code: Optional[str]     # first example's code; None if the section has no examples
+    answer: str             # section_answer ('' if the section has no question)
+    section_text: str       # text as a lesson section
+    introduction: str       # text as a lesson introduction
+    description: str        # text as a lesson description
+    option: str             # answer as the correct quiz option
+    explanation: str        # answer as the quiz explanation
+
+
+def normalize_section(section: Dict) -> SectionText:
+    parts = []
+    for part in section.get('content', []):
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, dict) and 'list' in part:
+            parts.append(". ".join(part['list']))
+    text = " ".join(parts)[:TEXT_LIMIT]
+
+    examples = section.get('examples', [])
+    code = examples[0].get('code', '')[:CODE_LIMIT] if examples else None
+    answer = section_answer(section)
+    return SectionText(
+        title=section.get('heading', ''),
+        text=text,
+        code=code,
+        answer=answer,
+        section_text=text[:SECTION_TEXT_LIMIT],
+        introduction=text[:INTRODUCTION_LIMIT],
+        description=text[:DESCRIPTION_LIMIT],
+        option=answer[:OPTION_LIMIT],
+        explanation=answer[:EXPLANATION_LIMIT],
+    )
+
+
+# Content hash (manifest.content_hash) -> SectionText, shared by every course a worker converts
+_MEMO: Dict[str, SectionText] = {}
+
+
+class SectionTexts:
+    """The normalized sections of every lesson in one course.
+
+    Sections are looked up by identity, so records must be generated from the
+    same course dict the texts were built from (as with DistractorIndex), or
+    from sub-lessons of its lessons (lesson_splitter shares their sections).
+    ``section_hashes`` are the course's per-lesson section hashes from its
+    manifest entry; with them, a section already normalized in this process
+    (in another lesson or course) is reused instead of normalized again.
+    """
+
+    def __init__(self, course: Dict, section_hashes: Optional[List[List[str]]] = None):
+        self.sections = {}
+        for i, lesson in enumerate(course.get('lessons', [])):
+            sections = lesson.get('sections', [])
+            if section_hashes is None:
+                for section in sections:
+                    self.sections[id(section)] = normalize_section(section)
+            else:
+                for section, digest in zip(sections, section_hashes[i]):
+                    self.sections[id(section)] = _memoized(section, digest)
+
+    def lesson(self, lesson: Dict) -> List[SectionText]:
+        """Normalized sections of a lesson, in order (normalized now if they are not from this course)."""
+        texts = []
+        for section in lesson.get('sections', []):
+            text = self.sections.get(id(section))
+            texts.append(text if text is not None else normalize_section(section))
+        return texts
+
+
+def _memoized(section: Dict, digest: str) -> SectionText:
+    text = _MEMO.get(digest)
+    if text is None:
+        if len(_MEMO) >= MEMO_LIMIT:
+            _MEMO.clear()
+        text = _MEMO[digest] = normalize_section(section)
+    return text
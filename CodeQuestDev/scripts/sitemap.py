@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Sitemap crawl planning.
+Reads a sitemap once and plans the whole crawl up front, instead of
+fetching and parsing every course's sidebar: which lesson URLs belong to
+which course, in which order they are numbered, and in which order they
+are fetched across all courses.
+"""
+
+import gzip
+import heapq
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+from urllib.parse import urlparse
+
+# <priority> when a sitemap entry leaves it out, per the sitemap protocol
+DEFAULT_PRIORITY = 0.5
+
+
+# ============ PARSING ============
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem: ET.Element, name: str) -> Optional[str]:
+    for child in elem:
+        if _local(child.tag) == name:
+            return (child.text or "").strip()
+    return None
+
+
+def read_sitemap(data: Union[str, bytes]) -> Tuple[List[Dict], List[str]]:
+    """Parse a sitemap or sitemap index (optionally gzipped).
+
+    Returns (entries, child sitemap URLs). Entries are {"loc", "lastmod",
+    "priority"} in document order. Elements are cleared as they are parsed,
+    so large sitemaps are not held as a tree.
+    """
+    if isinstance(data, bytes) and data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    source = io.StringIO(data) if isinstance(data, str) else io.BytesIO(data)
+
+    entries = []
+    children = []
+    for _, elem in ET.iterparse(source):
+        tag = _local(elem.tag)
+        if tag == "url":
+            loc = _child_text(elem, "loc")
+            if loc:
+                priority = _child_text(elem, "priority")
+                try:
+                    priority = float(priority) if priority else DEFAULT_PRIORITY
+                except ValueError:
+                    priority = DEFAULT_PRIORITY
+                entries.append({"loc": loc, "lastmod": _child_text(elem, "lastmod"), "priority": priority})
+            elem.clear()
+        elif tag == "sitemap":
+            loc = _child_text(elem, "loc")
+            if loc:
+                children.append(loc)
+            elem.clear()
+    return entries, children
+
+
+def robots_sitemaps(robots_txt: str) -> List[str]:
+    """Sitemap URLs listed in a robots.txt."""
+    return [line.split(":", 1)[1].strip() for line in robots_txt.splitlines()
+            if line.lower().startswith("sitemap:")]
+
+
+# ============ PLANNING ============
+def link_title(path: str) -> str:
+    """Placeholder title from a lesson URL; the page's <h1> replaces it once extracted."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in ("default", "index"):
+        return "Home"
+    return name.replace("_", " ").replace("-", " ").strip().capitalize()
+
+
+def course_matcher(base_paths: Dict[str, str]) -> Tuple[Pattern, List[str]]:
+    """One pattern matching a URL path to its course, and the course ids it refers to.
+
+    Longer base paths come first, so /python/numpy/ wins over /python/. A
+    match's lastgroup "c<n>" names course_ids[n].
+    """
+    ordered = sorted(base_paths.items(), key=lambda item: len(item[1]), reverse=True)
+    pattern = re.compile("|".join(f"(?P<c{i}>{re.escape(path)})" for i, (_, path) in enumerate(ordered)))
+    return pattern, [course_id for course_id, _ in ordered]
+
+
+def plan_courses(entries: List[Dict], courses: Dict[str, Dict], skip: Pattern, limit: int) -> Dict[str, List[Dict]]:
+    """Assign sitemap entries to courses by URL path (the host is ignored, so a
+    saved sitemap also works against a mirror).
+
+    Lessons keep sitemap order, with the course's own index page first. A
+    course with more than ``limit`` pages keeps its highest-priority ones.
+    Links are {"title", "url", "priority"}: extract_sidebar_links' links
+    plus the sitemap priority.
+    """
+    matcher, course_ids = course_matcher({
+        course_id: info.get("base_path", f"/{course_id}/") for course_id, info in courses.items()})
+    planned = {course_id: [] for course_id in courses}
+    seen = set()
+    for entry in entries:
+        path = urlparse(entry["loc"]).path
+        match = matcher.match(path)
+        if not match or path in seen or skip.search(path):
+            continue
+        seen.add(path)
+        course_id = course_ids[int(match.lastgroup[1:])]
+        link = {"title": link_title(path), "url": path, "priority": entry["priority"]}
+        if path == courses[course_id]["url"]:
+            planned[course_id].insert(0, link)
+        else:
+            planned[course_id].append(link)
+
+    for course_id, links in planned.items():
+        if len(links) > limit:
+            # Keep the index page, then the highest priorities; sitemap order breaks ties
+            pinned = [0] if links[0]["url"] == courses[course_id]["url"] else []
+            ranked = sorted(range(len(pinned), len(links)), key=lambda i: -links[i]["priority"])
+            keep = {*pinned, *ranked[:limit - len(pinned)]}
+            planned[course_id] = [link for i, link in enumerate(links) if i in keep]
+    return planned
+
+
+class CrawlFrontier:
+    """Every planned lesson fetch across all courses, highest priority first.
+
+    Ties go to the course that comes first in ``course_order`` and then to
+    lesson order, which is also the order the courses are written out in.
+    """
+
+    def __init__(self, plan: Dict[str, List[Dict]], course_order: List[str]):
+        self.links = plan
+        rank = {course_id: r for r, course_id in enumerate(course_order)}
+        self.heap = [(-link["priority"], rank.get(course_id, len(rank)), i, course_id)
+                     for course_id, links in plan.items() for i, link in enumerate(links)]
+        heapq.heapify(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def pop(self) -> Tuple[str, int, Dict]:
+        """Next fetch: (course id, lesson index, link)."""
+        _, _, i, course_id = heapq.heappop(self.heap)
+        return course_id, i, self.links[course_id][i]
+
+    def __iter__(self) -> Iterator[Tuple[str, int, Dict]]:
+        while self.heap:
+            yield self.pop()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+TypeScript source emitter.
+A small indentation-aware writer used by convert_to_lessons.py. Lines go
+straight to the underlying text stream (a file or io.StringIO) instead of
+being built up as nested f-strings and joined.
+"""
+
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Any, Iterable, Iterator, TextIO, Tuple
+
+# json.dumps builds a new encoder on every call with non-default options; reuse these
+_ENCODE = {False: json.JSONEncoder(ensure_ascii=False).encode, True: json.JSONEncoder().encode}
+
+
+def literal(value: Any, ascii: bool = False) -> str:
+    """A TypeScript literal for a JSON-compatible value, same as json.dumps(value, ensure_ascii=ascii)."""
+    kind = type(value)
+    if kind is str:
+        return encode_basestring_ascii(value) if ascii else encode_basestring(value)
+    if kind is int:
+        return str(value)
+    if kind is list and all(type(item) is str for item in value):
+        encode = encode_basestring_ascii if ascii else encode_basestring
+        return "[" + ", ".join(map(encode, value)) + "]"
+    return _ENCODE[ascii](value)
+
+
+def with_last(items: Iterable) -> Iterator[Tuple[Any, bool]]:
+    """Yield (item, is_last) pairs, for writing comma-separated items one at a time."""
+    iterator = iter(items)
+    try:
+        item = next(iterator)
+    except StopIteration:
+        return
+    for following in iterator:
+        yield item, False
+        item = following
+    yield item, True
+
+
+class TsEmitter:
+    """Write indented lines of TypeScript to a text stream.
+
+    ``open`` writes a line and indents what follows; ``close`` dedents and
+    writes the closing line:
+
+        ts.open("content: {")
+        ts.field("introduction", text)
+        ts.close("},")
+    """
+
+    def __init__(self, out: TextIO, unit: str = "    "):
+        self.write = out.write
+        self.unit = unit
+        self.prefix = ""
+
+    def line(self, text: str = ""):
+        """Write one line at the current indentation."""
+        self.write(f"{self.prefix}{text}\n")
+
+    def raw(self, text: str):
+        """Write text as-is, without indentation or newline."""
+        self.write(text)
+
+    def field(self, key: str, value: Any, ascii: bool = False):
+        """Write a ``key: literal,`` property line."""
+        self.write(f"{self.prefix}{key}: {literal(value, ascii)},\n")
+
+    def indent(self):
+        self.prefix += self.unit
+
+    def dedent(self):
+        self.prefix = self.prefix[:-len(self.unit)]
+
+    def open(self, text: str):
+        """Write an opening line and indent the lines after it."""
+        self.write(f"{self.prefix}{text}\n")
+        self.prefix += self.unit
+
+    def close(self, text: str):
+        """Dedent and write a closing line."""
+        self.prefix = self.prefix[:-len(self.unit)]
+        self.write(f"{self.prefix}{text}\n")